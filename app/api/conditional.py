@@ -0,0 +1,68 @@
+# backend/app/api/conditional.py
+import hashlib
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from ..core.metrics import RESPONSE_CACHE
+from ..services.async_database_service import AsyncDatabaseService
+from ..services.response_cache_service import ResponseCache
+
+JSON = "application/json"
+# bodies depend on who asks: browsers revalidate every time, shared caches keep out
+CACHE_HEADERS = {"Cache-Control": "private, no-cache", "Vary": "Authorization, X-Debug-Sub"}
+
+
+def dump_json(adapter: TypeAdapter, value: Any) -> bytes:
+    """
+    One validation pass + pydantic-core's JSON encoder. Routes return this as a
+    Response, so FastAPI doesn't validate and encode the response_model again.
+    """
+    return adapter.dump_json(adapter.validate_python(value))
+
+
+def make_etag(owner_sub: str, resource: str, key: str, version: int) -> str:
+    """Weak ETag from the owner's version counter; the digest ties it to owner + request."""
+    digest = hashlib.sha256(f"{owner_sub}\0{resource}\0{key}".encode()).hexdigest()[:16]
+    return f'W/"{version:x}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against each entity-tag of If-None-Match ("*" gets the full response)."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == opaque for t in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    RESPONSE_CACHE.labels(result="not_modified").inc()
+    return Response(status_code=304, headers={"ETag": etag, **CACHE_HEADERS})
+
+
+async def cached_json(
+    db: AsyncDatabaseService,
+    *,
+    owner_sub: str,
+    resource: str,
+    key: str,
+    if_none_match: Optional[str],
+    build: Callable[[], Awaitable[bytes]],
+) -> Response:
+    """
+    GET response for data that changes only through writes to the owner's
+    `resource` ('jobs' | 'configurations'): 304 when If-None-Match still
+    matches, else the cached body for this version, else build() (cached).
+    """
+    # read before the rows, so a body is never older than the version it's stored under
+    version = await db.get_owner_version(owner_sub=owner_sub, resource=resource)
+    etag = make_etag(owner_sub, resource, key, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    body = ResponseCache.get(owner_sub, resource, key, version)
+    RESPONSE_CACHE.labels(result="miss" if body is None else "hit").inc()
+    if body is None:
+        body = await build()
+        ResponseCache.put(owner_sub, resource, key, version, body)
+    return Response(body, media_type=JSON, headers={"ETag": etag, **CACHE_HEADERS})
@@ -1,11 +1,17 @@
 # backend/app/api/deps.py
 from contextlib import contextmanager
 from typing import Generator
-from ..services.database_service import DatabaseService
+from ..services.async_database_service import AsyncDatabaseService
+from ..services.database_service import DatabaseService, open_database
 
 def get_db() -> Generator[DatabaseService, None, None]:
-    db = DatabaseService()
+    db = open_database()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_adb() -> AsyncDatabaseService:
+    # async so FastAPI doesn't hop to the threadpool just to resolve it
+    return AsyncDatabaseService.instance()
@@ -1,8 +1,10 @@
 from typing import Optional
 from fastapi import Header, HTTPException, status
 from ..core.config import settings
+from ..core.metrics import JWT_VERIFY_SECONDS, add_timing
 from ..services.cognito_jwt_verifier import CognitoJWTVerifier
 import logging
+import time
 
 log = logging.getLogger(__name__)
 
@@ -17,8 +19,14 @@ async def get_current_sub(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
 
     token = authorization.split(" ", 1)[1].strip()
+    t0 = time.perf_counter()
     try:
-        return CognitoJWTVerifier.sub_from_token(token)
+        sub = await CognitoJWTVerifier.asub_from_token(token)
     except Exception as e:
+        JWT_VERIFY_SECONDS.labels(result="invalid").observe(time.perf_counter() - t0)
         log.warning("JWT verify failed: %s", e)  # <- this will say EXACT reason
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    elapsed = time.perf_counter() - t0
+    JWT_VERIFY_SECONDS.labels(result="ok").observe(elapsed)
+    add_timing("jwt", elapsed)
+    return sub
@@ -6,7 +6,7 @@ from ...core.exceptions import ServiceError
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/check-email", response_model=CheckEmailOut)
-def check_email(payload: CheckEmailIn):
+async def check_email(payload: CheckEmailIn):
     """
     POST /auth/check-email
     Body: { "email": "user@example.com" }
@@ -14,7 +14,7 @@ def check_email(payload: CheckEmailIn):
     """
     svc = CognitoService()
     try:
-        exists = svc.email_exists(payload.email)
+        exists = await svc.aemail_exists(payload.email)
         return CheckEmailOut(exists=exists)
     except ServiceError as e:
         # Hide provider specifics from the client
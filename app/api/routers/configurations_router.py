@@ -1,21 +1,25 @@
 # backend/app/api/routers/configurations_router.py
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from ...api.deps import get_db
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from pydantic import TypeAdapter
+from ...api.conditional import cached_json, dump_json
+from ...api.deps import get_adb
 from ...api.router_auth import get_current_sub
 from ...schemas.database import ConfigurationCreateIn, ConfigurationOut
-from ...services.database_service import DatabaseService
+from ...schemas.jobs import JobOut
+from ...services.async_database_service import AsyncDatabaseService
 
 router = APIRouter(prefix="/configurations", tags=["configurations"])
+_CONFIGURATIONS = TypeAdapter(List[ConfigurationOut])
 
 @router.post("", response_model=ConfigurationOut, status_code=201)
-def create_configuration(
+async def create_configuration(
     payload: ConfigurationCreateIn,
     owner_sub: str = Depends(get_current_sub),
-    db: DatabaseService = Depends(get_db),
+    db: AsyncDatabaseService = Depends(get_adb),
 ):
     try:
-        created = db.create_configuration(
+        created = await db.create_configuration(
             owner_sub=owner_sub,
             name=payload.name.strip(),
             dataset_uri=payload.dataset_uri.strip(),
@@ -29,14 +33,36 @@ def create_configuration(
         raise HTTPException(status_code=500, detail="Failed to create configuration.") from e
 
 @router.get("", response_model=List[ConfigurationOut])
-def list_configurations(
+async def list_configurations(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     owner_sub: str = Depends(get_current_sub),
-    db: DatabaseService = Depends(get_db),
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncDatabaseService = Depends(get_adb),
 ):
+    """ETag'd: 304 while none of the owner's configurations changed (If-None-Match)."""
+    async def build() -> bytes:
+        rows = await db.list_configurations(owner_sub=owner_sub, limit=limit, offset=offset)
+        return dump_json(_CONFIGURATIONS, rows)
+
     try:
-        rows = db.list_configurations(owner_sub=owner_sub, limit=limit, offset=offset)
-        return [ConfigurationOut(**r) for r in rows]
+        return await cached_json(
+            db, owner_sub=owner_sub, resource="configurations", key=f"list:{limit}:{offset}",
+            if_none_match=if_none_match, build=build,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to list configurations.") from e
+
+@router.get("/{cfg_id}/leaderboard", response_model=List[JobOut])
+async def configuration_leaderboard(
+    cfg_id: str,
+    metric: Literal["r2", "mse", "n_rows", "elapsed_sec"] = Query("r2"),
+    top: int = Query(10, ge=1, le=100),
+    owner_sub: str = Depends(get_current_sub),
+    db: AsyncDatabaseService = Depends(get_adb),
+):
+    """Best succeeded jobs of a configuration by one metric (r2/n_rows: highest first, mse/elapsed_sec: lowest)."""
+    if not await db.get_configuration(cfg_id=cfg_id, owner_sub=owner_sub):
+        raise HTTPException(status_code=404, detail="Configuration not found")
+    rows = await db.leaderboard(configuration_id=cfg_id, owner_sub=owner_sub, metric=metric, top=top)
+    return [JobOut(**r) for r in rows]
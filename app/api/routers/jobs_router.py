@@ -1,33 +1,110 @@
 # backend/app/api/routers/jobs_router.py
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+from ...api.conditional import CACHE_HEADERS, JSON, cached_json, dump_json, etag_matches, make_etag, not_modified
 from ...api.router_auth import get_current_sub
-from ...api.deps import get_db
-from ...services.database_service import DatabaseService
+from ...api.deps import get_adb
+from ...core.config import settings
+from ...services.async_database_service import AsyncDatabaseService
+from ...services.job_events_service import TERMINAL_STATUSES, JobEventBus
+from ...services.job_log_service import JobLogService
+from ...services.response_cache_service import ResponseCache
 from ...services.training_job_service import TrainingJobService
-from ...schemas.jobs import JobCreateIn, JobOut
+from ...schemas.jobs import (
+    JobBatchCreateIn,
+    JobCreateIn,
+    JobOut,
+    JobStatsOut,
+    JobStatusOut,
+    JobStatusQueryIn,
+    JobSummaryOut,
+)
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+_JOB = TypeAdapter(JobOut)
+_JOBS = TypeAdapter(List[JobOut])
+LOG_MEDIA_TYPE = "text/plain; charset=utf-8"
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Single byte range ("bytes=a-b", "bytes=a-", "bytes=-n") -> inclusive (start, end).
+    Returns None for ranges we ignore (multi-range, malformed): serve the full body.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_s, _, end_s = spec.strip().partition("-")
+    try:
+        if start_s == "":
+            suffix = int(end_s)
+            if suffix <= 0:
+                return None
+            start, end = max(size - suffix, 0), size - 1
+        else:
+            start = int(start_s)
+            end = int(end_s) if end_s else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, min(end, size - 1)
+
+
+def _sse(job: Dict[str, Any]) -> str:
+    return f"event: job\nid: {job['id']}\ndata: {JobOut(**job).model_dump_json()}\n\n"
+
+
+async def _event_stream(
+    owner_sub: str, queue: asyncio.Queue, job_id: Optional[str] = None, initial: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[str]:
+    try:
+        if initial is not None:
+            yield _sse(initial)
+            if initial["status"] in TERMINAL_STATUSES:
+                return
+        while True:
+            try:
+                job = await asyncio.wait_for(queue.get(), timeout=settings.sse_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if job_id is not None and job["id"] != job_id:
+                continue
+            yield _sse(job)
+            if job_id is not None and job["status"] in TERMINAL_STATUSES:
+                return
+    finally:
+        JobEventBus.unsubscribe(owner_sub, queue)
+
 @router.post("", response_model=JobOut, status_code=201)
-def create_job(
+async def create_job(
     payload: JobCreateIn,
     owner_sub: str = Depends(get_current_sub),
-    db: DatabaseService = Depends(get_db),
+    db: AsyncDatabaseService = Depends(get_adb),
 ):
-    cfg = db.get_configuration(cfg_id=payload.configuration_id, owner_sub=owner_sub)
+    cfg = await db.get_configuration(cfg_id=payload.configuration_id, owner_sub=owner_sub)
     if not cfg:
         raise HTTPException(status_code=404, detail="Configuration not found")
 
     svc = TrainingJobService()
     try:
-        out = svc.create_job(
+        # dataset hashing + executor submit are blocking
+        out = await run_in_threadpool(
+            svc.create_job,
             owner_sub=owner_sub,
             configuration=cfg,  # already parsed hyperparams_json by DB layer
             cpu_request=payload.cpu_request or "100m",
             mem_request=payload.mem_request or "256Mi",
             cpu_limit=payload.cpu_limit or "1",
             mem_limit=payload.mem_limit or "1Gi",
+            force=payload.force,
         )
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve)) from ve
@@ -35,28 +112,213 @@ def create_job(
         raise HTTPException(status_code=500, detail="Failed to create job") from e
 
     # load + return
-    job = db.get_job(job_id=out["id"], owner_sub=owner_sub)
+    job = await db.get_job(job_id=out["id"], owner_sub=owner_sub)
     return JobOut(**job)
 
+@router.post("/batch", response_model=List[JobOut], status_code=202)
+async def create_jobs(
+    payload: JobBatchCreateIn,
+    background: BackgroundTasks,
+    owner_sub: str = Depends(get_current_sub),
+    db: AsyncDatabaseService = Depends(get_adb),
+):
+    """
+    Creates up to 1000 jobs in one transaction. Rows are returned as queued
+    (or succeeded when reused); submission to the executor happens after the
+    response, concurrently, and shows up in GET /jobs/status and /jobs/stream.
+    """
+    cfgs = await db.get_configurations(cfg_ids=[j.configuration_id for j in payload.jobs], owner_sub=owner_sub)
+    missing = sorted({j.configuration_id for j in payload.jobs} - cfgs.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Configuration not found: {', '.join(missing)}")
+
+    svc = TrainingJobService()
+    items = [
+        {
+            "configuration": cfgs[j.configuration_id],
+            "cpu_request": j.cpu_request or "100m",
+            "mem_request": j.mem_request or "256Mi",
+            "cpu_limit": j.cpu_limit or "1",
+            "mem_limit": j.mem_limit or "1Gi",
+            "force": j.force,
+        }
+        for j in payload.jobs
+    ]
+    try:
+        rows, plans = await run_in_threadpool(svc.create_jobs, owner_sub=owner_sub, items=items)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Failed to create jobs") from e
+
+    background.add_task(svc.submit_jobs, owner_sub=owner_sub, plans=plans)
+    return [JobOut(**r) for r in rows]
+
+@router.post("/status", response_model=List[JobStatusOut])
+async def job_statuses(
+    payload: JobStatusQueryIn,
+    owner_sub: str = Depends(get_current_sub),
+    db: AsyncDatabaseService = Depends(get_adb),
+):
+    """
+    Current status of many jobs in one call; unknown ids are omitted.
+    Non-terminal jobs are refreshed with one executor query per backend.
+    """
+    rows = await db.get_job_statuses(job_ids=payload.job_ids, owner_sub=owner_sub)
+    active = [r for r in rows if r["status"] not in TERMINAL_STATUSES]
+    if active:
+        try:
+            await run_in_threadpool(TrainingJobService().refresh_many, owner_sub=owner_sub, jobs=active)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail="Failed to refresh job status") from e
+        fresh_rows = await db.get_job_statuses(job_ids=[r["id"] for r in active], owner_sub=owner_sub)
+        fresh = {r["id"]: r for r in fresh_rows}
+        rows = [fresh.get(r["id"], r) for r in rows]
+    return [JobStatusOut(**r) for r in rows]
+
 @router.get("", response_model=List[JobOut])
-def list_jobs(
+async def list_jobs(
     owner_sub: str = Depends(get_current_sub),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    db: DatabaseService = Depends(get_db),
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncDatabaseService = Depends(get_adb),
 ):
-    rows = db.list_jobs(owner_sub=owner_sub, limit=limit, offset=offset)
-    return [JobOut(**r) for r in rows]
+    """ETag'd: 304 while none of the owner's jobs changed (If-None-Match)."""
+    async def build() -> bytes:
+        return dump_json(_JOBS, await db.list_jobs(owner_sub=owner_sub, limit=limit, offset=offset))
+
+    return await cached_json(
+        db, owner_sub=owner_sub, resource="jobs", key=f"list:{limit}:{offset}", if_none_match=if_none_match, build=build
+    )
+
+@router.get("/summary", response_model=JobSummaryOut)
+async def job_summary(
+    owner_sub: str = Depends(get_current_sub),
+    db: AsyncDatabaseService = Depends(get_adb),
+):
+    """Job counts per status and total training seconds, overall and per configuration."""
+    stats = await db.get_job_stats(owner_sub=owner_sub)
+
+    def out(row: Dict[str, Any]) -> JobStatsOut:
+        cfg_id = row["configuration_id"]
+        return JobStatsOut(
+            **{**row, "configuration_id": None if cfg_id == "*" else cfg_id},
+            total=row["queued"] + row["running"] + row["succeeded"] + row["failed"],
+        )
+
+    return JobSummaryOut(total=out(stats["total"]), configurations=[out(r) for r in stats["configurations"]])
+
+@router.get("/stream")
+async def stream_jobs(owner_sub: str = Depends(get_current_sub)):
+    """
+    Server-Sent Events: one `job` event per status transition of any of the caller's jobs.
+    """
+    queue = JobEventBus.subscribe(owner_sub)
+    return StreamingResponse(_event_stream(owner_sub, queue), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    owner_sub: str = Depends(get_current_sub),
+    db: AsyncDatabaseService = Depends(get_adb),
+):
+    """
+    Server-Sent Events for a single job: the current state first, then each
+    transition; the stream ends once the job is succeeded/failed.
+    """
+    # subscribe before reading so a transition between the two is not lost
+    queue = JobEventBus.subscribe(owner_sub)
+    try:
+        job = await db.get_job(job_id=job_id, owner_sub=owner_sub)
+    except BaseException:
+        JobEventBus.unsubscribe(owner_sub, queue)
+        raise
+    if not job:
+        JobEventBus.unsubscribe(owner_sub, queue)
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        _event_stream(owner_sub, queue, job_id=job_id, initial=job), media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+@router.get("/{job_id}/logs")
+async def get_job_logs(
+    job_id: str,
+    follow: bool = Query(False, description="Stream live logs until the trainer exits"),
+    tail: Optional[int] = Query(None, ge=1, le=100_000, description="Only the last N lines"),
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    owner_sub: str = Depends(get_current_sub),
+    db: AsyncDatabaseService = Depends(get_adb),
+):
+    """
+    Trainer logs. Finished jobs are served from the compressed archive (supports
+    `tail` and byte `Range` requests); running jobs are read from the pod.
+    """
+    job = await db.get_job(job_id=job_id, owner_sub=owner_sub)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    logs = JobLogService()
+    finished = job["status"] in TERMINAL_STATUSES
+    if finished and not logs.exists(owner_sub, job_id):
+        # finished before the archiver saw it; the pod may still be around
+        await run_in_threadpool(TrainingJobService().archive_logs, owner_sub=owner_sub, job=job)
+
+    if logs.exists(owner_sub, job_id):
+        if tail:
+            return Response(await run_in_threadpool(logs.tail, owner_sub, job_id, tail), media_type=LOG_MEDIA_TYPE)
+        size = logs.size(owner_sub, job_id)
+        headers = {"Accept-Ranges": "bytes"}
+        rng = _parse_range(range_header, size) if range_header and size else None
+        if rng:
+            start, end = rng
+            headers.update({"Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(end - start + 1)})
+            return StreamingResponse(
+                logs.read_range(owner_sub, job_id, start, end), status_code=206, media_type=LOG_MEDIA_TYPE, headers=headers
+            )
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(logs.read_range(owner_sub, job_id), media_type=LOG_MEDIA_TYPE, headers=headers)
+
+    if finished:
+        raise HTTPException(status_code=404, detail="Logs are no longer available")
+    svc = TrainingJobService()
+    return StreamingResponse(svc.live_logs(job=job, follow=follow, tail=tail), media_type=LOG_MEDIA_TYPE)
 
 @router.get("/{job_id}", response_model=JobOut)
-def get_job(job_id: str, owner_sub: str = Depends(get_current_sub), db: DatabaseService = Depends(get_db)):
-    # let service refresh + persist terminal state, but read/write via DB class
+async def get_job(
+    job_id: str,
+    owner_sub: str = Depends(get_current_sub),
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncDatabaseService = Depends(get_adb),
+):
+    """
+    Terminal jobs change only through writes, so they get an ETag (304 while
+    the owner's jobs are unchanged) and a cached body. Active jobs are
+    refreshed from the executor on every request.
+    """
+    key = f"job:{job_id}"
+    version = await db.get_owner_version(owner_sub=owner_sub, resource="jobs")
+    etag = make_etag(owner_sub, "jobs", key, version)
+    # only ever issued for a terminal job; the same version means it still is
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    body = ResponseCache.get(owner_sub, "jobs", key, version)
+    if body is not None:
+        return Response(body, media_type=JSON, headers={"ETag": etag, **CACHE_HEADERS})
+
+    job = await db.get_job(job_id=job_id, owner_sub=owner_sub)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] in TERMINAL_STATUSES:
+        body = dump_json(_JOB, job)
+        ResponseCache.put(owner_sub, "jobs", key, version, body)
+        return Response(body, media_type=JSON, headers={"ETag": etag, **CACHE_HEADERS})
+    # still active: ask the executor (blocking K8s call) and persist transitions
     svc = TrainingJobService()
     try:
-        # service uses db internally only for K8s artifacts; we still read back via db
-        refreshed = svc.refresh_and_get(owner_sub=owner_sub, job_id=job_id)
-        return JobOut(**refreshed)
+        refreshed = await run_in_threadpool(svc.refresh_and_get, owner_sub=owner_sub, job_id=job_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="Job not found")
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to load job")
+    return Response(dump_json(_JOB, refreshed), media_type=JSON, headers={"Cache-Control": "no-store"})
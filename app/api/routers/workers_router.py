@@ -0,0 +1,64 @@
+# backend/app/api/routers/workers_router.py
+import asyncio
+import hmac
+import time
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from starlette.concurrency import run_in_threadpool
+from ...core.config import settings
+from ...schemas.workers import WorkerCompleteIn, WorkerHeartbeatIn, WorkerLeaseIn, WorkerTaskOut
+from ...services.job_log_service import JobLogService
+from ...services.training_job_service import TrainingJobService
+from ...services.warm_pool_service import WarmPoolService
+
+router = APIRouter(prefix="/workers", tags=["workers"])
+
+# tasks queued by other API replicas only show up in the database
+LEASE_RECHECK_SECONDS = 2.0
+
+
+def require_worker(x_worker_token: Optional[str] = Header(default=None, alias="X-Worker-Token")) -> None:
+    if not settings.warm_pool_enabled or not settings.warm_pool_token:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Warm pool disabled")
+    if not x_worker_token or not hmac.compare_digest(x_worker_token, settings.warm_pool_token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid worker token")
+
+
+@router.post("/lease", response_model=WorkerTaskOut, responses={204: {"description": "No task available"}})
+async def lease_task(payload: WorkerLeaseIn, _: None = Depends(require_worker)):
+    """
+    Hands the next queued task to a warm worker; long-polls up to wait_seconds,
+    woken as soon as this replica queues a task.
+    """
+    deadline = time.monotonic() + payload.wait_seconds
+    while True:
+        wakeup = WarmPoolService.wakeup()
+        task = await run_in_threadpool(WarmPoolService.lease, payload.worker_id)
+        if task:
+            return WorkerTaskOut(**task.to_lease())
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return Response(status_code=204)
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout=min(remaining, LEASE_RECHECK_SECONDS))
+        except asyncio.TimeoutError:
+            pass
+
+
+@router.post("/tasks/{task_id}/heartbeat", status_code=204)
+def heartbeat(task_id: str, payload: WorkerHeartbeatIn, _: None = Depends(require_worker)):
+    if not WarmPoolService.heartbeat(task_id, payload.worker_id):
+        raise HTTPException(status_code=409, detail="Task is not leased by this worker")
+
+
+@router.post("/tasks/{task_id}/complete", status_code=204)
+async def complete_task(task_id: str, payload: WorkerCompleteIn, _: None = Depends(require_worker)):
+    task = await run_in_threadpool(
+        WarmPoolService.complete, task_id, payload.worker_id, succeeded=payload.succeeded, exit_code=payload.exit_code
+    )
+    if not task:
+        raise HTTPException(status_code=409, detail="Task is not leased by this worker")
+    if payload.logs:
+        await run_in_threadpool(JobLogService().archive, task.owner_sub, task.job_id, payload.logs.encode("utf-8"))
+    # persist the terminal state + artifacts now instead of on the next poll
+    await run_in_threadpool(TrainingJobService().refresh_and_get, owner_sub=task.owner_sub, job_id=task.job_id)
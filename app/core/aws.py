@@ -1,17 +1,52 @@
-import boto3
+import threading
+from typing import TYPE_CHECKING, Dict
 from .config import settings
 
+if TYPE_CHECKING:  # boto3/botocore take ~0.2s to import: loaded with the first client
+    import boto3
+    from botocore.client import BaseClient
+
 class AwsSessionFactory:
     """
-    Lazy session factory. It does NOT create any service clients itself.
-    Each service class asks for the session when it needs to initialize
-    its own client.
+    Lazy session factory. It does NOT create any service clients eagerly.
+    Each service asks for its client when it needs it; clients are shared per
+    process (boto3 clients are thread-safe, sessions are not, so creation is
+    serialized under a lock).
     """
     _session = None
+    _clients: Dict[str, "BaseClient"] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls) -> "boto3.Session":
+        with cls._lock:
+            return cls._get_session_locked()
 
     @classmethod
-    def get_session(cls) -> boto3.Session:
+    def _get_session_locked(cls) -> "boto3.Session":
         if cls._session is None:
+            import boto3
             cls._session = boto3.Session(region_name=settings.aws_region)
-        print(cls._session)
         return cls._session
+
+    @classmethod
+    def get_client(cls, service_name: str) -> "BaseClient":
+        client = cls._clients.get(service_name)
+        if client is not None:
+            return client
+        with cls._lock:
+            client = cls._clients.get(service_name)
+            if client is None:
+                from botocore.config import Config
+                client = cls._get_session_locked().client(
+                    service_name,
+                    config=Config(
+                        max_pool_connections=settings.aws_max_pool_connections,
+                        connect_timeout=3,
+                        read_timeout=10,
+                        retries={"max_attempts": 3, "mode": "adaptive"},  # client-side rate limiting
+                        tcp_keepalive=True,
+                    ),
+                )
+                cls._clients[service_name] = client
+            return client
@@ -1,5 +1,6 @@
 # backend/app/core/config.py
-from typing import List, Optional
+import sys
+from typing import List, Literal, Optional
 from pathlib import Path
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -7,15 +8,44 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 BASE_DIR = Path(__file__).resolve().parent.parent  # .../backend/app
 DEFAULT_DB = str(BASE_DIR / "app.db")
 DEFAULT_STORAGE_ROOT = str(BASE_DIR / "storage")   # local storage for dev
+DEFAULT_TRAINER_SCRIPT = str(BASE_DIR.parent / "trainer" / "linear_regression" / "train.py")
 
 class Settings(BaseSettings):
     # -------- App --------
     app_name: str = "PodML API"
     api_prefix: str = "/api"
+    prewarm_clients: bool = True              # import SDKs / build shared clients in the background at startup
 
     # -------- Database --------
     database_path: str = DEFAULT_DB
-    database_url: Optional[str] = None
+    database_url: Optional[str] = None        # postgresql://... selects PostgresDatabaseService
+    pg_pool_min_size: int = 2
+    pg_pool_max_size: int = 20                # per process; AsyncDatabaseService holds db_read_threads + 1 (raised to leave 4 free)
+    pg_pool_timeout_seconds: float = 10.0     # waiting for a free pooled connection
+    pg_prepare_threshold: Optional[int] = 0   # server-side prepare on first use; None behind PgBouncer (transaction mode)
+    db_read_threads: int = 8                  # AsyncDatabaseService reader connections
+    db_group_commit_max: int = 256            # writes per group commit
+    backfill_batch_size: int = 500            # rows per online-backfill transaction
+    backfill_pause_seconds: float = 0.05      # between backfill batches, to let requests write
+
+    # Retention / GC (GCService); 0 days = keep forever
+    gc_enabled: bool = False
+    gc_interval_seconds: int = 3600
+    gc_keep_succeeded_days: int = 90
+    gc_keep_failed_days: int = 30
+    gc_batch_size: int = 500                  # jobs archived per transaction
+    gc_fs_ops_per_second: int = 200           # directory entries visited/removed per second
+    gc_min_age_hours: int = 24                # never touch artifacts/logs younger than this
+    gc_upload_grace_days: int = 7             # unreferenced uploads may still get a configuration
+    gc_vacuum_pages: int = 2000               # freelist pages returned per run
+
+    # -------- Conditional GET / response cache --------
+    response_cache_entries: int = 4096                 # serialized GET bodies kept per process; 0 = off
+    response_cache_max_body_bytes: int = 512 * 1024    # larger bodies are rebuilt every time
+
+    # -------- Observability --------
+    metrics_enabled: bool = True              # /metrics (Prometheus) and request timing
+    server_timing_enabled: bool = False       # Server-Timing header: db/jwt/k8s/app milliseconds
 
     # -------- Storage (local dev / PV) --------
     storage_root: str = DEFAULT_STORAGE_ROOT  # created if missing
@@ -28,6 +58,9 @@ class Settings(BaseSettings):
     aws_region: Optional[str] = None
     aws_cognito_user_pool_id: Optional[str] = None
     aws_cognito_client_id: Optional[str] = None
+    aws_max_pool_connections: int = 50                # per shared boto3 client
+    cognito_email_cache_ttl_seconds: int = 300        # email_exists -> True
+    cognito_email_negative_ttl_seconds: int = 30      # email_exists -> False (short: signups flip it)
 
     # -------- CORS --------
     cors_origins: List[str] = ["http://localhost:3000"]
@@ -37,6 +70,26 @@ class Settings(BaseSettings):
     k8s_namespace: str = "default"
     trainer_image: str = "podml-trainer:latest"
 
+    # -------- Execution backend --------
+    # kubernetes: one Job per run; local: subprocess pool on this host (no cluster needed)
+    executor_backend: Literal["kubernetes", "local"] = "kubernetes"
+    local_executor_workers: int = 2                # concurrent local trainers
+    local_executor_timeout_seconds: int = 900      # wall clock per job
+    local_executor_python: str = sys.executable
+    trainer_script: str = DEFAULT_TRAINER_SCRIPT
+
+    # -------- Warm trainer pool (long-lived worker pods; PV mode or the local backend) --------
+    warm_pool_enabled: bool = False
+    warm_pool_token: Optional[str] = None                 # shared secret, header X-Worker-Token
+    warm_pool_max_dataset_bytes: int = 50 * 1024 * 1024   # larger datasets get their own Job
+    warm_pool_lease_seconds: int = 600                    # extended by worker heartbeats
+
+    # -------- Job status events (SSE) --------
+    job_watch_interval_seconds: float = 5.0   # one K8s sweep per interval while anyone listens
+    sse_heartbeat_seconds: float = 15.0
+    batch_submit_concurrency: int = 16        # parallel executor submits for POST /jobs/batch
+    job_submit_grace_seconds: int = 600       # queued rows unknown to their executor this long are failed
+
     # Pydantic v2 settings config (replaces inner Config)
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,276 @@
+# backend/app/core/metrics.py
+"""
+In-process Prometheus metrics (text exposition format 0.0.4) and optional
+Server-Timing headers.
+
+Metrics are per process: with several uvicorn workers, each one is scraped on
+its own (pod annotations / one worker per pod). Recording is a dict lookup
+(done once per label set), a bisect and a locked add, so instrumented calls pay
+about a microsecond.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .config import settings
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def labels(self, *values: str, **kw: str):
+        key = tuple(str(v) for v in values) if values else tuple(str(kw[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._child())
+        return child
+
+    def _child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        head = f"# HELP {self.name} {self.help}\n# TYPE {self.name} {self.kind}\n"
+        return head + "".join(line + "\n" for line in self._samples())
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {_fmt(child.value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last: +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = 'le="' + _fmt(bound) + '"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}"
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render() -> str:
+    return "".join(m.render() for m in REGISTRY)
+
+
+# ---------- the application's metrics ----------
+HTTP_REQUEST_SECONDS = Histogram(
+    "podml_http_request_duration_seconds", "Time to the end of the response body.", ("method", "route", "status")
+)
+HTTP_IN_FLIGHT = Gauge("podml_http_requests_in_flight", "Requests being served.")
+JWT_VERIFY_SECONDS = Histogram("podml_jwt_verify_seconds", "Bearer token verification.", ("result",))
+DB_QUERY_SECONDS = Histogram("podml_db_query_seconds", "DatabaseService method calls.", ("backend", "method"))
+K8S_API_SECONDS = Histogram(
+    "podml_k8s_api_seconds", "Kubernetes API calls.", ("operation",),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+RESPONSE_CACHE = Counter(
+    "podml_response_cache_total", "Cacheable GETs: not_modified (304), hit (cached body), miss.", ("result",)
+)
+UPLOAD_BYTES = Counter("podml_upload_bytes_total", "Bytes written by uploads.")
+UPLOAD_SECONDS = Histogram(
+    "podml_upload_duration_seconds", "Time to store one upload.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+UPLOAD_THROUGHPUT = Histogram(
+    "podml_upload_bytes_per_second", "Per-upload throughput.",
+    buckets=tuple(mb * 1024 * 1024 for mb in (1, 5, 10, 25, 50, 100, 250, 500, 1000)),
+)
+
+
+# ---------- Server-Timing ----------
+# name -> accumulated seconds for the current request; None outside requests or
+# when server_timing_enabled is off
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("podml_server_timing", default=None)
+
+
+def add_timing(name: str, seconds: float) -> None:
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def timed(child: Any, timing: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator: observes the call's duration on a histogram child (and Server-Timing `timing`)."""
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - t0
+                child.observe(elapsed)
+                if timing:
+                    add_timing(timing, elapsed)
+
+        return wrapper
+
+    return decorate
+
+
+def instrument_methods(
+    cls: type, histogram: Histogram, timing: str, *, skip: Iterable[str] = (), **labels: str
+) -> type:
+    """Wraps the public methods defined on `cls` with `timed`, labelled method=<name>."""
+    for name, fn in list(vars(cls).items()):
+        if name.startswith("_") or name in skip or not callable(fn):
+            continue
+        setattr(cls, name, timed(histogram.labels(**labels, method=name), timing)(fn))
+    return cls
+
+
+def _route_label(scope: Dict[str, Any]) -> str:
+    """Route template (bounded label values); unmatched paths share one label."""
+    path = getattr(scope.get("route"), "path", None)
+    if path is None:
+        return "unmatched"
+    # routers are included under api_prefix; some FastAPI versions keep their paths relative
+    prefix = settings.api_prefix
+    if prefix and scope["path"].startswith(prefix) and not path.startswith(prefix):
+        path = prefix + path
+    return path
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task/stream overhead): request
+    latency by route template, requests in flight, and a Server-Timing header
+    with the db/jwt/k8s time spent before the response started.
+    """
+
+    def __init__(self, app: Callable[..., Any]):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        if scope["type"] != "http" or not settings.metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        t0 = time.perf_counter()
+        status = 500
+        timings: Optional[Dict[str, float]] = {} if settings.server_timing_enabled else None
+        token = _timings.set(timings)
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timings is not None:
+                    timings["app"] = time.perf_counter() - t0
+                    value = ", ".join(f"{k};dur={v * 1000:.2f}" for k, v in timings.items())
+                    message["headers"] = [*message.get("headers", ()), (b"server-timing", value.encode())]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _timings.reset(token)
+            HTTP_REQUEST_SECONDS.labels(scope["method"], _route_label(scope), str(status)).observe(
+                time.perf_counter() - t0
+            )
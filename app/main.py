@@ -1,12 +1,60 @@
+import logging
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from .core.config import settings
+from .core import metrics
 from .api.routers.auth_router import router as auth_router
 from .api.routers.configurations_router import router as configurations_router
 from .api.routers.storage_router import router as storage_router
 from .api.routers.jobs_router import router as jobs_router
+from .api.routers.workers_router import router as workers_router
+from .services.async_database_service import AsyncDatabaseService
+from .services.cognito_jwt_verifier import CognitoJWTVerifier
+from .services.cognito_service import CognitoService
+from .services.database_service import close_database, migrate_database
+from .services.executor_service import default_executor
+from .services.gc_service import GCService
+from .services.migration_service import stop_backfills
+
+log = logging.getLogger(__name__)
+
+
+def prewarm_clients() -> None:
+    """
+    Heavy SDKs (jose/cryptography, boto3, kubernetes) are imported on first
+    use; this pays that, plus JWKS fetch and client construction, in the
+    background right after startup instead of in the first requests.
+    """
+    for name, warm_up in (
+        ("jwks", CognitoJWTVerifier.warm_up),
+        ("cognito", CognitoService.warm_up),
+        ("executor", lambda: default_executor().warm_up()),
+    ):
+        try:
+            warm_up()
+        except Exception as e:  # not configured here (no kubeconfig, no AWS); first use will say so
+            log.info("Pre-warming %s skipped: %s", name, e)
 
-app = FastAPI(title="App Backend (OOP Services)")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # schema migrations once per process, before the first request
+    await run_in_threadpool(migrate_database)
+    if settings.prewarm_clients:
+        threading.Thread(target=prewarm_clients, name="podml-prewarm", daemon=True).start()
+    GCService.start()
+    yield
+    GCService.stop()
+    stop_backfills()
+    AsyncDatabaseService.shutdown_all()
+    close_database()
+
+app = FastAPI(title="App Backend (OOP Services)", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -17,12 +65,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# outermost, so latency includes CORS and everything below it
+app.add_middleware(metrics.MetricsMiddleware)
+
 @app.get("/health")
 def health():
     return {"ok": True}
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 # Routers
 app.include_router(auth_router)
 app.include_router(configurations_router, prefix=settings.api_prefix)
 app.include_router(storage_router,  prefix=settings.api_prefix)
 app.include_router(jobs_router,     prefix=settings.api_prefix)
+app.include_router(workers_router,  prefix=settings.api_prefix)
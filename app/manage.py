@@ -0,0 +1,71 @@
+"""
+Maintenance commands.
+
+    python -m app.manage migrate [--no-backfill]
+    python -m app.manage rebuild-job-stats
+    python -m app.manage gc [--dry-run] [--full-vacuum]
+"""
+import argparse
+import json
+
+from .core.config import settings
+from .services.database_service import open_database, uses_postgres
+from .services.gc_service import GCService
+from .services.migration_service import SCHEMA_VERSION, MigrationService
+
+
+def migrate(args: argparse.Namespace) -> None:
+    if uses_postgres():
+        # local import: psycopg is only needed for Postgres
+        from .services import postgres_database_service as pg
+
+        applied = pg.migrate(settings.database_url)
+        print(f"schema at v{pg.PG_SCHEMA_VERSION}; applied: {', '.join(map(str, applied)) or 'none'}")
+        return
+    svc = MigrationService()
+    applied = svc.migrate()
+    print(f"schema at v{SCHEMA_VERSION}; applied: {', '.join(map(str, applied)) or 'none'}")
+    if not args.no_backfill:
+        for name, batches in svc.run_backfills(pause_seconds=0).items():
+            print(f"backfill {name}: {batches} batch(es)")
+
+
+def rebuild_job_stats(args: argparse.Namespace) -> None:
+    db = open_database()
+    try:
+        fixed = db.rebuild_job_stats()
+    finally:
+        db.close()
+    print(f"job_stats rebuilt from training_jobs; {fixed} row(s) were out of date")
+
+
+def gc(args: argparse.Namespace) -> None:
+    if args.full_vacuum and not args.dry_run:
+        db = open_database()
+        try:
+            db.full_vacuum()
+        finally:
+            db.close()
+    print(json.dumps(GCService().run(dry_run=args.dry_run), indent=2))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(prog="python -m app.manage", description="PodML maintenance commands")
+    commands = ap.add_subparsers(dest="command", required=True)
+    m = commands.add_parser("migrate", help="apply schema migrations and run pending backfills to completion")
+    m.add_argument("--no-backfill", action="store_true", help="leave backfills to the running app")
+    m.set_defaults(func=migrate)
+    commands.add_parser("rebuild-job-stats", help="recompute the job summary table from training_jobs").set_defaults(
+        func=rebuild_job_stats
+    )
+    g = commands.add_parser("gc", help="archive expired jobs and delete unreferenced artifacts, logs and uploads")
+    g.add_argument("--dry-run", action="store_true", help="only report what would be archived/deleted")
+    g.add_argument("--full-vacuum", action="store_true",
+                   help="VACUUM once first, switching the file to incremental auto-vacuum (blocks writers)")
+    g.set_defaults(func=gc)
+    args = ap.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
 
@@ -9,6 +9,8 @@ class JobCreateIn(BaseModel):
     mem_request: Optional[str] = Field(default=None, examples=["256Mi"])
     cpu_limit: Optional[str] = Field(default=None, examples=["1"])
     mem_limit: Optional[str] = Field(default=None, examples=["1Gi"])
+    # Retrain even if an identical configuration + dataset already succeeded
+    force: bool = False
 
 class JobOut(BaseModel):
     id: str
@@ -17,4 +19,30 @@ class JobOut(BaseModel):
     status: str
     k8s_job_name: str
     model_uri: Optional[str] = None
-    metrics_json: Optional[str] = None
+    metrics: Optional[Dict[str, Any]] = None  # parsed metrics.json (r2, mse, n_rows, ...)
+    reused_from: Optional[str] = None         # job whose trained model this one reuses
+
+class JobBatchCreateIn(BaseModel):
+    jobs: List[JobCreateIn] = Field(min_length=1, max_length=1000)
+
+class JobStatusQueryIn(BaseModel):
+    job_ids: List[str] = Field(min_length=1, max_length=5000)
+
+class JobStatusOut(BaseModel):
+    id: str
+    status: str
+    updated_at: Optional[str] = None
+
+class JobStatsOut(BaseModel):
+    configuration_id: Optional[str] = None  # None on the owner totals
+    queued: int = 0
+    running: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    total: int = 0
+    total_elapsed_sec: float = 0.0
+    last_job_at: Optional[str] = None
+
+class JobSummaryOut(BaseModel):
+    total: JobStatsOut
+    configurations: List[JobStatsOut]
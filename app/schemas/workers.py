@@ -0,0 +1,23 @@
+from typing import Dict, Optional
+from pydantic import BaseModel, Field
+
+
+class WorkerLeaseIn(BaseModel):
+    worker_id: str = Field(..., min_length=1, max_length=200)
+    # long-poll: wait up to this long for a task before answering 204
+    wait_seconds: float = Field(default=20.0, ge=0, le=30)
+
+class WorkerTaskOut(BaseModel):
+    task_id: str
+    job_id: str
+    env: Dict[str, str]
+    sub_paths: Dict[str, str]
+
+class WorkerHeartbeatIn(BaseModel):
+    worker_id: str
+
+class WorkerCompleteIn(BaseModel):
+    worker_id: str
+    succeeded: bool
+    exit_code: Optional[int] = None
+    logs: Optional[str] = Field(default=None, max_length=10_000_000)
@@ -0,0 +1,164 @@
+# backend/app/services/async_database_service.py
+import asyncio
+import contextvars
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.metrics import add_timing
+from .database_service import DatabaseService, open_database
+
+log = logging.getLogger(__name__)
+
+# DatabaseService methods exposed as coroutines
+_READ_METHODS = frozenset({
+    "list_configurations", "get_configuration", "get_configurations",
+    "list_jobs", "get_job", "get_job_statuses", "list_active_jobs", "find_reusable_job",
+    "leaderboard", "get_job_stats", "get_owner_version",
+})
+_WRITE_METHODS = frozenset({
+    "create_configuration", "insert_job", "insert_jobs", "set_job_status", "set_jobs_status",
+})
+
+_STOP = object()
+
+
+class AsyncDatabaseService:
+    """
+    DatabaseService for `async def` routes: same method names and arguments,
+    awaited instead of called. Nothing blocks the event loop and nothing uses
+    Starlette's request threadpool.
+
+    - Reads run on a small dedicated pool, one SQLite connection per thread
+      (WAL: readers never wait for the writer).
+    - Writes go through one writer thread. Whatever is queued while it commits
+      is applied as the next group: one BEGIN IMMEDIATE ... COMMIT (one fsync)
+      for up to db_group_commit_max calls, each in its own savepoint so a
+      failing call doesn't affect the others. Awaiting a write returns after
+      its group committed.
+
+    One instance per database path, shared by all requests (see instance()).
+    """
+    _instances: Dict[str, "AsyncDatabaseService"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = os.path.abspath(db_path or settings.database_path)
+        self._local = threading.local()
+        self._readers = ThreadPoolExecutor(max_workers=settings.db_read_threads, thread_name_prefix="podml-db-read")
+        self._writes: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="podml-db-write", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def instance(cls, db_path: Optional[str] = None) -> "AsyncDatabaseService":
+        path = os.path.abspath(db_path or settings.database_path)
+        inst = cls._instances.get(path)
+        if inst is None:
+            with cls._instances_lock:
+                inst = cls._instances.get(path)
+                if inst is None:
+                    inst = cls._instances[path] = cls(path)
+        return inst
+
+    @classmethod
+    def shutdown_all(cls) -> None:
+        with cls._instances_lock:
+            instances = list(cls._instances.values())
+            cls._instances.clear()
+        for inst in instances:
+            inst.close()
+
+    def close(self) -> None:
+        self._writes.put(_STOP)
+        self._writer.join(timeout=10)
+        self._readers.shutdown(wait=True)
+
+    # ---------- dispatch ----------
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name in _READ_METHODS:
+            return partial(self._read, name)
+        if name in _WRITE_METHODS:
+            return partial(self._write, name)
+        raise AttributeError(f"{type(self).__name__} has no method '{name}'")
+
+    def _reader_db(self) -> DatabaseService:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = open_database(self.db_path)
+        return db
+
+    async def _read(self, method: str, /, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()  # Server-Timing of the calling request
+        return await loop.run_in_executor(
+            self._readers, ctx.run, lambda: getattr(self._reader_db(), method)(*args, **kwargs)
+        )
+
+    async def _write(self, method: str, /, *args: Any, **kwargs: Any) -> Any:
+        fut: Future = Future()
+        t0 = time.perf_counter()
+        self._writes.put((method, args, kwargs, fut))
+        try:
+            return await asyncio.wrap_future(fut)
+        finally:
+            add_timing("db", time.perf_counter() - t0)  # queueing + group commit
+
+    # ---------- writer thread ----------
+    def _next_group(self) -> Tuple[List[Tuple[str, tuple, dict, Future]], bool]:
+        """Blocks for one write, then takes whatever else is already queued."""
+        group: List[Tuple[str, tuple, dict, Future]] = []
+        item = self._writes.get()
+        while True:
+            if item is _STOP:
+                return group, True
+            group.append(item)
+            if len(group) >= settings.db_group_commit_max:
+                return group, False
+            try:
+                item = self._writes.get_nowait()
+            except queue.Empty:
+                return group, False
+
+    def _write_loop(self) -> None:
+        db = open_database(self.db_path)
+        try:
+            stop = False
+            while not stop:
+                group, stop = self._next_group()
+                if group:
+                    self._commit_group(db, group)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _commit_group(db: DatabaseService, group: List[Tuple[str, tuple, dict, Future]]) -> None:
+        results: List[Tuple[Future, bool, Any]] = []
+        try:
+            with db.batch():
+                for name, args, kwargs, fut in group:
+                    if not fut.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        results.append((fut, True, getattr(db, name)(*args, **kwargs)))
+                    except Exception as e:  # rolled back to its savepoint
+                        results.append((fut, False, e))
+        except Exception as e:
+            # BEGIN or COMMIT failed: nothing in this group was written
+            log.warning("Group commit of %d writes failed: %s", len(group), e)
+            for _, _, _, fut in group:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        # resolve only after COMMIT, so callers read their own writes
+        for fut, ok, value in results:
+            if ok:
+                fut.set_result(value)
+            else:
+                fut.set_exception(value)
@@ -1,13 +1,17 @@
 # backend/app/services/cognito_jwt_verifier.py
+import asyncio
+import hashlib
+import threading
 import time
-from typing import Any, Dict, Optional
-
-import httpx
-from jose import jwt
-from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWKError, JWTError
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 from ..core.config import settings
 
+# jose (+ cryptography) and httpx are imported on first use, not with the API
+if TYPE_CHECKING:
+    from jose.backends.base import Key
+
 
 def _issuer() -> str:
     # e.g. https://cognito-idp.eu-central-1.amazonaws.com/eu-central-1_ABC123
@@ -19,25 +23,148 @@ def _jwks_url() -> str:
 
 
 class CognitoJWTVerifier:
-    """Verifies Cognito ID tokens against JWKS (no boto3)."""
-    _jwks_cache: Optional[Dict[str, Any]] = None
-    _jwks_fetched_at: float = 0.0
+    """
+    Verifies Cognito ID tokens against JWKS (no boto3).
+
+    - JWKs are parsed once into key objects indexed by kid.
+    - Async callers refresh JWKS with httpx.AsyncClient, single-flight, and
+      stale-while-revalidate: expired keys keep verifying while one background
+      fetch runs. An unknown kid (key rotation) forces at most one refetch per
+      _unknown_kid_refetch_seconds.
+    - Verified claims are cached in a bounded LRU keyed by sha256(token) until exp.
+    """
     _jwks_ttl_seconds: int = 3600
+    _unknown_kid_refetch_seconds: int = 30
+    _claims_cache_size: int = 10_000
+
+    _keys: Dict[str, Tuple["Key", str]] = {}           # kid -> (key, alg)
+    _keys_fetched_at: float = 0.0
+    _last_forced_fetch: float = 0.0
+    _refresh_task: Optional["asyncio.Task[None]"] = None
+    _fetch_lock = threading.Lock()
 
+    _claims: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+    _claims_lock = threading.Lock()
+
+    # ---------- JWKS ----------
     @classmethod
-    def _get_jwks(cls) -> Dict[str, Any]:
-        now = time.time()
-        if cls._jwks_cache and (now - cls._jwks_fetched_at) < cls._jwks_ttl_seconds:
-            return cls._jwks_cache
-        resp = httpx.get(_jwks_url(), timeout=10.0)
+    def _load_keys(cls, jwks: Dict[str, Any]) -> None:
+        from jose import jwk
+        from jose.exceptions import JWKError
+
+        keys: Dict[str, Tuple["Key", str]] = {}
+        for k in jwks.get("keys", []):
+            kid = k.get("kid")
+            if not kid:
+                continue
+            alg = k.get("alg", "RS256")
+            try:
+                keys[kid] = (jwk.construct(k, alg), alg)
+            except JWKError:
+                continue
+        cls._keys = keys  # swapped atomically; readers never see a partial dict
+        cls._keys_fetched_at = time.time()
+
+    @classmethod
+    def _fetch_sync(cls) -> None:
+        import httpx
+
+        with cls._fetch_lock:
+            resp = httpx.get(_jwks_url(), timeout=10.0)
+            resp.raise_for_status()
+            cls._load_keys(resp.json())
+
+    @classmethod
+    async def _fetch_async(cls) -> None:
+        import httpx
+
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            resp = await client.get(_jwks_url())
         resp.raise_for_status()
-        cls._jwks_cache = resp.json()
-        cls._jwks_fetched_at = now
-        return cls._jwks_cache
+        cls._load_keys(resp.json())
 
     @classmethod
-    def verify_id_token(cls, token: str) -> Dict[str, Any]:
-        # 1) header + matching JWK
+    def _start_refresh(cls) -> "asyncio.Task[None]":
+        """Single-flight: concurrent callers share one in-flight fetch."""
+        task = cls._refresh_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.get_running_loop().create_task(cls._fetch_async())
+            # consume the exception of background refreshes nobody awaits
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            cls._refresh_task = task
+        return task
+
+    @classmethod
+    def _needs_forced_fetch(cls, kid: str, now: float) -> bool:
+        if not cls._keys:
+            return True
+        if kid not in cls._keys and now - cls._last_forced_fetch >= cls._unknown_kid_refetch_seconds:
+            cls._last_forced_fetch = now
+            return True
+        return False
+
+    @classmethod
+    def _lookup_key(cls, kid: str) -> Tuple["Key", str]:
+        found = cls._keys.get(kid)
+        if not found:
+            raise ValueError("Signing key not found in JWKS (kid mismatch)")
+        return found
+
+    @classmethod
+    def _get_key(cls, kid: str) -> Tuple["Key", str]:
+        now = time.time()
+        if cls._needs_forced_fetch(kid, now) or now - cls._keys_fetched_at >= cls._jwks_ttl_seconds:
+            cls._fetch_sync()
+        return cls._lookup_key(kid)
+
+    @classmethod
+    async def _aget_key(cls, kid: str) -> Tuple["Key", str]:
+        now = time.time()
+        if cls._needs_forced_fetch(kid, now):
+            await asyncio.shield(cls._start_refresh())
+        elif now - cls._keys_fetched_at >= cls._jwks_ttl_seconds:
+            cls._start_refresh()  # stale-while-revalidate
+        return cls._lookup_key(kid)
+
+    @classmethod
+    def warm_up(cls) -> None:
+        """Imports jose/cryptography and fetches the JWKS (lifespan pre-warm), if Cognito is configured."""
+        from jose import jwt  # noqa: F401
+
+        if settings.aws_region and settings.aws_cognito_user_pool_id and not cls._keys:
+            cls._fetch_sync()
+
+    # ---------- claims cache ----------
+    @staticmethod
+    def _token_key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    @classmethod
+    def _cached_claims(cls, tkey: bytes) -> Optional[Dict[str, Any]]:
+        with cls._claims_lock:
+            hit = cls._claims.get(tkey)
+            if hit is None:
+                return None
+            claims, exp = hit
+            if time.time() >= exp:
+                del cls._claims[tkey]
+                return None
+            cls._claims.move_to_end(tkey)
+            return claims
+
+    @classmethod
+    def _cache_claims(cls, tkey: bytes, claims: Dict[str, Any]) -> None:
+        with cls._claims_lock:
+            cls._claims[tkey] = (claims, float(claims["exp"]))
+            cls._claims.move_to_end(tkey)
+            while len(cls._claims) > cls._claims_cache_size:
+                cls._claims.popitem(last=False)
+
+    # ---------- verification ----------
+    @staticmethod
+    def _kid(token: str) -> str:
+        from jose import jwt
+
         try:
             hdr = jwt.get_unverified_header(token)
         except Exception as e:
@@ -46,17 +173,19 @@ class CognitoJWTVerifier:
         kid = hdr.get("kid")
         if not kid:
             raise ValueError("Missing 'kid' in token header")
+        return kid
 
-        jwk = next((k for k in cls._get_jwks().get("keys", []) if k.get("kid") == kid), None)
-        if not jwk:
-            raise ValueError("Signing key not found in JWKS (kid mismatch)")
+    @staticmethod
+    def _decode(token: str, key: "Key", alg: str) -> Dict[str, Any]:
+        from jose import jwt
+        from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWKError, JWTError
 
-        # 2) verify signature & claims (NO 'leeway' kwarg)
+        # verify signature & claims (NO 'leeway' kwarg)
         try:
             claims = jwt.decode(
                 token,
-                jwk,  # python-jose accepts JWK dict
-                algorithms=[jwk.get("alg", "RS256")],
+                key,
+                algorithms=[alg],
                 audience=settings.aws_cognito_client_id,  # must equal token 'aud'
                 issuer=_issuer(),                         # must equal token 'iss'
                 options={"verify_at_hash": False},
@@ -68,7 +197,7 @@ class CognitoJWTVerifier:
         except (JWKError, JWTError) as e:
             raise ValueError(f"JWT signature/format invalid: {e}") from e
 
-        # 3) Manual clock skew tolerance (60s)
+        # Manual clock skew tolerance (60s)
         try:
             exp = int(claims.get("exp", 0))
             now = int(time.time())
@@ -77,13 +206,38 @@ class CognitoJWTVerifier:
         except (TypeError, ValueError):
             raise ValueError("Token missing or invalid 'exp' claim")
 
-        # 4) ensure it's an ID token
+        # ensure it's an ID token
         tu = claims.get("token_use")
         if tu != "id":
             raise ValueError(f"Wrong token_use='{tu}', expected 'id'")
 
         return claims
 
+    @classmethod
+    def verify_id_token(cls, token: str) -> Dict[str, Any]:
+        tkey = cls._token_key(token)
+        claims = cls._cached_claims(tkey)
+        if claims is None:
+            key, alg = cls._get_key(cls._kid(token))
+            claims = cls._decode(token, key, alg)
+            cls._cache_claims(tkey, claims)
+        return claims
+
+    @classmethod
+    async def averify_id_token(cls, token: str) -> Dict[str, Any]:
+        """Same as verify_id_token, but never blocks the event loop on JWKS I/O."""
+        tkey = cls._token_key(token)
+        claims = cls._cached_claims(tkey)
+        if claims is None:
+            key, alg = await cls._aget_key(cls._kid(token))
+            claims = cls._decode(token, key, alg)
+            cls._cache_claims(tkey, claims)
+        return claims
+
     @classmethod
     def sub_from_token(cls, token: str) -> str:
         return str(cls.verify_id_token(token)["sub"])
+
+    @classmethod
+    async def asub_from_token(cls, token: str) -> str:
+        return str((await cls.averify_id_token(token))["sub"])
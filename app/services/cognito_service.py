@@ -1,36 +1,118 @@
-from typing import Optional, Dict, Any
-from botocore.client import BaseClient
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple
+from starlette.concurrency import run_in_threadpool
 from ..core.aws import AwsSessionFactory
 from ..core.config import settings
 from ..core.exceptions import ServiceError
 
+if TYPE_CHECKING:
+    from botocore.client import BaseClient
+
 class CognitoService:
     """
     Cognito-specific operations encapsulated in a class.
-    Client is initialized lazily in __init__, so no global clients or
-    cross-service eager initialization happens.
+    Uses the process-wide cognito-idp client from AwsSessionFactory (created on
+    first use); pass `client` to use another one, e.g. a botocore Stubber'd client.
+    email_exists results are cached per (user pool, email) with separate TTLs
+    for hits and misses.
     """
+    EMAIL_CACHE_SIZE = 10_000
+
+    # (user_pool_id, email) -> (exists, expires_at)
+    _email_cache: "OrderedDict[Tuple[str, str], Tuple[bool, float]]" = OrderedDict()
+    _email_cache_lock = threading.Lock()
+    # concurrent async lookups of the same email share one ListUsers call
+    _inflight: Dict[Tuple[str, str], "asyncio.Task[bool]"] = {}
 
-    def __init__(self, *, user_pool_id: Optional[str] = None):
-        # create client only for this service
-        session = AwsSessionFactory.get_session()
-        self.client: BaseClient = session.client("cognito-idp")
+    def __init__(self, *, user_pool_id: Optional[str] = None, client: Optional["BaseClient"] = None):
+        self.client: "BaseClient" = client or AwsSessionFactory.get_client("cognito-idp")
         self.user_pool_id = user_pool_id or settings.aws_cognito_user_pool_id
 
+    @staticmethod
+    def warm_up() -> None:
+        """Builds the shared cognito-idp client (lifespan pre-warm), if AWS is configured."""
+        if settings.aws_region and settings.aws_cognito_user_pool_id:
+            AwsSessionFactory.get_client("cognito-idp")
+
+    @classmethod
+    def clear_email_cache(cls) -> None:
+        with cls._email_cache_lock:
+            cls._email_cache.clear()
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[bool]:
+        with self._email_cache_lock:
+            hit = self._email_cache.get(key)
+            if hit is None:
+                return None
+            exists, expires_at = hit
+            if time.monotonic() >= expires_at:
+                del self._email_cache[key]
+                return None
+            return exists
+
+    def _cache_put(self, key: Tuple[str, str], exists: bool) -> None:
+        ttl = settings.cognito_email_cache_ttl_seconds if exists else settings.cognito_email_negative_ttl_seconds
+        with self._email_cache_lock:
+            self._email_cache[key] = (exists, time.monotonic() + ttl)
+            self._email_cache.move_to_end(key)
+            while len(self._email_cache) > self.EMAIL_CACHE_SIZE:
+                self._email_cache.popitem(last=False)
+
+    def _list_users_by_email(self, email: str) -> bool:
+        escaped = email.replace("\\", "\\\\").replace('"', '\\"')
+        try:
+            resp = self.client.list_users(
+                UserPoolId=self.user_pool_id,
+                Filter=f'email = "{escaped}"',
+                Limit=1,
+            )
+        except Exception as err:
+            raise ServiceError("Failed to look up email in Cognito", cause=err)
+        return bool(resp.get("Users"))
 
     def email_exists(self, email: str) -> bool:
         """
         Server-side existence check using ListUsers with email filter.
         Works even if username != email.
         """
+        key = (self.user_pool_id, email)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        exists = self._list_users_by_email(email)
+        self._cache_put(key, exists)
+        return exists
 
-        resp = self.client.list_users(
-            UserPoolId=self.user_pool_id,
-            Filter=f'email = "{email}"',
-            Limit=1,
-        )
-        return bool(resp.get("Users"))
+    async def aemail_exists(self, email: str) -> bool:
+        """
+        email_exists for async callers: the ListUsers call runs in the threadpool
+        and concurrent lookups for the same email are coalesced into one.
+        """
+        key = (self.user_pool_id, email)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            # a task of its own: a cancelled caller (client went away) doesn't cancel the others
+            task = self._inflight[key] = asyncio.ensure_future(self._alookup(key, email))
+            task.add_done_callback(lambda t: self._lookup_done(key, t))
+        return await asyncio.shield(task)
+
+    async def _alookup(self, key: Tuple[str, str], email: str) -> bool:
+        exists = await run_in_threadpool(self._list_users_by_email, email)
+        self._cache_put(key, exists)
+        return exists
 
+    def _lookup_done(self, key: Tuple[str, str], task: "asyncio.Task[bool]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every caller was cancelled
 
     def get_user_by_sub(self, sub: str) -> Optional[Dict[str, Any]]:
         """
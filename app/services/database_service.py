@@ -1,50 +1,40 @@
 # backend/app/services/database_service.py
+import fcntl
 import json
 import os
 import sqlite3
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from ..core.config import settings
+from ..core.metrics import DB_QUERY_SECONDS, instrument_methods
+from .migration_service import JOB_STATS_STATUSES, ensure_migrated
+
+# Leaderboard metric -> sort direction (best first).
+LEADERBOARD_METRICS: Dict[str, str] = {
+    "r2": "DESC",
+    "mse": "ASC",
+    "n_rows": "DESC",
+    "elapsed_sec": "ASC",
+}
+
+# Bound parameters per IN (...) query; below SQLite's historical 999 limit.
+IN_CHUNK = 900
+
+
+def _chunks(items: List[str], size: int = IN_CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _expired_sql(cutoffs: Dict[str, str]) -> Tuple[str, List[str]]:
+    """WHERE clause for jobs past retention; cutoffs: status -> 'YYYY-MM-DD HH:MM:SS' (UTC)."""
+    if not cutoffs:
+        return "0", []
+    clause = " OR ".join("(status = ? AND updated_at < ?)" for _ in cutoffs)
+    return f"({clause})", [v for item in cutoffs.items() for v in item]
 
-INIT_SQL = """
-PRAGMA foreign_keys = ON;
-
--- configurations
-CREATE TABLE IF NOT EXISTS configurations (
-    id TEXT PRIMARY KEY,
-    owner_sub TEXT NOT NULL,
-    name TEXT NOT NULL,
-    dataset_uri TEXT NOT NULL,
-    x_column TEXT NOT NULL,
-    y_column TEXT NOT NULL,
-    model_type TEXT NOT NULL DEFAULT 'linear_regression',
-    hyperparams_json TEXT,
-    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-);
-CREATE INDEX IF NOT EXISTS idx_configurations_owner
-    ON configurations (owner_sub, created_at DESC);
-
--- training_jobs
-CREATE TABLE IF NOT EXISTS training_jobs (
-  id TEXT PRIMARY KEY,
-  owner_sub TEXT NOT NULL,
-  configuration_id TEXT NOT NULL,
-  status TEXT NOT NULL DEFAULT 'queued',  -- queued|running|succeeded|failed
-  k8s_job_name TEXT NOT NULL,
-  model_uri TEXT,
-  metrics_json TEXT,
-  resources_json TEXT,
-  created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-  FOREIGN KEY(configuration_id) REFERENCES configurations(id) ON DELETE CASCADE
-);
-CREATE INDEX IF NOT EXISTS idx_training_jobs_owner
-    ON training_jobs (owner_sub, created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_training_jobs_cfg
-    ON training_jobs (configuration_id, created_at DESC);
-"""
 
 def _parse_hp(row: sqlite3.Row | Dict[str, Any]) -> Dict[str, Any]:
     d = dict(row)
@@ -57,6 +47,29 @@ def _parse_hp(row: sqlite3.Row | Dict[str, Any]) -> Dict[str, Any]:
         d["hyperparams_json"] = None
     return d
 
+def parse_metrics(text: Optional[str]) -> Optional[Dict[str, Any]]:
+    """metrics_json TEXT -> dict (None when missing or not a JSON object)."""
+    if not text:
+        return None
+    try:
+        metrics = json.loads(text)
+    except ValueError:
+        return None
+    return metrics if isinstance(metrics, dict) else None
+
+
+def _parse_job(row: sqlite3.Row | Dict[str, Any]) -> Dict[str, Any]:
+    d = dict(row)
+    d["metrics"] = parse_metrics(d.get("metrics_json"))
+    return d
+
+
+def _parse_warm_task(row: sqlite3.Row | Dict[str, Any]) -> Dict[str, Any]:
+    d = dict(row)
+    d["env"] = json.loads(d.pop("env_json"))
+    d["sub_paths"] = json.loads(d.pop("sub_paths_json"))
+    return d
+
 class DatabaseService:
     """
     Repository-style DB service for all persistence.
@@ -66,9 +79,11 @@ class DatabaseService:
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or settings.database_path
         os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        ensure_migrated(self.db_path)  # once per process; no DDL per connection
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
         self.conn.row_factory = sqlite3.Row
-        self._ensure_schema()
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self._savepoints = 0  # > 0 inside batch()
 
     def close(self):
         try:
@@ -76,9 +91,44 @@ class DatabaseService:
         except Exception:
             pass
 
-    def _ensure_schema(self):
+    @contextmanager
+    def _tx(self, *, immediate: bool = False) -> Iterator[None]:
+        """
+        One write unit: its own transaction, or a savepoint inside batch() so a
+        failing call only rolls back itself.
+        """
+        if self._savepoints:
+            name = f"sp{self._savepoints}"
+            self._savepoints += 1
+            self.conn.execute(f"SAVEPOINT {name}")
+            try:
+                yield
+            except BaseException:
+                self.conn.execute(f"ROLLBACK TO {name}")
+                raise
+            finally:
+                self.conn.execute(f"RELEASE {name}")
+                self._savepoints -= 1
+            return
+        if immediate:
+            self.conn.execute("BEGIN IMMEDIATE")
         with self.conn:
-            self.conn.executescript(INIT_SQL)
+            yield
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Groups many write calls into one transaction (one commit / fsync)."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._savepoints = 1
+        try:
+            yield
+        except BaseException:
+            self.conn.rollback()
+            raise
+        else:
+            self.conn.commit()
+        finally:
+            self._savepoints = 0
 
     # ============ CONFIGURATIONS ============
     def create_configuration(
@@ -94,7 +144,7 @@ class DatabaseService:
     ) -> Dict[str, Any]:
         cfg_id = str(uuid.uuid4())
         hp_json = json.dumps(hyperparams) if hyperparams else None
-        with self.conn:
+        with self._tx():
             self.conn.execute(
                 """
                 INSERT INTO configurations (id, owner_sub, name, dataset_uri, x_column, y_column, model_type, hyperparams_json)
@@ -127,6 +177,18 @@ class DatabaseService:
         ).fetchone()
         return _parse_hp(row) if row else None
 
+    def get_configurations(self, *, cfg_ids: List[str], owner_sub: str) -> Dict[str, Dict[str, Any]]:
+        """Several configurations by id (owner-scoped) -> {id: configuration}."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for chunk in _chunks(list(dict.fromkeys(cfg_ids))):
+            marks = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT * FROM configurations WHERE owner_sub = ? AND id IN ({marks})",
+                (owner_sub, *chunk),
+            ).fetchall()
+            out.update((r["id"], _parse_hp(r)) for r in rows)
+        return out
+
     # ============ JOBS ============
     def insert_job(
         self,
@@ -137,14 +199,44 @@ class DatabaseService:
         k8s_job_name: str,
         resources: Dict[str, Any],
         status: str = "queued",
+        fingerprint: Optional[str] = None,
+        model_uri: Optional[str] = None,
+        metrics_json: Optional[str] = None,
+        executor: str = "kubernetes",
+        reused_from: Optional[str] = None,
     ) -> None:
-        with self.conn:
+        with self._tx():
             self.conn.execute(
                 """
-                INSERT INTO training_jobs (id, owner_sub, configuration_id, status, k8s_job_name, resources_json)
-                VALUES (?,  ?,         ?,                ?,      ?,            ?)
+                INSERT INTO training_jobs (id, owner_sub, configuration_id, status, k8s_job_name, resources_json,
+                                           fingerprint, model_uri, metrics_json, executor, reused_from)
+                VALUES (?,  ?,         ?,                ?,      ?,            ?,
+                        ?,           ?,         ?,            ?,        ?)
+                """,
+                (job_id, owner_sub, configuration_id, status, k8s_job_name, json.dumps(resources),
+                 fingerprint, model_uri, metrics_json, executor, reused_from),
+            )
+
+    def insert_jobs(self, jobs: List[Dict[str, Any]]) -> None:
+        """
+        Inserts many jobs in one transaction (all or nothing). Each dict takes
+        the keyword arguments of insert_job.
+        """
+        with self._tx():
+            self.conn.executemany(
+                """
+                INSERT INTO training_jobs (id, owner_sub, configuration_id, status, k8s_job_name, resources_json,
+                                           fingerprint, model_uri, metrics_json, executor, reused_from)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (job_id, owner_sub, configuration_id, status, k8s_job_name, json.dumps(resources)),
+                [
+                    (
+                        j["job_id"], j["owner_sub"], j["configuration_id"], j.get("status", "queued"), j["k8s_job_name"],
+                        json.dumps(j["resources"]), j.get("fingerprint"), j.get("model_uri"), j.get("metrics_json"),
+                        j.get("executor", "kubernetes"), j.get("reused_from"),
+                    )
+                    for j in jobs
+                ],
             )
 
     def list_jobs(self, *, owner_sub: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
@@ -157,19 +249,76 @@ class DatabaseService:
             """,
             (owner_sub, limit, offset),
         ).fetchall()
-        return [dict(r) for r in rows]
+        return [_parse_job(r) for r in rows]
 
     def get_job(self, *, job_id: str, owner_sub: str) -> Optional[Dict[str, Any]]:
         row = self.conn.execute(
             "SELECT * FROM training_jobs WHERE id = ? AND owner_sub = ?",
             (job_id, owner_sub),
         ).fetchone()
+        return _parse_job(row) if row else None
+
+    def leaderboard(self, *, configuration_id: str, owner_sub: str, metric: str, top: int = 10) -> List[Dict[str, Any]]:
+        """Best `top` succeeded jobs of a configuration by one of LEADERBOARD_METRICS; each trained model once."""
+        direction = LEADERBOARD_METRICS[metric]  # whitelist: column name goes into the SQL
+        rows = self.conn.execute(
+            f"""
+            SELECT * FROM training_jobs
+            WHERE configuration_id = ? AND status = 'succeeded' AND metric_{metric} IS NOT NULL
+              AND owner_sub = ? AND reused_from IS NULL
+            ORDER BY metric_{metric} {direction}
+            LIMIT ?
+            """,
+            (configuration_id, owner_sub, top),
+        ).fetchall()
+        return [_parse_job(r) for r in rows]
+
+    def get_job_statuses(self, *, job_ids: List[str], owner_sub: str) -> List[Dict[str, Any]]:
+        """id, status, updated_at (+ k8s_job_name, executor) for many jobs; unknown ids are skipped."""
+        out: List[Dict[str, Any]] = []
+        for chunk in _chunks(list(dict.fromkeys(job_ids))):
+            marks = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"""
+                SELECT id, status, updated_at, k8s_job_name, executor FROM training_jobs
+                WHERE id IN ({marks}) AND owner_sub = ?
+                """,
+                (*chunk, owner_sub),
+            ).fetchall()
+            out.extend(dict(r) for r in rows)
+        return out
+
+    def list_active_jobs(self, *, owner_subs: List[str]) -> List[Dict[str, Any]]:
+        """Queued/running jobs of the given owners (id, owner_sub, k8s_job_name, status, executor, updated_at)."""
+        if not owner_subs:
+            return []
+        marks = ",".join("?" * len(owner_subs))
+        rows = self.conn.execute(
+            f"""
+            SELECT id, owner_sub, k8s_job_name, status, executor, updated_at FROM training_jobs
+            WHERE owner_sub IN ({marks}) AND status IN ('queued', 'running')
+            """,
+            tuple(owner_subs),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def find_reusable_job(self, *, owner_sub: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Latest succeeded job of this owner with the same training fingerprint."""
+        row = self.conn.execute(
+            """
+            SELECT * FROM training_jobs
+            WHERE owner_sub = ? AND fingerprint = ? AND status = 'succeeded' AND model_uri IS NOT NULL
+            ORDER BY datetime(created_at) DESC
+            LIMIT 1
+            """,
+            (owner_sub, fingerprint),
+        ).fetchone()
         return dict(row) if row else None
 
     def set_job_status(
         self, *, job_id: str, owner_sub: str, status: str, model_uri: Optional[str] = None, metrics_json: Optional[str] = None
     ) -> None:
-        with self.conn:
+        with self._tx():
             self.conn.execute(
                 """
                 UPDATE training_jobs
@@ -181,3 +330,292 @@ class DatabaseService:
                 """,
                 (status, model_uri, metrics_json, job_id, owner_sub),
             )
+
+    def set_jobs_status(self, *, owner_sub: str, updates: List[Tuple[str, str]]) -> None:
+        """
+        Bulk status-only update of jobs that are still queued: [(job_id, status), ...]
+        in one transaction. Rows a status refresh already moved on are left alone.
+        """
+        with self._tx():
+            self.conn.executemany(
+                """
+                UPDATE training_jobs
+                SET status = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND owner_sub = ? AND status = 'queued'
+                """,
+                [(status, job_id, owner_sub) for job_id, status in updates],
+            )
+
+    # ============ JOB STATS ============
+    def get_job_stats(self, *, owner_sub: str) -> Dict[str, Any]:
+        """{"total": owner totals, "configurations": [per-configuration rows]} from job_stats."""
+        rows = [dict(r) for r in self.conn.execute("SELECT * FROM job_stats WHERE owner_sub = ?", (owner_sub,))]
+        total = next((r for r in rows if r["configuration_id"] == "*"), None)
+        if total is None:
+            total = {"owner_sub": owner_sub, "configuration_id": "*", **{s: 0 for s in JOB_STATS_STATUSES},
+                     "total_elapsed_sec": 0.0, "last_job_at": None}
+        configurations = [
+            r for r in rows if r["configuration_id"] != "*" and any(r[s] for s in JOB_STATS_STATUSES)
+        ]
+        return {"total": total, "configurations": configurations}
+
+    def get_owner_version(self, *, owner_sub: str, resource: str) -> int:
+        """Change counter of the owner's 'jobs' or 'configurations' (owner_versions); 0 before any write."""
+        row = self.conn.execute(
+            "SELECT version FROM owner_versions WHERE owner_sub = ? AND resource = ?", (owner_sub, resource)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def rebuild_job_stats(self) -> int:
+        """Recomputes job_stats from training_jobs; returns how many rows were wrong or missing."""
+        counts = ", ".join(f"SUM(status = '{s}')" for s in JOB_STATS_STATUSES)
+
+        def snapshot() -> Dict[Tuple[str, str], tuple]:
+            return {
+                (r[0], r[1]): (r[2], r[3], r[4], r[5], round(r[6], 6), r[7])
+                for r in self.conn.execute(
+                    "SELECT owner_sub, configuration_id, queued, running, succeeded, failed, total_elapsed_sec, last_job_at "
+                    "FROM job_stats WHERE queued + running + succeeded + failed > 0"
+                )
+            }
+
+        with self._tx(immediate=True):  # no job writes between DELETE and INSERT
+            before = snapshot()
+            self.conn.execute("DELETE FROM job_stats")
+            for group in ("configuration_id", "'*'"):
+                self.conn.execute(
+                    f"""
+                    INSERT INTO job_stats (owner_sub, configuration_id, queued, running, succeeded, failed,
+                                           total_elapsed_sec, last_job_at)
+                    SELECT owner_sub, {group}, {counts}, TOTAL(metric_elapsed_sec), MAX(created_at)
+                    FROM training_jobs GROUP BY owner_sub, {group}
+                    """
+                )
+            # counts are complete now; a still-running initial backfill must not add to them
+            self.conn.execute("UPDATE backfills SET last_key = '', done = 1 WHERE name = 'job_stats'")
+            after = snapshot()
+        return sum(1 for k in before.keys() | after.keys() if before.get(k) != after.get(k))
+
+    # ============ WARM POOL ============
+    def insert_warm_task(
+        self, *, task_id: str, owner_sub: str, job_id: str, env: Dict[str, str], sub_paths: Dict[str, str], now: float
+    ) -> None:
+        with self._tx():
+            self.conn.execute(
+                """
+                INSERT INTO warm_tasks (task_id, owner_sub, job_id, env_json, sub_paths_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (task_id, owner_sub, job_id, json.dumps(env), json.dumps(sub_paths), now),
+            )
+
+    def get_warm_task(self, *, task_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT * FROM warm_tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return _parse_warm_task(row) if row else None
+
+    def _expire_warm_leases(self, now: float, max_attempts: int) -> int:
+        # worker stopped heartbeating: queued again for another worker, or failed after max_attempts
+        return self.conn.execute(
+            """
+            UPDATE warm_tasks
+            SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END,
+                finished_at = CASE WHEN attempts < ? THEN NULL ELSE ? END,
+                leased_by = NULL
+            WHERE status = 'running' AND lease_expires_at < ?
+            """,
+            (max_attempts, max_attempts, now, now),
+        ).rowcount
+
+    def expire_warm_leases(self, *, now: float, max_attempts: int) -> int:
+        with self._tx():
+            return self._expire_warm_leases(now, max_attempts)
+
+    def lease_warm_task(
+        self, *, worker_id: str, now: float, lease_seconds: float, max_attempts: int
+    ) -> Optional[Dict[str, Any]]:
+        """Expires stale leases, then leases the oldest queued task to worker_id; None when there is none."""
+        # idle long-polls don't take the write lock
+        if not self.conn.execute(
+            "SELECT 1 FROM warm_tasks WHERE status = 'queued' OR (status = 'running' AND lease_expires_at < ?) LIMIT 1",
+            (now,),
+        ).fetchone():
+            return None
+        with self._tx(immediate=True):
+            self._expire_warm_leases(now, max_attempts)
+            row = self.conn.execute(
+                "SELECT task_id FROM warm_tasks WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                """
+                UPDATE warm_tasks
+                SET status = 'running', attempts = attempts + 1, leased_by = ?, lease_expires_at = ?
+                WHERE task_id = ?
+                """,
+                (worker_id, now + lease_seconds, row[0]),
+            )
+        return self.get_warm_task(task_id=row[0])
+
+    def heartbeat_warm_task(self, *, task_id: str, worker_id: str, lease_expires_at: float) -> bool:
+        """Extends the lease; False when the task is not (or no longer) leased by worker_id."""
+        with self._tx():
+            cur = self.conn.execute(
+                "UPDATE warm_tasks SET lease_expires_at = ? WHERE task_id = ? AND status = 'running' AND leased_by = ?",
+                (lease_expires_at, task_id, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def complete_warm_task(
+        self, *, task_id: str, worker_id: str, status: str, exit_code: Optional[int], now: float
+    ) -> Optional[Dict[str, Any]]:
+        """Records the worker's result; None when the task is not (or no longer) leased by worker_id."""
+        with self._tx():
+            cur = self.conn.execute(
+                """
+                UPDATE warm_tasks SET status = ?, exit_code = ?, finished_at = ?
+                WHERE task_id = ? AND status = 'running' AND leased_by = ?
+                """,
+                (status, exit_code, now, task_id, worker_id),
+            )
+        return self.get_warm_task(task_id=task_id) if cur.rowcount == 1 else None
+
+    def delete_finished_warm_tasks(self, *, before: float) -> int:
+        with self._tx():
+            return self.conn.execute("DELETE FROM warm_tasks WHERE finished_at < ?", (before,)).rowcount
+
+    # ============ RETENTION / GC ============
+    @contextmanager
+    def gc_lock(self) -> Iterator[bool]:
+        """
+        Held for one GC run; yields False when another process has it (every
+        API worker runs the GC loop). A lock file next to the database.
+        """
+        with open(f"{self.db_path}.gc-lock", "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def count_expired_jobs(self, *, cutoffs: Dict[str, str]) -> Dict[str, int]:
+        where, params = _expired_sql(cutoffs)
+        rows = self.conn.execute(
+            f"SELECT status, COUNT(*) AS n FROM training_jobs WHERE {where} GROUP BY status", params
+        ).fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+    def archive_expired_jobs(self, *, cutoffs: Dict[str, str], batch_size: int) -> int:
+        """Moves up to batch_size expired jobs to training_jobs_archive in one transaction."""
+        where, params = _expired_sql(cutoffs)
+        with self._tx(immediate=True):
+            ids = [
+                r[0]
+                for r in self.conn.execute(
+                    f"SELECT id FROM training_jobs WHERE {where} ORDER BY updated_at LIMIT ?", (*params, batch_size)
+                )
+            ]
+            if not ids:
+                return 0
+            marks = ",".join("?" * len(ids))
+            self.conn.execute(
+                f"""
+                INSERT OR REPLACE INTO training_jobs_archive
+                    (id, owner_sub, configuration_id, status, k8s_job_name, model_uri, metrics_json,
+                     resources_json, fingerprint, executor, reused_from, created_at, updated_at)
+                SELECT id, owner_sub, configuration_id, status, k8s_job_name, model_uri, metrics_json,
+                       resources_json, fingerprint, executor, reused_from, created_at, updated_at
+                FROM training_jobs WHERE id IN ({marks})
+                """,
+                ids,
+            )
+            self.conn.execute(f"DELETE FROM training_jobs WHERE id IN ({marks})", ids)
+        return len(ids)
+
+    def kept_job_ids(self, *, job_ids: List[str], cutoffs: Dict[str, str]) -> Set[str]:
+        """The given ids that are in training_jobs and not past retention."""
+        where, params = _expired_sql(cutoffs)
+        kept: Set[str] = set()
+        for chunk in _chunks(job_ids):
+            marks = ",".join("?" * len(chunk))
+            kept.update(
+                r[0]
+                for r in self.conn.execute(
+                    f"SELECT id FROM training_jobs WHERE id IN ({marks}) AND NOT {where}", (*chunk, *params)
+                )
+            )
+        return kept
+
+    def kept_model_uris(self, *, owner_sub: str, cutoffs: Dict[str, str]) -> Set[str]:
+        """model_uri of the owner's retained jobs (reused jobs point at another job's artifacts)."""
+        where, params = _expired_sql(cutoffs)
+        rows = self.conn.execute(
+            f"SELECT DISTINCT model_uri FROM training_jobs WHERE owner_sub = ? AND model_uri IS NOT NULL AND NOT {where}",
+            (owner_sub, *params),
+        )
+        return {r[0] for r in rows}
+
+    def dataset_uris(self, *, owner_sub: str) -> Set[str]:
+        rows = self.conn.execute("SELECT DISTINCT dataset_uri FROM configurations WHERE owner_sub = ?", (owner_sub,))
+        return {r[0] for r in rows}
+
+    def incremental_vacuum(self, *, pages: int) -> Optional[int]:
+        """Returns pages freed, or None when the file isn't in auto_vacuum=INCREMENTAL mode."""
+        if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return None
+        before = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        self.conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        return before - self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def optimize(self) -> None:
+        # ANALYZE only where statistics are stale, bounded per index
+        self.conn.execute("PRAGMA analysis_limit = 400")
+        self.conn.execute("PRAGMA optimize")
+
+    def full_vacuum(self) -> None:
+        """One-off rebuild that also switches the file to incremental auto-vacuum (blocks writers)."""
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.conn.execute("VACUUM")
+
+
+instrument_methods(DatabaseService, DB_QUERY_SECONDS, "db", skip=("close", "batch", "gc_lock"), backend="sqlite")
+
+
+def uses_postgres() -> bool:
+    return bool(settings.database_url) and settings.database_url.startswith(("postgres://", "postgresql://"))
+
+
+def open_database(db_path: Optional[str] = None) -> DatabaseService:
+    """
+    The configured backend: PostgresDatabaseService when database_url is a
+    postgresql:// URL, otherwise SQLite at db_path (default database_path).
+    Callers close() it either way.
+    """
+    if uses_postgres():
+        # local import: psycopg is only loaded when Postgres is configured
+        from .postgres_database_service import PostgresDatabaseService
+
+        return PostgresDatabaseService(settings.database_url)
+    return DatabaseService(db_path)
+
+
+def migrate_database() -> None:
+    """Brings the configured database's schema up to date (once per process)."""
+    if uses_postgres():
+        from .postgres_database_service import PostgresDatabaseService
+
+        PostgresDatabaseService.pool(settings.database_url)
+    else:
+        ensure_migrated(settings.database_path)
+
+
+def close_database() -> None:
+    """Closes pooled connections at shutdown (nothing to do for SQLite)."""
+    if uses_postgres():
+        from .postgres_database_service import PostgresDatabaseService
+
+        PostgresDatabaseService.close_pools()
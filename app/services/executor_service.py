@@ -0,0 +1,157 @@
+# backend/app/services/executor_service.py
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from ..core.config import settings
+
+
+class TrainingExecutor(ABC):
+    """
+    Where a training job runs. Every backend honours the trainer's env-var
+    contract (X_COLUMN, Y_COLUMN, FIT_INTERCEPT, DATASET_PATH, OUTPUT_DIR, ...)
+    and the artifacts/<owner_sub>/<job_id>/ layout, so TrainingJobService
+    treats them interchangeably. training_jobs.executor stores `name`.
+    """
+    name: str
+    # dataset/artifacts are paths under storage_root (sub_paths) even without a PVC
+    uses_local_storage: bool = False
+
+    @abstractmethod
+    def submit(
+        self,
+        *,
+        owner_sub: str,
+        job_id: str,
+        job_name: str,
+        env: Dict[str, str],
+        sub_paths: Optional[Dict[str, str]],
+        resources: Dict[str, str],
+    ) -> str:
+        """Starts the job; returns its initial status (queued|running)."""
+
+    @abstractmethod
+    def get_status(self, job_name: str) -> Optional[str]:
+        """queued|running|succeeded|failed; None when the backend has no record of the job."""
+
+    def get_statuses(self, job_names: Iterable[str]) -> Dict[str, str]:
+        """
+        Statuses of many jobs, leaving out the ones the backend has no record
+        of; backends override this when they can batch the lookup.
+        """
+        statuses = {n: self.get_status(n) for n in job_names}
+        return {n: st for n, st in statuses.items() if st is not None}
+
+    def read_logs(self, job_name: str, tail_lines: Optional[int] = None) -> Optional[bytes]:
+        """Logs so far; None when the backend no longer has them."""
+        return None
+
+    def warm_up(self) -> None:
+        """Loads SDKs / builds clients ahead of the first job (lifespan pre-warm)."""
+
+    def stream_logs(self, job_name: str, tail_lines: Optional[int] = None) -> Iterator[bytes]:
+        """Follows logs until the job exits."""
+        data = self.read_logs(job_name, tail_lines=tail_lines)
+        if data:
+            yield data
+
+
+class KubernetesExecutor(TrainingExecutor):
+    """One Kubernetes Job per training run."""
+    name = "kubernetes"
+
+    def __init__(self):
+        self._k8s = None
+
+    @property
+    def k8s(self):
+        # kubeconfig is loaded on first use, not at import / service construction
+        if self._k8s is None:
+            from .kubernetes_service import KubernetesService
+            self._k8s = KubernetesService(namespace=settings.k8s_namespace)
+        return self._k8s
+
+    def warm_up(self) -> None:
+        self.k8s
+
+    def submit(self, *, owner_sub, job_id, job_name, env, sub_paths, resources) -> str:
+        self.k8s.create_training_job(
+            job_name=job_name,
+            image=settings.trainer_image,
+            env=env,
+            cpu_request=resources["cpu_request"],
+            mem_request=resources["mem_request"],
+            cpu_limit=resources["cpu_limit"],
+            mem_limit=resources["mem_limit"],
+            pv_claim_name=settings.k8s_pvc_name,
+            sub_paths=sub_paths,
+        )
+        return "running"
+
+    def get_status(self, job_name: str) -> Optional[str]:
+        from kubernetes.client.exceptions import ApiException
+        try:
+            return self.k8s.get_job_status(job_name)
+        except ApiException as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def get_statuses(self, job_names: Iterable[str]) -> Dict[str, str]:
+        return self.k8s.list_job_statuses(job_names)
+
+    def read_logs(self, job_name: str, tail_lines: Optional[int] = None) -> Optional[bytes]:
+        return self.k8s.read_job_logs(job_name, tail_lines=tail_lines)
+
+    def stream_logs(self, job_name: str, tail_lines: Optional[int] = None) -> Iterator[bytes]:
+        return self.k8s.stream_job_logs(job_name, tail_lines=tail_lines)
+
+
+class WarmPoolExecutor(TrainingExecutor):
+    """Queues the job for the long-lived warm workers (see WarmPoolService)."""
+    name = "warm_pool"
+    # only file-mode jobs are routed here; workers write under storage_root (their DATA_ROOT)
+    uses_local_storage = True
+
+    def submit(self, *, owner_sub, job_id, job_name, env, sub_paths, resources) -> str:
+        from .warm_pool_service import WarmPoolService
+        WarmPoolService.submit(task_id=job_name, owner_sub=owner_sub, job_id=job_id, env=env, sub_paths=sub_paths or {})
+        return "queued"  # until a worker leases it
+
+    def get_status(self, job_name: str) -> Optional[str]:
+        from .warm_pool_service import WarmPoolService
+        return WarmPoolService.get_status(job_name)
+
+    def get_statuses(self, job_names: Iterable[str]) -> Dict[str, str]:
+        from .warm_pool_service import WarmPoolService
+        return WarmPoolService.get_statuses(job_names)
+
+
+_EXECUTORS: Dict[str, TrainingExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_executor(name: str) -> TrainingExecutor:
+    """Process-wide executor instance by name (kubernetes|warm_pool|local)."""
+    with _EXECUTORS_LOCK:
+        ex = _EXECUTORS.get(name)
+        if ex is None:
+            if name == "kubernetes":
+                ex = KubernetesExecutor()
+            elif name == "warm_pool":
+                ex = WarmPoolExecutor()
+            elif name == "local":
+                from .local_executor_service import LocalExecutor
+                ex = LocalExecutor()
+            else:
+                raise ValueError(f"Unknown executor '{name}'")
+            _EXECUTORS[name] = ex
+        return ex
+
+
+def default_executor() -> TrainingExecutor:
+    return get_executor(settings.executor_backend)
+
+
+def executor_for(job: Dict[str, Any]) -> TrainingExecutor:
+    return get_executor(job.get("executor") or "kubernetes")
@@ -0,0 +1,222 @@
+# backend/app/services/gc_service.py
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from ..core.config import settings
+from .database_service import DatabaseService, open_database
+
+log = logging.getLogger(__name__)
+
+
+class _Throttle:
+    """Caps filesystem operations per second so GC doesn't saturate the PVC."""
+
+    def __init__(self, per_second: int):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self.next_at = time.monotonic()
+
+    def __call__(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self.next_at:
+            time.sleep(self.next_at - now)
+        self.next_at = max(now, self.next_at) + self.interval
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    for dirpath, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class GCService:
+    """
+    Retention and garbage collection:
+      - terminal jobs older than gc_keep_<status>_days move to training_jobs_archive,
+        gc_batch_size rows per transaction;
+      - artifacts/<owner>/<job_id>/ and logs/<owner>/<job_id>.log.gz of jobs that are
+        no longer kept (and not the model of a kept, reused job) are deleted;
+      - uploads/<owner>/* no configuration references are deleted after a grace period;
+      - the database file gives back free pages (incremental vacuum) and refreshes
+        planner statistics (PRAGMA optimize).
+    Filesystem walks are throttled to gc_fs_ops_per_second. run(dry_run=True) only
+    reports what would go. Every worker/pod runs the loop, but a run only sweeps
+    while holding the database's gc_lock(); the others skip that interval.
+    """
+
+    def __init__(self, *, storage_root: Optional[str] = None, db_path: Optional[str] = None):
+        self.root = Path(storage_root or settings.storage_root)
+        self.db_path = db_path
+        self.throttle = _Throttle(settings.gc_fs_ops_per_second)
+
+    @staticmethod
+    def cutoffs(now: Optional[datetime] = None) -> Dict[str, str]:
+        """status -> updated_at before which a job is archived (same format as CURRENT_TIMESTAMP)."""
+        now = now or datetime.now(timezone.utc)
+        out: Dict[str, str] = {}
+        for status, days in (("succeeded", settings.gc_keep_succeeded_days), ("failed", settings.gc_keep_failed_days)):
+            if days > 0:
+                out[status] = (now - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+        return out
+
+    def run(self, *, dry_run: bool = False) -> Dict[str, Any]:
+        started = time.monotonic()
+        cutoffs = self.cutoffs()
+        report: Dict[str, Any] = {"dry_run": dry_run, "cutoffs": cutoffs}
+        db = open_database(self.db_path)
+        try:
+            with db.gc_lock() as locked:
+                if not locked:
+                    report["skipped"] = "another process is running GC"
+                else:
+                    report["jobs_expired"] = db.count_expired_jobs(cutoffs=cutoffs)
+                    report["jobs_archived"] = 0 if dry_run else self._archive_jobs(db, cutoffs)
+                    report["artifacts"] = self._sweep_artifacts(db, cutoffs, dry_run)
+                    report["logs"] = self._sweep_logs(db, cutoffs, dry_run)
+                    report["uploads"] = self._sweep_uploads(db, dry_run)
+                    if not dry_run:
+                        report["vacuum_pages"] = db.incremental_vacuum(pages=settings.gc_vacuum_pages)
+                        db.optimize()
+        finally:
+            db.close()
+        report["elapsed_sec"] = round(time.monotonic() - started, 3)
+        return report
+
+    # ---------- database ----------
+    @staticmethod
+    def _archive_jobs(db: DatabaseService, cutoffs: Dict[str, str]) -> int:
+        archived = 0
+        while True:
+            n = db.archive_expired_jobs(cutoffs=cutoffs, batch_size=settings.gc_batch_size)
+            archived += n
+            if n < settings.gc_batch_size:
+                return archived
+            time.sleep(settings.backfill_pause_seconds)  # let request writes in between batches
+
+    # ---------- filesystem ----------
+    def _entries(self, folder: Path, *, dirs: bool) -> Iterator[os.DirEntry]:
+        """Entries of `folder` (no symlinks) older than gc_min_age_hours, one throttle tick each."""
+        min_mtime = time.time() - settings.gc_min_age_hours * 3600
+        try:
+            it = os.scandir(folder)
+        except FileNotFoundError:
+            return
+        with it:
+            for entry in it:
+                self.throttle()
+                try:
+                    if entry.is_symlink() or entry.is_dir() != dirs:
+                        continue
+                    if entry.stat(follow_symlinks=False).st_mtime > min_mtime:
+                        continue
+                except OSError:
+                    continue
+                yield entry
+
+    def _owners(self, kind: str) -> Iterator[os.DirEntry]:
+        base = self.root / kind
+        if not base.is_dir():
+            return
+        with os.scandir(base) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield entry
+
+    def _remove(self, path: Path, dry_run: bool) -> int:
+        size = _tree_size(path) if path.is_dir() else path.lstat().st_size
+        if not dry_run:
+            self.throttle()
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+        return size
+
+    def _sweep_job_entries(
+        self, db: DatabaseService, cutoffs: Dict[str, str], kind: str, dirs: bool, suffix: str, dry_run: bool
+    ) -> Dict[str, int]:
+        """Removes <kind>/<owner>/<job_id><suffix> entries of jobs that are not kept."""
+        removed = freed = 0
+        for owner in self._owners(kind):
+            candidates: Dict[str, Path] = {}
+            for entry in self._entries(Path(owner.path), dirs=dirs):
+                if entry.name.endswith(suffix):
+                    candidates[entry.name[: len(entry.name) - len(suffix)]] = Path(entry.path)
+            if not candidates:
+                continue
+            kept = db.kept_job_ids(job_ids=list(candidates), cutoffs=cutoffs)
+            if kind == "artifacts":
+                # reused jobs keep pointing at another job's model.pkl
+                for uri in db.kept_model_uris(owner_sub=owner.name, cutoffs=cutoffs):
+                    kept.add(Path(uri.removeprefix("file://")).parent.name)
+            for job_id, path in candidates.items():
+                if job_id in kept:
+                    continue
+                try:
+                    freed += self._remove(path, dry_run)
+                    removed += 1
+                except OSError as e:
+                    log.warning("GC could not remove %s: %s", path, e)
+        return {"removed": removed, "bytes": freed}
+
+    def _sweep_artifacts(self, db: DatabaseService, cutoffs: Dict[str, str], dry_run: bool) -> Dict[str, int]:
+        return self._sweep_job_entries(db, cutoffs, "artifacts", True, "", dry_run)
+
+    def _sweep_logs(self, db: DatabaseService, cutoffs: Dict[str, str], dry_run: bool) -> Dict[str, int]:
+        return self._sweep_job_entries(db, cutoffs, "logs", False, ".log.gz", dry_run)
+
+    def _sweep_uploads(self, db: DatabaseService, dry_run: bool) -> Dict[str, int]:
+        removed = freed = 0
+        grace = time.time() - settings.gc_upload_grace_days * 86400
+        for owner in self._owners("uploads"):
+            referenced = {uri.removeprefix("file://") for uri in db.dataset_uris(owner_sub=owner.name)}
+            for entry in self._entries(Path(owner.path), dirs=False):
+                path = Path(entry.path)
+                if str(path.resolve()) in referenced or entry.path in referenced:
+                    continue
+                try:
+                    if entry.stat(follow_symlinks=False).st_mtime > grace:
+                        continue
+                    freed += self._remove(path, dry_run)
+                    removed += 1
+                except OSError as e:
+                    log.warning("GC could not remove %s: %s", path, e)
+        return {"removed": removed, "bytes": freed}
+
+    # ---------- background loop ----------
+    _thread: Optional[threading.Thread] = None
+    _stop = threading.Event()
+
+    @classmethod
+    def start(cls) -> None:
+        """Runs GC every gc_interval_seconds in a daemon thread (no-op unless gc_enabled)."""
+        if not settings.gc_enabled or (cls._thread and cls._thread.is_alive()):
+            return
+        cls._stop.clear()
+        cls._thread = threading.Thread(target=cls._loop, name="podml-gc", daemon=True)
+        cls._thread.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        cls._stop.set()
+
+    @classmethod
+    def _loop(cls) -> None:
+        while not cls._stop.wait(settings.gc_interval_seconds):
+            try:
+                report = cls().run()
+                log.info("GC: %s", report)
+            except Exception as e:
+                log.warning("GC run failed: %s", e)
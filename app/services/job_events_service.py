@@ -0,0 +1,181 @@
+# backend/app/services/job_events_service.py
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ..core.config import settings
+
+log = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+class JobEventBus:
+    """
+    In-process pub/sub for job status transitions, keyed by owner_sub.
+    Each subscriber is a bounded asyncio.Queue; an idle subscriber costs one
+    queue and one suspended coroutine. publish() is safe to call from worker
+    threads (sync routers, services) as well as from the event loop.
+    The last status published per job is kept while its owner is subscribed,
+    so JobStatusWatcher can tell transitions made by other processes apart.
+    """
+    QUEUE_SIZE = 100
+
+    _subscribers: Dict[str, Set[asyncio.Queue]] = {}
+    _published: Dict[str, Dict[str, str]] = {}  # owner_sub -> job_id -> status
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def subscribe(cls, owner_sub: str) -> asyncio.Queue:
+        """Must be called from the event loop."""
+        q: asyncio.Queue = asyncio.Queue(maxsize=cls.QUEUE_SIZE)
+        with cls._lock:
+            cls._loop = asyncio.get_running_loop()
+            cls._subscribers.setdefault(owner_sub, set()).add(q)
+        JobStatusWatcher.ensure_running()
+        return q
+
+    @classmethod
+    def unsubscribe(cls, owner_sub: str, q: asyncio.Queue) -> None:
+        with cls._lock:
+            subs = cls._subscribers.get(owner_sub)
+            if subs is not None:
+                subs.discard(q)
+                if not subs:
+                    del cls._subscribers[owner_sub]
+                    cls._published.pop(owner_sub, None)
+
+    @classmethod
+    def has_subscribers(cls, owner_sub: str) -> bool:
+        return owner_sub in cls._subscribers
+
+    @classmethod
+    def subscribed_owners(cls) -> List[str]:
+        with cls._lock:
+            return list(cls._subscribers)
+
+    @classmethod
+    def published_statuses(cls, owner_sub: str) -> Dict[str, str]:
+        """job_id -> status of the jobs published for this owner since it subscribed."""
+        with cls._lock:
+            return dict(cls._published.get(owner_sub, ()))
+
+    @classmethod
+    def forget(cls, owner_sub: str, job_ids: Iterable[str]) -> None:
+        with cls._lock:
+            published = cls._published.get(owner_sub)
+            for job_id in job_ids if published else ():
+                published.pop(job_id, None)
+
+    @classmethod
+    def publish(cls, owner_sub: str, event: Dict[str, Any]) -> None:
+        with cls._lock:
+            if owner_sub not in cls._subscribers or cls._loop is None:
+                return
+            cls._published.setdefault(owner_sub, {})[event["id"]] = event["status"]
+            loop = cls._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            cls._deliver(owner_sub, event)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(cls._deliver, owner_sub, event)
+
+    @classmethod
+    def _deliver(cls, owner_sub: str, event: Dict[str, Any]) -> None:
+        for q in list(cls._subscribers.get(owner_sub, ())):
+            if q.full():
+                # slow consumer: drop the oldest event rather than block publishers
+                try:
+                    q.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            q.put_nowait(event)
+
+
+class JobStatusWatcher:
+    """
+    Single background task that refreshes non-terminal jobs of subscribed owners,
+    so status transitions reach the bus without clients polling. Runs only while
+    there are subscribers; one sweep per interval regardless of subscriber count.
+
+    Each sweep also compares the rows in the database with what this process
+    published: jobs created or moved on by other API pods (or by warm workers
+    reporting to them) are published here too, one interval later.
+    """
+    _task: Optional[asyncio.Task] = None
+    _watched: Dict[str, Dict[str, str]] = {}  # owner_sub -> job_id -> status of its active jobs at the last sweep
+
+    @classmethod
+    def ensure_running(cls) -> None:
+        if cls._task is None or cls._task.done():
+            cls._task = asyncio.get_running_loop().create_task(cls._run())
+
+    @classmethod
+    async def _run(cls) -> None:
+        from starlette.concurrency import run_in_threadpool
+
+        while True:
+            await asyncio.sleep(settings.job_watch_interval_seconds)
+            owners = JobEventBus.subscribed_owners()
+            if not owners:
+                return
+            try:
+                await run_in_threadpool(cls._sweep, owners)
+            except Exception as e:
+                log.warning("Job status sweep failed: %s", e)
+
+    @classmethod
+    def _sweep(cls, owners: List[str]) -> None:
+        # local imports: training_job_service publishes through this module
+        from .database_service import open_database
+        from .training_job_service import TrainingJobService
+
+        db = open_database()
+        try:
+            active = db.list_active_jobs(owner_subs=owners)
+        finally:
+            db.close()
+        by_owner: Dict[str, List[Dict[str, Any]]] = {owner_sub: [] for owner_sub in owners}
+        for job in active:
+            by_owner.setdefault(job["owner_sub"], []).append(job)
+        svc = TrainingJobService()
+        for owner_sub, jobs in by_owner.items():
+            if not jobs:
+                continue
+            try:
+                # one status query per executor; publishes every transition it returns
+                svc.refresh_many(owner_sub=owner_sub, jobs=jobs)
+            except Exception as e:
+                log.warning("Refreshing %d jobs of %s failed: %s", len(jobs), owner_sub, e)
+        cls._publish_db_changes(by_owner)
+
+    @classmethod
+    def _publish_db_changes(cls, by_owner: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Publishes rows whose status differs from the last one this process published or saw."""
+        from .database_service import open_database
+
+        watched, cls._watched = cls._watched, {}
+        db = open_database()
+        try:
+            for owner_sub, jobs in by_owner.items():
+                before = watched.get(owner_sub)
+                ids = {j["id"] for j in jobs} | set(before or ())
+                rows = db.get_job_statuses(job_ids=list(ids), owner_sub=owner_sub) if ids else []
+                if before is not None:  # on an owner's first sweep there is nothing to compare with
+                    published = JobEventBus.published_statuses(owner_sub)
+                    for row in rows:
+                        if row["status"] == (published.get(row["id"]) or before.get(row["id"])):
+                            continue
+                        job = db.get_job(job_id=row["id"], owner_sub=owner_sub)
+                        if job:
+                            JobEventBus.publish(owner_sub, job)
+                active = {r["id"]: r["status"] for r in rows if r["status"] not in TERMINAL_STATUSES}
+                JobEventBus.forget(owner_sub, ids - active.keys())
+                cls._watched[owner_sub] = active
+        finally:
+            db.close()
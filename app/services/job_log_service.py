@@ -0,0 +1,67 @@
+# backend/app/services/job_log_service.py
+import gzip
+import os
+import struct
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Iterator, Optional
+
+from ..core.config import settings
+
+
+class JobLogService:
+    """
+    Archived trainer logs, gzip-compressed on local storage:
+        <storage_root>/logs/<owner_sub>/<job_id>.log.gz
+    Pods are deleted ttl_seconds_after_finished after the job ends; once a log
+    is archived, reads are served from here instead of the Kubernetes API.
+    """
+    CHUNK = 64 * 1024
+
+    def __init__(self, root: str | None = None):
+        self.root = Path(root or settings.storage_root) / "logs"
+
+    def path(self, owner_sub: str, job_id: str) -> Path:
+        return self.root / owner_sub / f"{job_id}.log.gz"
+
+    def exists(self, owner_sub: str, job_id: str) -> bool:
+        return self.path(owner_sub, job_id).is_file()
+
+    def archive(self, owner_sub: str, job_id: str, data: bytes) -> Path:
+        dest = self.path(owner_sub, job_id)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        # a temp file of its own: concurrent archivers of one job must not share one
+        tmp = tempfile.NamedTemporaryFile(dir=dest.parent, prefix=f".{job_id}.", suffix=".tmp", delete=False)
+        try:
+            with tmp, gzip.GzipFile(filename="", mode="wb", compresslevel=6, fileobj=tmp) as f:
+                f.write(data)
+            os.replace(tmp.name, dest)  # readers never see a half-written archive
+        except BaseException:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+        return dest
+
+    def size(self, owner_sub: str, job_id: str) -> int:
+        """Uncompressed size, from the gzip trailer (ISIZE; logs are far below 4 GiB)."""
+        with self.path(owner_sub, job_id).open("rb") as f:
+            f.seek(-4, os.SEEK_END)
+            return struct.unpack("<I", f.read(4))[0]
+
+    def read_range(self, owner_sub: str, job_id: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Yields uncompressed bytes [start, end] (inclusive, like HTTP Range)."""
+        with gzip.open(self.path(owner_sub, job_id), "rb") as f:
+            if start:
+                f.seek(start)  # decompresses forward; no extra memory
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(self.CHUNK if remaining is None else min(self.CHUNK, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def tail(self, owner_sub: str, job_id: str, lines: int) -> bytes:
+        with gzip.open(self.path(owner_sub, job_id), "rb") as f:
+            return b"".join(deque(f, maxlen=lines))
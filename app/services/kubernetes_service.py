@@ -1,6 +1,8 @@
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, Optional
 from kubernetes import client, config
 
+from ..core.metrics import K8S_API_SECONDS, timed
+
 
 class KubernetesService:
     def __init__(self, namespace: str = "default"):
@@ -11,7 +13,9 @@ class KubernetesService:
             config.load_kube_config()
         self.ns = namespace
         self.batch = client.BatchV1Api()
+        self.core = client.CoreV1Api()
 
+    @timed(K8S_API_SECONDS.labels(operation="create_job"), "k8s")
     def create_training_job(
         self,
         *,
@@ -102,8 +106,8 @@ class KubernetesService:
         created = self.batch.create_namespaced_job(namespace=self.ns, body=job)
         return created.metadata.name
 
-    def get_job_status(self, job_name: str) -> str:
-        j = self.batch.read_namespaced_job_status(name=job_name, namespace=self.ns)
+    @staticmethod
+    def _status_of(j) -> str:
         conds = j.status.conditions or []
         if any(c.type == "Failed" and c.status == "True" for c in conds):
             return "failed"
@@ -112,3 +116,66 @@ class KubernetesService:
         if j.status.active and j.status.active > 0:
             return "running"
         return "queued"
+
+    @timed(K8S_API_SECONDS.labels(operation="read_job_status"), "k8s")
+    def get_job_status(self, job_name: str) -> str:
+        j = self.batch.read_namespaced_job_status(name=job_name, namespace=self.ns)
+        return self._status_of(j)
+
+    @timed(K8S_API_SECONDS.labels(operation="list_jobs"), "k8s")
+    def list_job_statuses(self, job_names: Iterable[str]) -> Dict[str, str]:
+        """
+        Statuses of many jobs from paginated list calls over our label instead
+        of one read per job. Jobs that no longer exist are missing from the result.
+        """
+        wanted = set(job_names)
+        out: Dict[str, str] = {}
+        token = None
+        while True:
+            kwargs = {"namespace": self.ns, "label_selector": "app=podml", "limit": 500}
+            if token:
+                kwargs["_continue"] = token
+            page = self.batch.list_namespaced_job(**kwargs)
+            for j in page.items:
+                if j.metadata.name in wanted:
+                    out[j.metadata.name] = self._status_of(j)
+            token = page.metadata._continue if page.metadata else None
+            if not token or len(out) == len(wanted):
+                return out
+
+    @timed(K8S_API_SECONDS.labels(operation="list_pods"), "k8s")
+    def _job_pod_name(self, job_name: str) -> Optional[str]:
+        pods = self.core.list_namespaced_pod(namespace=self.ns, label_selector=f"job={job_name}").items
+        if not pods:
+            return None
+        # backoff_limit=0 -> normally one pod; take the newest if there are more
+        pods.sort(key=lambda p: p.metadata.creation_timestamp or 0, reverse=True)
+        return pods[0].metadata.name
+
+    @timed(K8S_API_SECONDS.labels(operation="read_pod_log"), "k8s")
+    def read_job_logs(self, job_name: str, tail_lines: Optional[int] = None) -> Optional[bytes]:
+        """Trainer container logs so far; None once the pod is gone (TTL)."""
+        pod = self._job_pod_name(job_name)
+        if not pod:
+            return None
+        resp = self.core.read_namespaced_pod_log(
+            name=pod, namespace=self.ns, container="trainer", tail_lines=tail_lines, _preload_content=False
+        )
+        try:
+            return resp.data
+        finally:
+            resp.release_conn()
+
+    def stream_job_logs(self, job_name: str, tail_lines: Optional[int] = None) -> Iterator[bytes]:
+        """Follows the trainer container logs until the container exits."""
+        pod = self._job_pod_name(job_name)
+        if not pod:
+            return
+        resp = self.core.read_namespaced_pod_log(
+            name=pod, namespace=self.ns, container="trainer", follow=True, tail_lines=tail_lines, _preload_content=False
+        )
+        try:
+            for chunk in resp.stream(4096):
+                yield chunk
+        finally:
+            resp.release_conn()
@@ -0,0 +1,193 @@
+# backend/app/services/local_executor_service.py
+import logging
+import math
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from ..core.config import settings
+from .executor_service import TrainingExecutor
+
+log = logging.getLogger(__name__)
+
+_QUANTITY = re.compile(r"^(\d+(?:\.\d+)?)([a-zA-Z]*)$")
+_SUFFIXES = {
+    "": 1, "k": 10**3, "M": 10**6, "G": 10**9, "T": 10**12,
+    "Ki": 2**10, "Mi": 2**20, "Gi": 2**30, "Ti": 2**40,
+}
+
+
+def parse_memory(quantity: str) -> int:
+    """Kubernetes memory quantity ("256Mi", "1G", "1048576") -> bytes."""
+    m = _QUANTITY.match(quantity.strip())
+    if not m or m.group(2) not in _SUFFIXES:
+        raise ValueError(f"Invalid memory quantity: {quantity}")
+    return int(float(m.group(1)) * _SUFFIXES[m.group(2)])
+
+
+def parse_cpu(quantity: str) -> float:
+    """Kubernetes CPU quantity ("500m", "1", "1.5") -> cores."""
+    q = quantity.strip()
+    if q.endswith("m"):
+        return int(q[:-1]) / 1000
+    return float(q)
+
+
+# Applies the limits in the child, then execs the trainer in the same process.
+# A preexec_fn would do this between fork and exec, which can deadlock in a
+# threaded parent like the API server. argv: mem_bytes cpu_seconds program args...
+_EXEC_WITH_LIMITS = """
+import os, resource, sys
+for limit, value in ((resource.RLIMIT_AS, int(sys.argv[1])), (resource.RLIMIT_CPU, int(sys.argv[2]))):
+    try:
+        resource.setrlimit(limit, (value, value))
+    except (ValueError, OSError):
+        pass  # not enforceable here (e.g. RLIMIT_AS on macOS)
+os.execvp(sys.argv[3], sys.argv[3:])
+"""
+
+
+def _limited_command(argv: List[str], mem_bytes: int, cpu_seconds: int) -> List[str]:
+    return [settings.local_executor_python, "-c", _EXEC_WITH_LIMITS, str(mem_bytes), str(cpu_seconds), *argv]
+
+
+class LocalExecutor(TrainingExecutor):
+    """
+    Runs trainer/linear_regression/train.py as a subprocess on this host, through
+    a bounded pool (local_executor_workers concurrent trainers). Same env-var
+    contract and artifacts layout as the Kubernetes Job, with storage_root in
+    place of the PVC. Per job: memory limit -> RLIMIT_AS, CPU limit -> BLAS/OpenMP
+    thread count and an RLIMIT_CPU budget, plus a wall-clock timeout.
+    Status comes from the pool futures; they live in this process only.
+    """
+    name = "local"
+    uses_local_storage = True
+    FINISHED_KEEP_SECONDS = 3600
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or settings.local_executor_workers, thread_name_prefix="podml-local"
+        )
+        self._futures: Dict[str, Future] = {}
+        self._finished: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._log_dir = Path(tempfile.mkdtemp(prefix="podml-local-logs-"))
+
+    def _log_path(self, job_name: str) -> Path:
+        return self._log_dir / f"{job_name}.log"
+
+    def submit(self, *, owner_sub, job_id, job_name, env, sub_paths, resources) -> str:
+        if not sub_paths:
+            raise ValueError("Local executor needs a file:// dataset under storage_root.")
+        root = os.path.abspath(settings.storage_root)
+        cores = max(1, math.ceil(parse_cpu(resources["cpu_limit"])))
+        threads = str(cores)
+        full_env = {
+            "PATH": os.environ.get("PATH", ""),
+            **env,
+            "DATASET_PATH": os.path.join(root, sub_paths["dataset"]),
+            "OUTPUT_DIR": os.path.join(root, sub_paths["artifacts"]),
+            "TMP_DIR": tempfile.mkdtemp(prefix=f"{job_name}-"),
+            "OMP_NUM_THREADS": threads,
+            "OPENBLAS_NUM_THREADS": threads,
+            "MKL_NUM_THREADS": threads,
+            "PYTHONUNBUFFERED": "1",
+        }
+        mem_bytes = parse_memory(resources["mem_limit"])
+        cpu_seconds = cores * settings.local_executor_timeout_seconds
+
+        with self._lock:
+            self._prune(time.time())
+            fut = self._pool.submit(self._run, job_name, full_env, mem_bytes, cpu_seconds)
+            self._futures[job_name] = fut
+        fut.add_done_callback(lambda f: self._on_done(job_name, owner_sub, job_id))
+        return "queued"
+
+    def _run(self, job_name: str, env: Dict[str, str], mem_bytes: int, cpu_seconds: int) -> int:
+        with self._log_path(job_name).open("wb") as out:
+            try:
+                proc = subprocess.run(
+                    _limited_command(
+                        [settings.local_executor_python, "-u", settings.trainer_script], mem_bytes, cpu_seconds
+                    ),
+                    env=env,
+                    stdout=out,
+                    stderr=subprocess.STDOUT,
+                    timeout=settings.local_executor_timeout_seconds,
+                )
+            except subprocess.TimeoutExpired:
+                out.write(b"[executor] timed out\n")
+                return -1
+            finally:
+                shutil.rmtree(env["TMP_DIR"], ignore_errors=True)
+        return proc.returncode
+
+    def _on_done(self, job_name: str, owner_sub: str, job_id: str) -> None:
+        with self._lock:
+            self._finished[job_name] = time.time()
+        # persist terminal state now; futures are pruned later
+        from .training_job_service import TrainingJobService
+        try:
+            TrainingJobService().refresh_and_get(owner_sub=owner_sub, job_id=job_id)
+        except Exception as e:
+            log.warning("Persisting local job %s failed: %s", job_name, e)
+
+    def _prune(self, now: float) -> None:
+        for job_name, at in list(self._finished.items()):
+            if now - at > self.FINISHED_KEEP_SECONDS:
+                self._futures.pop(job_name, None)
+                self._finished.pop(job_name, None)
+                self._log_path(job_name).unlink(missing_ok=True)
+
+    def get_status(self, job_name: str) -> Optional[str]:
+        with self._lock:
+            fut = self._futures.get(job_name)
+        if fut is None:
+            return None  # not submitted yet, or lost with a backend restart
+        if not fut.done():
+            return "running" if fut.running() else "queued"
+        if fut.exception() is not None:
+            return "failed"
+        return "succeeded" if fut.result() == 0 else "failed"
+
+    def read_logs(self, job_name: str, tail_lines: Optional[int] = None) -> Optional[bytes]:
+        try:
+            data = self._log_path(job_name).read_bytes()
+        except FileNotFoundError:
+            return None
+        if tail_lines:
+            data = b"".join(data.splitlines(keepends=True)[-tail_lines:])
+        return data
+
+    def stream_logs(self, job_name: str, tail_lines: Optional[int] = None) -> Iterator[bytes]:
+        with self._lock:
+            fut = self._futures.get(job_name)
+        if fut is None:
+            return
+        while not fut.done() and not self._log_path(job_name).exists():
+            time.sleep(0.2)
+        try:
+            f = self._log_path(job_name).open("rb")
+        except FileNotFoundError:
+            return
+        with f:
+            if tail_lines:
+                yield b"".join(f.read().splitlines(keepends=True)[-tail_lines:])
+            while True:
+                chunk = f.read(64 * 1024)
+                if chunk:
+                    yield chunk
+                elif fut.done():
+                    rest = f.read()
+                    if rest:
+                        yield rest
+                    return
+                else:
+                    time.sleep(0.2)
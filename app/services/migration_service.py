@@ -0,0 +1,479 @@
+# backend/app/services/migration_service.py
+import fcntl
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from ..core.config import settings
+
+log = logging.getLogger(__name__)
+
+JOB_STATS_STATUSES = ("queued", "running", "succeeded", "failed")
+
+# ---------- schema history ----------
+# Migrations are applied in order, each in its own transaction, and
+# PRAGMA user_version records the last one applied. Never edit a migration
+# that has shipped; add a new one. Steps are written so that databases created
+# before versioning (user_version 0, tables already there) upgrade cleanly.
+
+V1_BASELINE = """
+CREATE TABLE IF NOT EXISTS configurations (
+    id TEXT PRIMARY KEY,
+    owner_sub TEXT NOT NULL,
+    name TEXT NOT NULL,
+    dataset_uri TEXT NOT NULL,
+    x_column TEXT NOT NULL,
+    y_column TEXT NOT NULL,
+    model_type TEXT NOT NULL DEFAULT 'linear_regression',
+    hyperparams_json TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_configurations_owner
+    ON configurations (owner_sub, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS training_jobs (
+  id TEXT PRIMARY KEY,
+  owner_sub TEXT NOT NULL,
+  configuration_id TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'queued',  -- queued|running|succeeded|failed
+  k8s_job_name TEXT NOT NULL,
+  model_uri TEXT,
+  metrics_json TEXT,
+  resources_json TEXT,
+  created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY(configuration_id) REFERENCES configurations(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_training_jobs_owner
+    ON training_jobs (owner_sub, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_training_jobs_cfg
+    ON training_jobs (configuration_id, created_at DESC);
+"""
+
+V2_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_training_jobs_fingerprint
+    ON training_jobs (owner_sub, fingerprint, status);
+"""
+
+# metrics.json keys as virtual generated columns: computed from metrics_json on
+# read (set_job_status writes nothing extra) and indexable
+V3_METRIC_COLUMNS = {
+    f"metric_{key}": f"{typ} GENERATED ALWAYS AS "
+    f"(CASE WHEN json_valid(metrics_json) THEN json_extract(metrics_json, '$.{key}') END) VIRTUAL"
+    for key, typ in (("r2", "REAL"), ("mse", "REAL"), ("n_rows", "INTEGER"), ("elapsed_sec", "REAL"))
+}
+
+V3_INDEXES = """
+-- leaderboards: top-k of one configuration is a range scan on one of these
+CREATE INDEX IF NOT EXISTS idx_training_jobs_cfg_r2
+    ON training_jobs (configuration_id, metric_r2) WHERE status = 'succeeded';
+CREATE INDEX IF NOT EXISTS idx_training_jobs_cfg_mse
+    ON training_jobs (configuration_id, metric_mse) WHERE status = 'succeeded';
+CREATE INDEX IF NOT EXISTS idx_training_jobs_cfg_n_rows
+    ON training_jobs (configuration_id, metric_n_rows) WHERE status = 'succeeded';
+CREATE INDEX IF NOT EXISTS idx_training_jobs_cfg_elapsed_sec
+    ON training_jobs (configuration_id, metric_elapsed_sec) WHERE status = 'succeeded';
+"""
+
+
+def _job_stats_upsert(row: str, sign: str, last_job_at: str) -> str:
+    """Adds `sign` x (status counts, elapsed) of NEW/OLD `row` to its configuration and owner rows."""
+    deltas = ", ".join(
+        [f"{sign}({row}.status = '{s}')" for s in JOB_STATS_STATUSES]
+        + [f"{sign}COALESCE({row}.metric_elapsed_sec, 0)", last_job_at]
+    )
+    return f"""
+  INSERT INTO job_stats (owner_sub, configuration_id, queued, running, succeeded, failed, total_elapsed_sec, last_job_at)
+  VALUES ({row}.owner_sub, {row}.configuration_id, {deltas}), ({row}.owner_sub, '*', {deltas})
+  ON CONFLICT (owner_sub, configuration_id) DO UPDATE SET
+    queued = queued + excluded.queued,
+    running = running + excluded.running,
+    succeeded = succeeded + excluded.succeeded,
+    failed = failed + excluded.failed,
+    total_elapsed_sec = total_elapsed_sec + excluded.total_elapsed_sec,
+    last_job_at = COALESCE(MAX(last_job_at, excluded.last_job_at), last_job_at, excluded.last_job_at);"""
+
+
+def _backfilled(row: str) -> str:
+    # rows past the job_stats backfill cursor are counted by the backfill itself
+    return f"EXISTS (SELECT 1 FROM backfills WHERE name = 'job_stats' AND (done OR {row}.id <= last_key))"
+
+
+# job_stats: per (owner, configuration) counters, plus one row per owner with
+# configuration_id = '*' for the owner's totals. The triggers keep it in step with
+# training_jobs inside the writing transaction; deletes don't move last_job_at back
+# (DatabaseService.rebuild_job_stats does).
+V4_JOB_STATS = f"""
+CREATE TABLE IF NOT EXISTS backfills (
+  name TEXT PRIMARY KEY,
+  last_key TEXT NOT NULL DEFAULT '',
+  done INTEGER NOT NULL DEFAULT 0
+);
+
+DROP TRIGGER IF EXISTS trg_job_stats_insert;
+DROP TRIGGER IF EXISTS trg_job_stats_update;
+DROP TRIGGER IF EXISTS trg_job_stats_delete;
+DROP TABLE IF EXISTS job_stats;
+
+CREATE TABLE job_stats (
+  owner_sub TEXT NOT NULL,
+  configuration_id TEXT NOT NULL,
+  queued INTEGER NOT NULL DEFAULT 0,
+  running INTEGER NOT NULL DEFAULT 0,
+  succeeded INTEGER NOT NULL DEFAULT 0,
+  failed INTEGER NOT NULL DEFAULT 0,
+  total_elapsed_sec REAL NOT NULL DEFAULT 0,
+  last_job_at TIMESTAMP,
+  PRIMARY KEY (owner_sub, configuration_id)
+) WITHOUT ROWID;
+
+INSERT OR REPLACE INTO backfills (name, last_key, done)
+VALUES ('job_stats', '', NOT EXISTS (SELECT 1 FROM training_jobs));
+
+CREATE TRIGGER trg_job_stats_insert AFTER INSERT ON training_jobs
+WHEN {_backfilled("NEW")}
+BEGIN{_job_stats_upsert("NEW", "", "NEW.created_at")}
+END;
+
+CREATE TRIGGER trg_job_stats_update AFTER UPDATE OF status, metrics_json ON training_jobs
+WHEN (OLD.status IS NOT NEW.status OR OLD.metrics_json IS NOT NEW.metrics_json) AND {_backfilled("OLD")}
+BEGIN{_job_stats_upsert("OLD", "-", "NULL")}{_job_stats_upsert("NEW", "", "NULL")}
+END;
+
+CREATE TRIGGER trg_job_stats_delete AFTER DELETE ON training_jobs
+WHEN {_backfilled("OLD")}
+BEGIN{_job_stats_upsert("OLD", "-", "NULL")}
+END;
+"""
+
+# GC (GCService) moves expired terminal jobs here; same columns minus the
+# generated metric_* ones.
+V5_JOB_ARCHIVE = """
+CREATE TABLE IF NOT EXISTS training_jobs_archive (
+  id TEXT PRIMARY KEY,
+  owner_sub TEXT NOT NULL,
+  configuration_id TEXT NOT NULL,
+  status TEXT NOT NULL,
+  k8s_job_name TEXT NOT NULL,
+  model_uri TEXT,
+  metrics_json TEXT,
+  resources_json TEXT,
+  fingerprint TEXT,
+  executor TEXT NOT NULL,
+  created_at TIMESTAMP NOT NULL,
+  updated_at TIMESTAMP NOT NULL,
+  archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_training_jobs_archive_owner
+    ON training_jobs_archive (owner_sub, created_at DESC);
+
+-- retention scans: oldest terminal jobs of one status first
+CREATE INDEX IF NOT EXISTS idx_training_jobs_status_updated
+    ON training_jobs (status, updated_at);
+"""
+
+
+def _owner_version_bump(row: str, resource: str) -> str:
+    return f"""
+  INSERT INTO owner_versions (owner_sub, resource, version)
+  VALUES ({row}.owner_sub, '{resource}', abs(random() % 1000000000))
+  ON CONFLICT (owner_sub, resource) DO UPDATE SET version = version + 1;"""
+
+
+# owner_versions: a counter per (owner, 'jobs'|'configurations') bumped in the
+# writing transaction of every change to that owner's rows; ETags of the GET
+# endpoints are built from it. New counters start at a random value so a
+# recreated database doesn't hand out versions clients already hold.
+V6_OWNER_VERSIONS = f"""
+CREATE TABLE IF NOT EXISTS owner_versions (
+  owner_sub TEXT NOT NULL,
+  resource TEXT NOT NULL,
+  version INTEGER NOT NULL,
+  PRIMARY KEY (owner_sub, resource)
+) WITHOUT ROWID;
+""" + "".join(
+    f"""
+CREATE TRIGGER IF NOT EXISTS trg_owner_versions_{resource}_{event.lower()} AFTER {event} ON {table}
+BEGIN{_owner_version_bump("OLD" if event == "DELETE" else "NEW", resource)}
+END;
+"""
+    for table, resource in (("training_jobs", "jobs"), ("configurations", "configurations"))
+    for event in ("INSERT", "UPDATE", "DELETE")
+)
+
+# Warm pool work queue (WarmPoolService): tasks and their worker leases live
+# here so any API replica can hand out, extend and complete them. Times are
+# unix seconds.
+V7_WARM_TASKS = """
+CREATE TABLE IF NOT EXISTS warm_tasks (
+  task_id TEXT PRIMARY KEY,              -- == training_jobs.k8s_job_name ("warm-xxxxxxxx")
+  owner_sub TEXT NOT NULL,
+  job_id TEXT NOT NULL,
+  env_json TEXT NOT NULL,
+  sub_paths_json TEXT NOT NULL,          -- relative to the worker's DATA_ROOT (the PVC)
+  status TEXT NOT NULL DEFAULT 'queued', -- queued|running|succeeded|failed
+  attempts INTEGER NOT NULL DEFAULT 0,
+  leased_by TEXT,
+  lease_expires_at REAL,
+  exit_code INTEGER,
+  created_at REAL NOT NULL,
+  finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_warm_tasks_status ON warm_tasks (status, created_at);
+"""
+
+# Reused jobs (same training fingerprint) point at an earlier job's artifacts
+# and train nothing: reused_from marks them for the leaderboard, and their copy
+# of metrics.json has no elapsed_sec, so job_stats doesn't count training time
+# twice. Rows reused before this migration are recognised by a model.pkl outside
+# their own artifacts directory (artifacts/<owner>/<job id>/); rewriting their
+# metrics_json goes through trg_job_stats_update and corrects job_stats.
+V8_REUSED_FROM_BACKFILL = """
+UPDATE training_jobs
+SET reused_from = substr(model_uri, -46, 36),
+    metrics_json = CASE WHEN json_valid(metrics_json) THEN json_remove(metrics_json, '$.elapsed_sec')
+                        ELSE metrics_json END
+WHERE status = 'succeeded' AND reused_from IS NULL
+  AND model_uri LIKE 'file://%/model.pkl' AND model_uri NOT LIKE '%/' || id || '/model.pkl';
+"""
+
+
+def _run_script(conn: sqlite3.Connection, sql: str) -> None:
+    """Runs statements one by one; executescript() would commit the migration's transaction."""
+    stmt = ""
+    for line in sql.splitlines(keepends=True):
+        stmt += line
+        if sqlite3.complete_statement(stmt):
+            conn.execute(stmt)
+            stmt = ""
+    if stmt.strip():
+        raise ValueError(f"Incomplete SQL statement in migration: {stmt.strip()[:80]}")
+
+
+def _add_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> None:
+    # table_xinfo also lists generated columns
+    existing = {r[1] for r in conn.execute(f"PRAGMA table_xinfo({table})")}
+    for name, ddl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+
+
+def _v2_fingerprint_executor(conn: sqlite3.Connection) -> None:
+    _add_columns(conn, "training_jobs", {
+        "fingerprint": "TEXT",  # sha256 of dataset + config + trainer image
+        "executor": "TEXT NOT NULL DEFAULT 'kubernetes'",  # kubernetes|warm_pool|local
+    })
+    _run_script(conn, V2_INDEXES)
+
+
+def _v3_metric_columns(conn: sqlite3.Connection) -> None:
+    _add_columns(conn, "training_jobs", V3_METRIC_COLUMNS)
+    _run_script(conn, V3_INDEXES)
+
+
+def _v8_reused_from(conn: sqlite3.Connection) -> None:
+    _add_columns(conn, "training_jobs", {"reused_from": "TEXT"})  # id of the job that trained the model
+    _add_columns(conn, "training_jobs_archive", {"reused_from": "TEXT"})
+    _run_script(conn, V8_REUSED_FROM_BACKFILL)
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "configurations and training_jobs", lambda conn: _run_script(conn, V1_BASELINE)),
+    (2, "job fingerprint and executor", _v2_fingerprint_executor),
+    (3, "metric columns and leaderboard indexes", _v3_metric_columns),
+    (4, "job_stats with triggers and backfill", lambda conn: _run_script(conn, V4_JOB_STATS)),
+    (5, "training_jobs_archive", lambda conn: _run_script(conn, V5_JOB_ARCHIVE)),
+    (6, "owner_versions with triggers", lambda conn: _run_script(conn, V6_OWNER_VERSIONS)),
+    (7, "warm_tasks", lambda conn: _run_script(conn, V7_WARM_TASKS)),
+    (8, "reused_from; reused jobs without elapsed_sec", _v8_reused_from),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# ---------- online backfills ----------
+# A backfill walks a table in primary-key order, one short write transaction per
+# batch, recording its cursor in `backfills`. Readers are never blocked (WAL) and
+# writers only wait for one batch.
+
+def _job_stats_batch(conn: sqlite3.Connection, last_key: str, batch_size: int) -> Optional[str]:
+    """Adds training_jobs rows with last_key < id <= next key to job_stats; None when done."""
+    row = conn.execute(
+        "SELECT MAX(id) FROM (SELECT id FROM training_jobs WHERE id > ? ORDER BY id LIMIT ?)",
+        (last_key, batch_size),
+    ).fetchone()
+    upto = row[0]
+    if upto is None:
+        return None
+    counts = ", ".join(f"SUM(status = '{s}')" for s in JOB_STATS_STATUSES)
+    for group in ("configuration_id", "'*'"):
+        conn.execute(
+            f"""
+            INSERT INTO job_stats (owner_sub, configuration_id, queued, running, succeeded, failed,
+                                   total_elapsed_sec, last_job_at)
+            SELECT owner_sub, {group}, {counts}, TOTAL(metric_elapsed_sec), MAX(created_at)
+            FROM training_jobs WHERE id > ? AND id <= ?
+            GROUP BY owner_sub, {group}
+            ON CONFLICT (owner_sub, configuration_id) DO UPDATE SET
+              queued = queued + excluded.queued,
+              running = running + excluded.running,
+              succeeded = succeeded + excluded.succeeded,
+              failed = failed + excluded.failed,
+              total_elapsed_sec = total_elapsed_sec + excluded.total_elapsed_sec,
+              last_job_at = COALESCE(MAX(last_job_at, excluded.last_job_at), last_job_at, excluded.last_job_at)
+            """,
+            (last_key, upto),
+        )
+    return upto
+
+
+BACKFILLS: Dict[str, Callable[[sqlite3.Connection, str, int], Optional[str]]] = {
+    "job_stats": _job_stats_batch,
+}
+
+
+class MigrationService:
+    """
+    Brings a SQLite database to SCHEMA_VERSION and runs pending backfills.
+    Called once per process (ensure_migrated); connections do no DDL.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or settings.database_path
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        # serializes migrations across worker processes sharing the database
+        with open(f"{self.db_path}.migrate.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def migrate(self) -> List[int]:
+        """Applies pending migrations; returns the versions applied."""
+        applied: List[int] = []
+        with self._file_lock():
+            conn = self._connect()
+            try:
+                current = conn.execute("PRAGMA user_version").fetchone()[0]
+                if current == 0 and not conn.execute("SELECT 1 FROM sqlite_master").fetchone():
+                    # only takes effect on an empty file, before WAL; lets GC reclaim pages incrementally
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("PRAGMA journal_mode = WAL")  # persistent; readers don't block on writers
+                if current > SCHEMA_VERSION:
+                    raise RuntimeError(
+                        f"Database schema v{current} is newer than this build (v{SCHEMA_VERSION})"
+                    )
+                for version, name, step in MIGRATIONS:
+                    if version <= current:
+                        continue
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        step(conn)
+                        conn.execute(f"PRAGMA user_version = {version}")
+                        conn.execute("COMMIT")
+                    except Exception:
+                        conn.execute("ROLLBACK")
+                        raise
+                    log.info("Applied migration %d: %s", version, name)
+                    applied.append(version)
+            finally:
+                conn.close()
+        return applied
+
+    def pending_backfills(self) -> List[str]:
+        conn = self._connect()
+        try:
+            return [r[0] for r in conn.execute("SELECT name FROM backfills WHERE NOT done ORDER BY name")]
+        finally:
+            conn.close()
+
+    def run_backfills(
+        self,
+        *,
+        batch_size: Optional[int] = None,
+        pause_seconds: Optional[float] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> Dict[str, int]:
+        """Runs pending backfills to completion (or until `stop`); returns batches per backfill."""
+        batch_size = batch_size or settings.backfill_batch_size
+        pause = settings.backfill_pause_seconds if pause_seconds is None else pause_seconds
+        batches: Dict[str, int] = {}
+        conn = self._connect()
+        try:
+            for name in self.pending_backfills():
+                step = BACKFILLS[name]
+                batches[name] = 0
+                while not (stop and stop.is_set()):
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        # cursor is re-read under the write lock: concurrent runners don't double count
+                        last_key, done = conn.execute(
+                            "SELECT last_key, done FROM backfills WHERE name = ?", (name,)
+                        ).fetchone()
+                        upto = None if done else step(conn, last_key, batch_size)
+                        if upto is None:
+                            conn.execute("UPDATE backfills SET done = 1 WHERE name = ?", (name,))
+                        else:
+                            conn.execute("UPDATE backfills SET last_key = ? WHERE name = ?", (upto, name))
+                        conn.execute("COMMIT")
+                    except Exception:
+                        conn.execute("ROLLBACK")
+                        raise
+                    if upto is None:
+                        log.info("Backfill %s finished after %d batches", name, batches[name])
+                        break
+                    batches[name] += 1
+                    if pause:
+                        time.sleep(pause)
+        finally:
+            conn.close()
+        return batches
+
+
+_migrated: Set[str] = set()
+_migrated_lock = threading.Lock()
+_backfill_stop = threading.Event()
+
+
+def ensure_migrated(db_path: Optional[str] = None, *, background_backfills: bool = True) -> None:
+    """
+    Migrates `db_path` once per process (app startup; DatabaseService calls it
+    too, so scripts work without the app). Pending backfills continue in a
+    daemon thread.
+    """
+    path = os.path.abspath(db_path or settings.database_path)
+    if path in _migrated:
+        return
+    with _migrated_lock:
+        if path in _migrated:
+            return
+        svc = MigrationService(path)
+        svc.migrate()
+        if background_backfills and svc.pending_backfills():
+            threading.Thread(target=_backfill_thread, args=(svc,), name="podml-backfill", daemon=True).start()
+        _migrated.add(path)
+
+
+def _backfill_thread(svc: MigrationService) -> None:
+    try:
+        svc.run_backfills(stop=_backfill_stop)
+    except Exception as e:
+        log.warning("Backfill stopped: %s", e)
+
+
+def stop_backfills() -> None:
+    _backfill_stop.set()
@@ -0,0 +1,762 @@
+# backend/app/services/postgres_database_service.py
+import json
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import psycopg
+from psycopg.adapt import Loader
+from psycopg.rows import dict_row
+from psycopg.types.string import TextLoader
+from psycopg_pool import ConnectionPool
+
+from ..core.config import settings
+from ..core.metrics import DB_QUERY_SECONDS, instrument_methods
+from .database_service import LEADERBOARD_METRICS, DatabaseService, _parse_hp, _parse_job, _parse_warm_task
+from .migration_service import JOB_STATS_STATUSES
+
+log = logging.getLogger(__name__)
+
+# UTC without time zone, like SQLite's CURRENT_TIMESTAMP
+NOW = "(now() AT TIME ZONE 'UTC')"
+
+# pooled connections kept free for open_database() callers besides AsyncDatabaseService
+PG_POOL_SHARED_MIN = 4
+
+# ---------- schema history ----------
+# Same tables, indexes and job_stats semantics as the SQLite migrations
+# (migration_service), written for Postgres: JSONB documents, stored generated
+# metric columns, job_stats maintained by a PL/pgSQL trigger. Applied versions
+# are recorded in schema_migrations; never edit a shipped migration.
+
+PG_V1_BASELINE = f"""
+CREATE TABLE configurations (
+    id TEXT PRIMARY KEY,
+    owner_sub TEXT NOT NULL,
+    name TEXT NOT NULL,
+    dataset_uri TEXT NOT NULL,
+    x_column TEXT NOT NULL,
+    y_column TEXT NOT NULL,
+    model_type TEXT NOT NULL DEFAULT 'linear_regression',
+    hyperparams_json JSONB,
+    created_at TIMESTAMP NOT NULL DEFAULT {NOW},
+    updated_at TIMESTAMP NOT NULL DEFAULT {NOW}
+);
+CREATE INDEX idx_configurations_owner ON configurations (owner_sub, created_at DESC, id DESC);
+
+CREATE TABLE training_jobs (
+    id TEXT PRIMARY KEY,
+    owner_sub TEXT NOT NULL,
+    configuration_id TEXT NOT NULL REFERENCES configurations (id) ON DELETE CASCADE,
+    status TEXT NOT NULL DEFAULT 'queued',  -- queued|running|succeeded|failed
+    k8s_job_name TEXT NOT NULL,
+    model_uri TEXT,
+    metrics_json JSONB,
+    resources_json JSONB,
+    fingerprint TEXT,
+    executor TEXT NOT NULL DEFAULT 'kubernetes',
+    created_at TIMESTAMP NOT NULL DEFAULT {NOW},
+    updated_at TIMESTAMP NOT NULL DEFAULT {NOW},
+    metric_r2 DOUBLE PRECISION GENERATED ALWAYS AS (
+        CASE WHEN jsonb_typeof(metrics_json -> 'r2') = 'number' THEN (metrics_json ->> 'r2')::double precision END
+    ) STORED,
+    metric_mse DOUBLE PRECISION GENERATED ALWAYS AS (
+        CASE WHEN jsonb_typeof(metrics_json -> 'mse') = 'number' THEN (metrics_json ->> 'mse')::double precision END
+    ) STORED,
+    metric_n_rows BIGINT GENERATED ALWAYS AS (
+        CASE WHEN jsonb_typeof(metrics_json -> 'n_rows') = 'number' THEN (metrics_json ->> 'n_rows')::numeric::bigint END
+    ) STORED,
+    metric_elapsed_sec DOUBLE PRECISION GENERATED ALWAYS AS (
+        CASE WHEN jsonb_typeof(metrics_json -> 'elapsed_sec') = 'number'
+             THEN (metrics_json ->> 'elapsed_sec')::double precision END
+    ) STORED
+);
+-- id breaks created_at ties so LIMIT/OFFSET pages neither repeat nor skip rows
+CREATE INDEX idx_training_jobs_owner ON training_jobs (owner_sub, created_at DESC, id DESC);
+CREATE INDEX idx_training_jobs_cfg ON training_jobs (configuration_id, created_at DESC);
+CREATE INDEX idx_training_jobs_fingerprint ON training_jobs (owner_sub, fingerprint, status);
+CREATE INDEX idx_training_jobs_status_updated ON training_jobs (status, updated_at);
+CREATE INDEX idx_training_jobs_cfg_r2 ON training_jobs (configuration_id, metric_r2) WHERE status = 'succeeded';
+CREATE INDEX idx_training_jobs_cfg_mse ON training_jobs (configuration_id, metric_mse) WHERE status = 'succeeded';
+CREATE INDEX idx_training_jobs_cfg_n_rows ON training_jobs (configuration_id, metric_n_rows) WHERE status = 'succeeded';
+CREATE INDEX idx_training_jobs_cfg_elapsed_sec
+    ON training_jobs (configuration_id, metric_elapsed_sec) WHERE status = 'succeeded';
+
+CREATE TABLE job_stats (
+    owner_sub TEXT NOT NULL,
+    configuration_id TEXT NOT NULL,  -- '*' = the owner's totals
+    queued BIGINT NOT NULL DEFAULT 0,
+    running BIGINT NOT NULL DEFAULT 0,
+    succeeded BIGINT NOT NULL DEFAULT 0,
+    failed BIGINT NOT NULL DEFAULT 0,
+    total_elapsed_sec DOUBLE PRECISION NOT NULL DEFAULT 0,
+    last_job_at TIMESTAMP,
+    PRIMARY KEY (owner_sub, configuration_id)
+);
+
+-- '*' is upserted first, so concurrent writers of one owner queue on the same row
+-- instead of deadlocking on two
+CREATE FUNCTION job_stats_add(r training_jobs, sign INTEGER, last_job_at TIMESTAMP) RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO job_stats AS s (owner_sub, configuration_id, queued, running, succeeded, failed,
+                                total_elapsed_sec, last_job_at)
+    SELECT r.owner_sub, c.configuration_id,
+           sign * (r.status = 'queued')::int, sign * (r.status = 'running')::int,
+           sign * (r.status = 'succeeded')::int, sign * (r.status = 'failed')::int,
+           sign * COALESCE(r.metric_elapsed_sec, 0), last_job_at
+    FROM unnest(ARRAY['*', r.configuration_id]) WITH ORDINALITY AS c (configuration_id, n)
+    ORDER BY c.n
+    ON CONFLICT (owner_sub, configuration_id) DO UPDATE SET
+        queued = s.queued + excluded.queued,
+        running = s.running + excluded.running,
+        succeeded = s.succeeded + excluded.succeeded,
+        failed = s.failed + excluded.failed,
+        total_elapsed_sec = s.total_elapsed_sec + excluded.total_elapsed_sec,
+        last_job_at = GREATEST(s.last_job_at, excluded.last_job_at);
+$$;
+
+CREATE FUNCTION job_stats_trigger() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM job_stats_add(OLD, -1, NULL);
+    END IF;
+    IF TG_OP = 'INSERT' THEN
+        PERFORM job_stats_add(NEW, 1, NEW.created_at);
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM job_stats_add(NEW, 1, NULL);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_job_stats_insert_delete AFTER INSERT OR DELETE ON training_jobs
+    FOR EACH ROW EXECUTE FUNCTION job_stats_trigger();
+CREATE TRIGGER trg_job_stats_update AFTER UPDATE OF status, metrics_json ON training_jobs
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.metrics_json IS DISTINCT FROM NEW.metrics_json)
+    EXECUTE FUNCTION job_stats_trigger();
+
+CREATE TABLE training_jobs_archive (
+    id TEXT PRIMARY KEY,
+    owner_sub TEXT NOT NULL,
+    configuration_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    k8s_job_name TEXT NOT NULL,
+    model_uri TEXT,
+    metrics_json JSONB,
+    resources_json JSONB,
+    fingerprint TEXT,
+    executor TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT {NOW}
+);
+CREATE INDEX idx_training_jobs_archive_owner ON training_jobs_archive (owner_sub, created_at DESC);
+"""
+
+# owner_versions (see migration_service.V6_OWNER_VERSIONS). Statement-level
+# triggers: a 1000-row insert_jobs bumps each owner once; owners in sorted order
+# so concurrent multi-owner statements don't deadlock.
+PG_V2_OWNER_VERSIONS = """
+CREATE TABLE owner_versions (
+    owner_sub TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    version BIGINT NOT NULL,
+    PRIMARY KEY (owner_sub, resource)
+);
+
+CREATE FUNCTION owner_versions_bump() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO owner_versions AS v (owner_sub, resource, version)
+    SELECT o.owner_sub, TG_ARGV[0], floor(random() * 1e9)::bigint
+    FROM (SELECT DISTINCT owner_sub FROM changed) AS o
+    ORDER BY o.owner_sub
+    ON CONFLICT (owner_sub, resource) DO UPDATE SET version = v.version + 1;
+    RETURN NULL;
+END;
+$$;
+""" + "".join(
+    f"""
+CREATE TRIGGER trg_owner_versions_{resource}_{event.lower()} AFTER {event} ON {table}
+    REFERENCING {"OLD" if event == "DELETE" else "NEW"} TABLE AS changed
+    FOR EACH STATEMENT EXECUTE FUNCTION owner_versions_bump('{resource}');
+"""
+    for table, resource in (("training_jobs", "jobs"), ("configurations", "configurations"))
+    for event in ("INSERT", "UPDATE", "DELETE")
+)
+
+PG_V3_WARM_TASKS = """
+CREATE TABLE warm_tasks (
+    task_id TEXT PRIMARY KEY,
+    owner_sub TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    env_json JSONB NOT NULL,
+    sub_paths_json JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',  -- queued|running|succeeded|failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    leased_by TEXT,
+    lease_expires_at DOUBLE PRECISION,      -- unix seconds
+    exit_code INTEGER,
+    created_at DOUBLE PRECISION NOT NULL,
+    finished_at DOUBLE PRECISION
+);
+CREATE INDEX idx_warm_tasks_status ON warm_tasks (status, created_at);
+"""
+
+# see migration_service.V8_REUSED_FROM_BACKFILL; the metrics_json rewrite goes
+# through job_stats_trigger
+PG_V4_REUSED_FROM = r"""
+ALTER TABLE training_jobs ADD COLUMN reused_from TEXT;
+ALTER TABLE training_jobs_archive ADD COLUMN reused_from TEXT;
+
+UPDATE training_jobs
+SET reused_from = substring(model_uri from '([^/]+)/model\.pkl$'),
+    metrics_json = CASE WHEN jsonb_typeof(metrics_json) = 'object' THEN metrics_json - 'elapsed_sec'
+                        ELSE metrics_json END
+WHERE status = 'succeeded'
+  AND model_uri LIKE 'file://%/model.pkl' AND model_uri NOT LIKE '%/' || id || '/model.pkl';
+"""
+
+PG_MIGRATIONS: List[Tuple[int, str, str]] = [
+    (1, "baseline (SQLite schema v5)", PG_V1_BASELINE),
+    (2, "owner_versions with triggers (SQLite schema v6)", PG_V2_OWNER_VERSIONS),
+    (3, "warm_tasks (SQLite schema v7)", PG_V3_WARM_TASKS),
+    (4, "reused_from; reused jobs without elapsed_sec (SQLite schema v8)", PG_V4_REUSED_FROM),
+]
+
+PG_SCHEMA_VERSION = PG_MIGRATIONS[-1][0]
+
+# pg_advisory_xact_lock key: serializes migrations across pods
+_MIGRATION_LOCK = 0x706F646D6C  # "podml"
+# pg_try_advisory_lock key: one GC run at a time across pods
+_GC_LOCK = _MIGRATION_LOCK + 1
+
+_ARCHIVE_COLUMNS = (
+    "id, owner_sub, configuration_id, status, k8s_job_name, model_uri, metrics_json, "
+    "resources_json, fingerprint, executor, reused_from, created_at, updated_at"
+)
+
+
+class _TimestampLoader(Loader):
+    """TIMESTAMP -> 'YYYY-MM-DD HH:MM:SS', the text SQLite returns."""
+
+    def load(self, data: Any) -> str:
+        return bytes(data[:19]).decode()
+
+
+def _configure(conn: psycopg.Connection) -> None:
+    # JSONB and timestamps come back as text so rows match the SQLite service
+    # and go through the same _parse_hp/_parse_job
+    conn.adapters.register_loader("jsonb", TextLoader)
+    conn.adapters.register_loader("timestamp", _TimestampLoader)
+
+
+def _pool_max_size() -> int:
+    """
+    pg_pool_max_size, raised if needed: AsyncDatabaseService keeps one
+    connection per reader thread plus its writer checked out for good, and
+    sync callers (threadpool routes, the job watcher, GC, warm pool) need
+    some of their own.
+    """
+    held = settings.db_read_threads + 1
+    size = max(settings.pg_pool_max_size, held + PG_POOL_SHARED_MIN)
+    if size != settings.pg_pool_max_size:
+        log.warning(
+            "pg_pool_max_size=%d leaves fewer than %d connections next to the %d AsyncDatabaseService holds; using %d",
+            settings.pg_pool_max_size, PG_POOL_SHARED_MIN, held, size,
+        )
+    return size
+
+
+def _jsonb(text: Optional[str]) -> Optional[str]:
+    """JSON text for a JSONB parameter; text that isn't JSON is stored as a JSON string."""
+    if text is None:
+        return None
+    try:
+        json.loads(text)
+    except ValueError:
+        return json.dumps(text)
+    return text
+
+
+def _expired_sql(cutoffs: Dict[str, str]) -> Tuple[str, List[str]]:
+    """database_service._expired_sql with Postgres placeholders."""
+    if not cutoffs:
+        return "FALSE", []
+    clause = " OR ".join("(status = %s AND updated_at < %s::timestamp)" for _ in cutoffs)
+    return f"({clause})", [v for item in cutoffs.items() for v in item]
+
+
+def migrate(url: str) -> List[int]:
+    """Applies pending PG_MIGRATIONS; returns the versions applied."""
+    applied: List[int] = []
+    with psycopg.connect(url, autocommit=True) as conn:
+        with conn.transaction():
+            conn.execute("SELECT pg_advisory_xact_lock(%s)", (_MIGRATION_LOCK,))
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMP NOT NULL DEFAULT {NOW}
+                )
+                """
+            )
+            current = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+            if current > PG_SCHEMA_VERSION:
+                raise RuntimeError(f"Database schema v{current} is newer than this build (v{PG_SCHEMA_VERSION})")
+            for version, name, sql in PG_MIGRATIONS:
+                if version <= current:
+                    continue
+                with conn.transaction():
+                    conn.execute(sql)
+                    conn.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+                log.info("Applied Postgres migration %d: %s", version, name)
+                applied.append(version)
+    return applied
+
+
+class PostgresDatabaseService(DatabaseService):
+    """
+    DatabaseService on Postgres/Aurora, selected by a postgresql:// database_url
+    (see open_database). Same methods, arguments and returned dicts as the
+    SQLite service, so several API pods can share one database.
+
+    Each instance borrows a connection from a per-URL pool and returns it on
+    close(). Connections run in autocommit; writes use explicit transactions
+    (savepoints inside batch()), and statements are prepared server-side after
+    pg_prepare_threshold executions.
+    """
+    _pools: Dict[str, ConnectionPool] = {}
+    _pools_lock = threading.Lock()
+    _migrated: Set[str] = set()
+
+    def __init__(self, url: Optional[str] = None):
+        self.url = url or settings.database_url
+        self.conn = self.pool(self.url).getconn()
+
+    @classmethod
+    def pool(cls, url: str) -> ConnectionPool:
+        pool = cls._pools.get(url)
+        if pool is None:
+            with cls._pools_lock:
+                pool = cls._pools.get(url)
+                if pool is None:
+                    if url not in cls._migrated:
+                        migrate(url)  # once per process, before the first connection is used
+                        cls._migrated.add(url)
+                    pool = cls._pools[url] = ConnectionPool(
+                        url,
+                        min_size=settings.pg_pool_min_size,
+                        max_size=_pool_max_size(),
+                        timeout=settings.pg_pool_timeout_seconds,
+                        kwargs={"autocommit": True, "row_factory": dict_row,
+                                "prepare_threshold": settings.pg_prepare_threshold},
+                        configure=_configure,
+                        name="podml",
+                        open=True,
+                    )
+        return pool
+
+    @classmethod
+    def close_pools(cls) -> None:
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            pool.close()
+
+    def close(self):
+        conn, self.conn = self.conn, None
+        if conn is not None:
+            self.pool(self.url).putconn(conn)
+
+    @contextmanager
+    def _tx(self, *, immediate: bool = False) -> Iterator[None]:
+        # nested transaction() blocks are savepoints; row locks replace BEGIN IMMEDIATE
+        with self.conn.transaction():
+            yield
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        with self.conn.transaction():
+            yield
+
+    def _all(self, sql: str, params: Any = ()) -> List[Dict[str, Any]]:
+        return self.conn.execute(sql, params).fetchall()
+
+    def _one(self, sql: str, params: Any = ()) -> Optional[Dict[str, Any]]:
+        return self.conn.execute(sql, params).fetchone()
+
+    # ============ CONFIGURATIONS ============
+    def create_configuration(
+        self,
+        *,
+        owner_sub: str,
+        name: str,
+        dataset_uri: str,
+        x_column: str,
+        y_column: str,
+        model_type: str = "linear_regression",
+        hyperparams: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        hp_json = json.dumps(hyperparams) if hyperparams else None
+        with self._tx():
+            row = self._one(
+                """
+                INSERT INTO configurations (id, owner_sub, name, dataset_uri, x_column, y_column, model_type, hyperparams_json)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING *
+                """,
+                (str(uuid.uuid4()), owner_sub, name, dataset_uri, x_column, y_column, model_type, hp_json),
+            )
+        return _parse_hp(row)
+
+    def list_configurations(self, *, owner_sub: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        rows = self._all(
+            "SELECT * FROM configurations WHERE owner_sub = %s ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s",
+            (owner_sub, limit, offset),
+        )
+        return [_parse_hp(r) for r in rows]
+
+    def get_configuration(self, *, cfg_id: str, owner_sub: str) -> Optional[Dict[str, Any]]:
+        row = self._one("SELECT * FROM configurations WHERE id = %s AND owner_sub = %s", (cfg_id, owner_sub))
+        return _parse_hp(row) if row else None
+
+    def get_configurations(self, *, cfg_ids: List[str], owner_sub: str) -> Dict[str, Dict[str, Any]]:
+        rows = self._all(
+            "SELECT * FROM configurations WHERE owner_sub = %s AND id = ANY(%s)",
+            (owner_sub, list(dict.fromkeys(cfg_ids))),
+        )
+        return {r["id"]: _parse_hp(r) for r in rows}
+
+    # ============ JOBS ============
+    _INSERT_JOB = """
+        INSERT INTO training_jobs (id, owner_sub, configuration_id, status, k8s_job_name, resources_json,
+                                   fingerprint, model_uri, metrics_json, executor, reused_from)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+
+    def insert_job(
+        self,
+        *,
+        job_id: str,
+        owner_sub: str,
+        configuration_id: str,
+        k8s_job_name: str,
+        resources: Dict[str, Any],
+        status: str = "queued",
+        fingerprint: Optional[str] = None,
+        model_uri: Optional[str] = None,
+        metrics_json: Optional[str] = None,
+        executor: str = "kubernetes",
+        reused_from: Optional[str] = None,
+    ) -> None:
+        with self._tx():
+            self.conn.execute(
+                self._INSERT_JOB,
+                (job_id, owner_sub, configuration_id, status, k8s_job_name, json.dumps(resources),
+                 fingerprint, model_uri, _jsonb(metrics_json), executor, reused_from),
+            )
+
+    def insert_jobs(self, jobs: List[Dict[str, Any]]) -> None:
+        with self._tx(), self.conn.cursor() as cur:
+            # executemany pipelines the rows: one round trip, not one per job
+            cur.executemany(
+                self._INSERT_JOB,
+                [
+                    (
+                        j["job_id"], j["owner_sub"], j["configuration_id"], j.get("status", "queued"), j["k8s_job_name"],
+                        json.dumps(j["resources"]), j.get("fingerprint"), j.get("model_uri"),
+                        _jsonb(j.get("metrics_json")), j.get("executor", "kubernetes"), j.get("reused_from"),
+                    )
+                    for j in jobs
+                ],
+            )
+
+    def list_jobs(self, *, owner_sub: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        rows = self._all(
+            "SELECT * FROM training_jobs WHERE owner_sub = %s ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s",
+            (owner_sub, limit, offset),
+        )
+        return [_parse_job(r) for r in rows]
+
+    def get_job(self, *, job_id: str, owner_sub: str) -> Optional[Dict[str, Any]]:
+        row = self._one("SELECT * FROM training_jobs WHERE id = %s AND owner_sub = %s", (job_id, owner_sub))
+        return _parse_job(row) if row else None
+
+    def leaderboard(self, *, configuration_id: str, owner_sub: str, metric: str, top: int = 10) -> List[Dict[str, Any]]:
+        direction = LEADERBOARD_METRICS[metric]  # whitelist: column name goes into the SQL
+        rows = self._all(
+            f"""
+            SELECT * FROM training_jobs
+            WHERE configuration_id = %s AND status = 'succeeded' AND metric_{metric} IS NOT NULL
+              AND owner_sub = %s AND reused_from IS NULL
+            ORDER BY metric_{metric} {direction}
+            LIMIT %s
+            """,
+            (configuration_id, owner_sub, top),
+        )
+        return [_parse_job(r) for r in rows]
+
+    def get_job_statuses(self, *, job_ids: List[str], owner_sub: str) -> List[Dict[str, Any]]:
+        return self._all(
+            """
+            SELECT id, status, updated_at, k8s_job_name, executor FROM training_jobs
+            WHERE id = ANY(%s) AND owner_sub = %s
+            """,
+            (list(dict.fromkeys(job_ids)), owner_sub),
+        )
+
+    def list_active_jobs(self, *, owner_subs: List[str]) -> List[Dict[str, Any]]:
+        if not owner_subs:
+            return []
+        return self._all(
+            """
+            SELECT id, owner_sub, k8s_job_name, status, executor, updated_at FROM training_jobs
+            WHERE owner_sub = ANY(%s) AND status IN ('queued', 'running')
+            """,
+            (list(owner_subs),),
+        )
+
+    def find_reusable_job(self, *, owner_sub: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        return self._one(
+            """
+            SELECT * FROM training_jobs
+            WHERE owner_sub = %s AND fingerprint = %s AND status = 'succeeded' AND model_uri IS NOT NULL
+            ORDER BY created_at DESC
+            LIMIT 1
+            """,
+            (owner_sub, fingerprint),
+        )
+
+    def set_job_status(
+        self, *, job_id: str, owner_sub: str, status: str, model_uri: Optional[str] = None, metrics_json: Optional[str] = None
+    ) -> None:
+        with self._tx():
+            self.conn.execute(
+                f"""
+                UPDATE training_jobs
+                SET status = %s,
+                    model_uri = COALESCE(%s, model_uri),
+                    metrics_json = COALESCE(%s::jsonb, metrics_json),
+                    updated_at = {NOW}
+                WHERE id = %s AND owner_sub = %s
+                """,
+                (status, model_uri, _jsonb(metrics_json), job_id, owner_sub),
+            )
+
+    def set_jobs_status(self, *, owner_sub: str, updates: List[Tuple[str, str]]) -> None:
+        with self._tx(), self.conn.cursor() as cur:
+            cur.executemany(
+                f"UPDATE training_jobs SET status = %s, updated_at = {NOW} "
+                "WHERE id = %s AND owner_sub = %s AND status = 'queued'",
+                [(status, job_id, owner_sub) for job_id, status in updates],
+            )
+
+    # ============ JOB STATS ============
+    def get_job_stats(self, *, owner_sub: str) -> Dict[str, Any]:
+        rows = self._all("SELECT * FROM job_stats WHERE owner_sub = %s", (owner_sub,))
+        total = next((r for r in rows if r["configuration_id"] == "*"), None)
+        if total is None:
+            total = {"owner_sub": owner_sub, "configuration_id": "*", **{s: 0 for s in JOB_STATS_STATUSES},
+                     "total_elapsed_sec": 0.0, "last_job_at": None}
+        configurations = [
+            r for r in rows if r["configuration_id"] != "*" and any(r[s] for s in JOB_STATS_STATUSES)
+        ]
+        return {"total": total, "configurations": configurations}
+
+    def get_owner_version(self, *, owner_sub: str, resource: str) -> int:
+        row = self._one(
+            "SELECT version FROM owner_versions WHERE owner_sub = %s AND resource = %s", (owner_sub, resource)
+        )
+        return row["version"] if row else 0
+
+    def rebuild_job_stats(self) -> int:
+        counts = ", ".join(f"COUNT(*) FILTER (WHERE status = '{s}')" for s in JOB_STATS_STATUSES)
+
+        def snapshot() -> Dict[Tuple[str, str], tuple]:
+            return {
+                (r["owner_sub"], r["configuration_id"]): (
+                    r["queued"], r["running"], r["succeeded"], r["failed"],
+                    round(r["total_elapsed_sec"], 6), r["last_job_at"],
+                )
+                for r in self._all("SELECT * FROM job_stats WHERE queued + running + succeeded + failed > 0")
+            }
+
+        with self._tx():
+            # readers carry on; job writes wait until the counts are back
+            self.conn.execute("LOCK TABLE training_jobs IN SHARE MODE")
+            before = snapshot()
+            self.conn.execute("DELETE FROM job_stats")
+            for column, group_by in (("configuration_id", "owner_sub, configuration_id"), ("'*'", "owner_sub")):
+                self.conn.execute(
+                    f"""
+                    INSERT INTO job_stats (owner_sub, configuration_id, queued, running, succeeded, failed,
+                                           total_elapsed_sec, last_job_at)
+                    SELECT owner_sub, {column}, {counts}, COALESCE(SUM(metric_elapsed_sec), 0), MAX(created_at)
+                    FROM training_jobs GROUP BY {group_by}
+                    """
+                )
+            after = snapshot()
+        return sum(1 for k in before.keys() | after.keys() if before.get(k) != after.get(k))
+
+    # ============ WARM POOL ============
+    def insert_warm_task(
+        self, *, task_id: str, owner_sub: str, job_id: str, env: Dict[str, str], sub_paths: Dict[str, str], now: float
+    ) -> None:
+        with self._tx():
+            self.conn.execute(
+                """
+                INSERT INTO warm_tasks (task_id, owner_sub, job_id, env_json, sub_paths_json, created_at)
+                VALUES (%s, %s, %s, %s::jsonb, %s::jsonb, %s)
+                """,
+                (task_id, owner_sub, job_id, json.dumps(env), json.dumps(sub_paths), now),
+            )
+
+    def get_warm_task(self, *, task_id: str) -> Optional[Dict[str, Any]]:
+        row = self._one("SELECT * FROM warm_tasks WHERE task_id = %s", (task_id,))
+        return _parse_warm_task(row) if row else None
+
+    def _expire_warm_leases(self, now: float, max_attempts: int) -> int:
+        return self.conn.execute(
+            """
+            UPDATE warm_tasks
+            SET status = CASE WHEN attempts < %s THEN 'queued' ELSE 'failed' END,
+                finished_at = CASE WHEN attempts < %s THEN NULL ELSE %s END,
+                leased_by = NULL
+            WHERE status = 'running' AND lease_expires_at < %s
+            """,
+            (max_attempts, max_attempts, now, now),
+        ).rowcount
+
+    def expire_warm_leases(self, *, now: float, max_attempts: int) -> int:
+        with self._tx():
+            return self._expire_warm_leases(now, max_attempts)
+
+    def lease_warm_task(
+        self, *, worker_id: str, now: float, lease_seconds: float, max_attempts: int
+    ) -> Optional[Dict[str, Any]]:
+        if not self._one(
+            "SELECT 1 FROM warm_tasks WHERE status = 'queued' OR (status = 'running' AND lease_expires_at < %s) LIMIT 1",
+            (now,),
+        ):
+            return None
+        with self._tx():
+            self._expire_warm_leases(now, max_attempts)
+            # concurrent leases from other pods skip the row instead of waiting for it
+            row = self._one(
+                """
+                UPDATE warm_tasks
+                SET status = 'running', attempts = attempts + 1, leased_by = %s, lease_expires_at = %s
+                WHERE task_id = (
+                    SELECT task_id FROM warm_tasks WHERE status = 'queued'
+                    ORDER BY created_at LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING *
+                """,
+                (worker_id, now + lease_seconds),
+            )
+        return _parse_warm_task(row) if row else None
+
+    def heartbeat_warm_task(self, *, task_id: str, worker_id: str, lease_expires_at: float) -> bool:
+        with self._tx():
+            cur = self.conn.execute(
+                "UPDATE warm_tasks SET lease_expires_at = %s WHERE task_id = %s AND status = 'running' AND leased_by = %s",
+                (lease_expires_at, task_id, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def complete_warm_task(
+        self, *, task_id: str, worker_id: str, status: str, exit_code: Optional[int], now: float
+    ) -> Optional[Dict[str, Any]]:
+        with self._tx():
+            row = self._one(
+                """
+                UPDATE warm_tasks SET status = %s, exit_code = %s, finished_at = %s
+                WHERE task_id = %s AND status = 'running' AND leased_by = %s
+                RETURNING *
+                """,
+                (status, exit_code, now, task_id, worker_id),
+            )
+        return _parse_warm_task(row) if row else None
+
+    def delete_finished_warm_tasks(self, *, before: float) -> int:
+        with self._tx():
+            return self.conn.execute("DELETE FROM warm_tasks WHERE finished_at < %s", (before,)).rowcount
+
+    # ============ RETENTION / GC ============
+    @contextmanager
+    def gc_lock(self) -> Iterator[bool]:
+        # session lock on this pooled connection, so it is released before the connection goes back
+        if not self._one("SELECT pg_try_advisory_lock(%s) AS locked", (_GC_LOCK,))["locked"]:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self.conn.execute("SELECT pg_advisory_unlock(%s)", (_GC_LOCK,))
+
+    def count_expired_jobs(self, *, cutoffs: Dict[str, str]) -> Dict[str, int]:
+        where, params = _expired_sql(cutoffs)
+        rows = self._all(f"SELECT status, COUNT(*) AS n FROM training_jobs WHERE {where} GROUP BY status", params)
+        return {r["status"]: r["n"] for r in rows}
+
+    def archive_expired_jobs(self, *, cutoffs: Dict[str, str], batch_size: int) -> int:
+        where, params = _expired_sql(cutoffs)
+        with self._tx():
+            cur = self.conn.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM training_jobs WHERE id IN (
+                        SELECT id FROM training_jobs WHERE {where}
+                        ORDER BY updated_at LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING {_ARCHIVE_COLUMNS}
+                )
+                INSERT INTO training_jobs_archive ({_ARCHIVE_COLUMNS})
+                SELECT {_ARCHIVE_COLUMNS} FROM moved
+                ON CONFLICT (id) DO UPDATE SET
+                    status = excluded.status, model_uri = excluded.model_uri,
+                    metrics_json = excluded.metrics_json, updated_at = excluded.updated_at,
+                    archived_at = {NOW}
+                """,
+                (*params, batch_size),
+            )
+        return cur.rowcount
+
+    def kept_job_ids(self, *, job_ids: List[str], cutoffs: Dict[str, str]) -> Set[str]:
+        where, params = _expired_sql(cutoffs)
+        rows = self._all(f"SELECT id FROM training_jobs WHERE id = ANY(%s) AND NOT {where}", (list(job_ids), *params))
+        return {r["id"] for r in rows}
+
+    def kept_model_uris(self, *, owner_sub: str, cutoffs: Dict[str, str]) -> Set[str]:
+        where, params = _expired_sql(cutoffs)
+        rows = self._all(
+            f"SELECT DISTINCT model_uri FROM training_jobs WHERE owner_sub = %s AND model_uri IS NOT NULL AND NOT {where}",
+            (owner_sub, *params),
+        )
+        return {r["model_uri"] for r in rows}
+
+    def dataset_uris(self, *, owner_sub: str) -> Set[str]:
+        rows = self._all("SELECT DISTINCT dataset_uri FROM configurations WHERE owner_sub = %s", (owner_sub,))
+        return {r["dataset_uri"] for r in rows}
+
+    def incremental_vacuum(self, *, pages: int) -> Optional[int]:
+        return None  # autovacuum reclaims dead rows
+
+    def optimize(self) -> None:
+        self.conn.execute("ANALYZE training_jobs, configurations, job_stats")
+
+    def full_vacuum(self) -> None:
+        """VACUUM FULL: rewrites the tables and returns space to the OS (takes exclusive locks)."""
+        self.conn.execute("VACUUM (FULL, ANALYZE)")
+
+
+instrument_methods(PostgresDatabaseService, DB_QUERY_SECONDS, "db", skip=("close", "batch", "pool", "close_pools", "gc_lock"), backend="postgres")
@@ -0,0 +1,43 @@
+# backend/app/services/response_cache_service.py
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ..core.config import settings
+
+
+class ResponseCache:
+    """
+    Serialized JSON bodies of owner-scoped GET responses, each stored with the
+    owner_versions counter it was built at and served only while the counter
+    still has that value; any write bumps it, so entries never go stale, they
+    just stop matching. Per process, LRU-bounded to response_cache_entries.
+    """
+    # (owner_sub, resource, key) -> (version, body)
+    _entries: "OrderedDict[Tuple[str, str, str], Tuple[int, bytes]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, owner_sub: str, resource: str, key: str, version: int) -> Optional[bytes]:
+        k = (owner_sub, resource, key)
+        with cls._lock:
+            hit = cls._entries.get(k)
+            if hit is None or hit[0] != version:
+                return None
+            cls._entries.move_to_end(k)
+            return hit[1]
+
+    @classmethod
+    def put(cls, owner_sub: str, resource: str, key: str, version: int, body: bytes) -> None:
+        if settings.response_cache_entries <= 0 or len(body) > settings.response_cache_max_body_bytes:
+            return
+        with cls._lock:
+            cls._entries[(owner_sub, resource, key)] = (version, body)
+            cls._entries.move_to_end((owner_sub, resource, key))
+            while len(cls._entries) > settings.response_cache_entries:
+                cls._entries.popitem(last=False)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._entries.clear()
@@ -1,5 +1,6 @@
 # backend/app/services/storage_service.py
 import os
+import time
 import uuid
 from pathlib import Path
 from typing import Tuple
@@ -7,6 +8,7 @@ from typing import Tuple
 from fastapi import UploadFile
 
 from ..core.config import settings
+from ..core.metrics import UPLOAD_BYTES, UPLOAD_SECONDS, UPLOAD_THROUGHPUT, add_timing
 
 
 class StorageService:
@@ -48,12 +50,21 @@ class StorageService:
         dest = folder / fname
 
         # write stream to disk
+        t0 = time.perf_counter()
+        size = 0
         with dest.open("wb") as f:
             while True:
                 chunk = upload.file.read(1024 * 1024)
                 if not chunk:
                     break
                 f.write(chunk)
+                size += len(chunk)
+        elapsed = time.perf_counter() - t0
+        UPLOAD_BYTES.inc(size)
+        UPLOAD_SECONDS.observe(elapsed)
+        add_timing("upload", elapsed)
+        if elapsed > 0:
+            UPLOAD_THROUGHPUT.observe(size / elapsed)
 
         # canonical dev URI (you can later switch to s3://...)
         uri = f"file://{dest.resolve()}"
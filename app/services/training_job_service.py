@@ -1,42 +1,119 @@
 # backend/app/services/training_job_service.py
+import hashlib
 import json
+import logging
 import os
 import uuid
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from ..core.config import settings
-from .database_service import DatabaseService
-from .kubernetes_service import KubernetesService
+from .database_service import DatabaseService, open_database, parse_metrics
+from .job_events_service import JobEventBus
+from .executor_service import TrainingExecutor, default_executor, executor_for, get_executor
+from .job_log_service import JobLogService
+
+log = logging.getLogger(__name__)
+
+# abs dataset path -> (size, mtime_ns, sha256); avoids re-hashing unchanged uploads
+_DATASET_DIGESTS: Dict[str, Tuple[int, int, str]] = {}
+_DATASET_DIGESTS_MAX = 4096
+
+
+def _dataset_digest(path: str) -> str:
+    st = os.stat(path)
+    cached = _DATASET_DIGESTS.get(path)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    if len(_DATASET_DIGESTS) >= _DATASET_DIGESTS_MAX:
+        _DATASET_DIGESTS.clear()
+    _DATASET_DIGESTS[path] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+
+def _reused_metrics(metrics_json: Optional[str]) -> Optional[str]:
+    """A reused job's copy of the prior metrics: no elapsed_sec, since nothing was trained for it."""
+    metrics = parse_metrics(metrics_json)
+    if metrics is None or "elapsed_sec" not in metrics:
+        return metrics_json
+    del metrics["elapsed_sec"]
+    return json.dumps(metrics)
+
 
 class TrainingJobService:
     TRAINER_IMAGE = settings.trainer_image
     NAMESPACE = settings.k8s_namespace
     PVC_NAME = settings.k8s_pvc_name
 
-    def __init__(self):
-        self.k8s = KubernetesService(namespace=self.NAMESPACE)
+    def __init__(self, executor: Optional[TrainingExecutor] = None):
+        # backend for new jobs; existing jobs use the one recorded on their row
+        self.executor = executor or default_executor()
+
+    @staticmethod
+    def _fits_warm_pool(abs_dataset: str) -> bool:
+        """Small jobs go to the warm pool: pod startup would dominate their runtime."""
+        if not settings.warm_pool_enabled:
+            return False
+        try:
+            return os.path.getsize(abs_dataset) <= settings.warm_pool_max_dataset_bytes
+        except OSError:
+            return False
 
     def _abs_from_file_uri(self, uri: str) -> str:
         return uri[len("file://") :] if uri.startswith("file://") else uri
 
-    def create_job(
+    @staticmethod
+    def _publish(db: DatabaseService, owner_sub: str, job_id: str) -> Optional[Dict[str, Any]]:
+        # the row is only needed for the event; skip the read when nobody listens
+        if not JobEventBus.has_subscribers(owner_sub):
+            return None
+        job = db.get_job(job_id=job_id, owner_sub=owner_sub)
+        if job:
+            JobEventBus.publish(owner_sub, job)
+        return job
+
+    def _fingerprint(self, configuration: Dict[str, Any], abs_dataset: str) -> Optional[str]:
+        """
+        Hash of everything that determines the trained model: dataset content,
+        model type, columns, hyperparams and trainer image.
+        None when the dataset cannot be read (the job will fail on its own).
+        """
+        try:
+            dataset_digest = _dataset_digest(abs_dataset)
+        except OSError:
+            return None
+        payload = {
+            "dataset_sha256": dataset_digest,
+            "model_type": configuration.get("model_type") or "linear_regression",
+            "x_column": configuration["x_column"],
+            "y_column": configuration["y_column"],
+            "hyperparams": configuration.get("hyperparams_json") or {},
+            "trainer_image": self.TRAINER_IMAGE,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _plan(
         self,
         *,
         owner_sub: str,
         configuration: Dict[str, Any],
-        cpu_request: str = "100m",
-        mem_request: str = "256Mi",
-        cpu_limit: str = "1",
-        mem_limit: str = "1Gi",
+        resources: Dict[str, str],
         dataset_url: Optional[str] = None,
         output_model_url: Optional[str] = None,
         output_metrics_url: Optional[str] = None,
     ) -> Dict[str, Any]:
+        """Everything needed to insert and submit one job; raises ValueError for bad input."""
         job_id = str(uuid.uuid4())
         job_name = f"train-{job_id[:8]}"
 
         x_col = configuration["x_column"]
         y_col = configuration["y_column"]
-        fit_intercept = str(configuration.get("hyperparams_json", {}).get("fit_intercept", True)).lower()
+        fit_intercept = str((configuration.get("hyperparams_json") or {}).get("fit_intercept", True)).lower()
 
         env: Dict[str, str] = {
             "X_COLUMN": x_col,
@@ -47,7 +124,9 @@ class TrainingJobService:
         }
 
         sub_paths = None
-        if configuration["dataset_uri"].startswith("file://") and self.PVC_NAME:
+        fingerprint = None
+        executor = self.executor
+        if configuration["dataset_uri"].startswith("file://") and (self.PVC_NAME or executor.uses_local_storage):
             abs_dataset = self._abs_from_file_uri(configuration["dataset_uri"])
             root = os.path.abspath(settings.storage_root)
             if not abs_dataset.startswith(root):
@@ -55,6 +134,10 @@ class TrainingJobService:
             rel_dataset = os.path.relpath(abs_dataset, root)
             artifacts_rel = os.path.join("artifacts", owner_sub, job_id)
             sub_paths = {"dataset": rel_dataset, "artifacts": artifacts_rel}
+            fingerprint = self._fingerprint(configuration, abs_dataset)
+            if self._fits_warm_pool(abs_dataset):
+                executor = get_executor("warm_pool")
+                job_name = f"warm-{job_id[:8]}"
         else:
             if not dataset_url or not output_model_url or not output_metrics_url:
                 raise ValueError("Missing presigned URLs for dataset/artifacts in URL mode.")
@@ -62,49 +145,260 @@ class TrainingJobService:
             env["OUTPUT_MODEL_URL"] = output_model_url
             env["OUTPUT_METRICS_URL"] = output_metrics_url
 
-        # persist "queued"
-        db = DatabaseService()
-        try:
-            db.insert_job(
-                job_id=job_id,
-                owner_sub=owner_sub,
-                configuration_id=configuration["id"],
-                k8s_job_name=job_name,
-                resources={
-                    "cpu_request": cpu_request,
-                    "mem_request": mem_request,
-                    "cpu_limit": cpu_limit,
-                    "mem_limit": mem_limit,
-                },
-                status="queued",
+        return {
+            "job_id": job_id,
+            "owner_sub": owner_sub,
+            "configuration_id": configuration["id"],
+            "k8s_job_name": job_name,
+            "env": env,
+            "sub_paths": sub_paths,
+            "resources": resources,
+            "fingerprint": fingerprint,
+            "executor": executor,
+        }
+
+    def _find_reusable(self, db: DatabaseService, owner_sub: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """find_reusable_job, unless its model file is gone (e.g. removed by GC): then the job is trained again."""
+        prior = db.find_reusable_job(owner_sub=owner_sub, fingerprint=fingerprint)
+        if prior and not os.path.exists(self._abs_from_file_uri(prior["model_uri"])):
+            log.info("Not reusing job %s: %s is missing", prior["id"], prior["model_uri"])
+            return None
+        return prior
+
+    @staticmethod
+    def _job_row(plan: Dict[str, Any], prior: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """insert_job kwargs: queued, or succeeded and pointing at prior's artifacts."""
+        row = {
+            "job_id": plan["job_id"],
+            "owner_sub": plan["owner_sub"],
+            "configuration_id": plan["configuration_id"],
+            "k8s_job_name": plan["k8s_job_name"],
+            "resources": plan["resources"],
+            "status": "queued",
+            "fingerprint": plan["fingerprint"],
+            "executor": plan["executor"].name,
+        }
+        if prior:
+            # keeps its own (never started) k8s_job_name: the prior job's pod logs are not its logs
+            row.update(
+                status="succeeded",
+                model_uri=prior["model_uri"],
+                metrics_json=_reused_metrics(prior["metrics_json"]),
+                executor=prior["executor"],
+                reused_from=prior.get("reused_from") or prior["id"],
             )
+        return row
+
+    @staticmethod
+    def _row_out(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": row["job_id"],
+            "owner_sub": row["owner_sub"],
+            "configuration_id": row["configuration_id"],
+            "status": row["status"],
+            "k8s_job_name": row["k8s_job_name"],
+            "model_uri": row.get("model_uri"),
+            "metrics": parse_metrics(row.get("metrics_json")),
+            "reused_from": row.get("reused_from"),
+        }
+
+    @staticmethod
+    def _submit(plan: Dict[str, Any]) -> str:
+        return plan["executor"].submit(
+            owner_sub=plan["owner_sub"],
+            job_id=plan["job_id"],
+            job_name=plan["k8s_job_name"],
+            env=plan["env"],
+            sub_paths=plan["sub_paths"],
+            resources=plan["resources"],
+        )
+
+    def create_job(
+        self,
+        *,
+        owner_sub: str,
+        configuration: Dict[str, Any],
+        cpu_request: str = "100m",
+        mem_request: str = "256Mi",
+        cpu_limit: str = "1",
+        mem_limit: str = "1Gi",
+        dataset_url: Optional[str] = None,
+        output_model_url: Optional[str] = None,
+        output_metrics_url: Optional[str] = None,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Schedules a training job. Unless force=True, a previous succeeded job
+        with the same training fingerprint is reused: the new row points at its
+        artifacts and no pod is started.
+        """
+        plan = self._plan(
+            owner_sub=owner_sub,
+            configuration=configuration,
+            resources={
+                "cpu_request": cpu_request,
+                "mem_request": mem_request,
+                "cpu_limit": cpu_limit,
+                "mem_limit": mem_limit,
+            },
+            dataset_url=dataset_url,
+            output_model_url=output_model_url,
+            output_metrics_url=output_metrics_url,
+        )
+        job_id = plan["job_id"]
+
+        db = open_database()
+        try:
+            # identical config + dataset already trained -> point at its artifacts
+            prior = None
+            if plan["fingerprint"] and not force:
+                prior = self._find_reusable(db, owner_sub, plan["fingerprint"])
+            row = self._job_row(plan, prior)
+            db.insert_job(**row)
+            if prior:
+                self._publish(db, owner_sub, job_id)
+                return {"id": job_id, "k8s_job_name": row["k8s_job_name"], "status": "succeeded",
+                        "reused_from": row["reused_from"]}
         finally:
             db.close()
 
-        # k8s job
-        k8s_name = self.k8s.create_training_job(
-            job_name=job_name,
-            image=self.TRAINER_IMAGE,
-            env=env,
-            cpu_request=cpu_request,
-            mem_request=mem_request,
-            cpu_limit=cpu_limit,
-            mem_limit=mem_limit,
-            pv_claim_name=self.PVC_NAME,
-            sub_paths=sub_paths,
-        )
+        try:
+            status = self._submit(plan)
+        except Exception:
+            # the row would otherwise stay queued with nothing behind it
+            db = open_database()
+            try:
+                db.set_jobs_status(owner_sub=owner_sub, updates=[(job_id, "failed")])
+                self._publish(db, owner_sub, job_id)
+            finally:
+                db.close()
+            raise
+
+        db = open_database()
+        try:
+            if status == "running":
+                # only from queued: a poller may already have seen it finish
+                db.set_jobs_status(owner_sub=owner_sub, updates=[(job_id, status)])
+            self._publish(db, owner_sub, job_id)
+        finally:
+            db.close()
+
+        return {"id": job_id, "k8s_job_name": plan["k8s_job_name"], "status": status}
+
+    def create_jobs(
+        self, *, owner_sub: str, items: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Batch variant of create_job without submission. items: dicts with
+        configuration, cpu_request, mem_request, cpu_limit, mem_limit, force.
+        All rows are inserted in one transaction; returns (rows, plans) where
+        plans still have to go through submit_jobs.
+        """
+        plans: List[Tuple[Dict[str, Any], bool]] = []
+        for i, item in enumerate(items):
+            try:
+                plan = self._plan(
+                    owner_sub=owner_sub,
+                    configuration=item["configuration"],
+                    resources={k: item[k] for k in ("cpu_request", "mem_request", "cpu_limit", "mem_limit")},
+                )
+            except ValueError as ve:
+                raise ValueError(f"jobs[{i}]: {ve}") from ve
+            plans.append((plan, item.get("force", False)))
 
-        # persist "running"
-        db = DatabaseService()
+        db = open_database()
         try:
-            db.set_job_status(job_id=job_id, owner_sub=owner_sub, status="running")
+            rows: List[Dict[str, Any]] = []
+            to_submit: List[Dict[str, Any]] = []
+            reused: Dict[str, Optional[Dict[str, Any]]] = {}
+            for plan, force in plans:
+                fp = plan["fingerprint"]
+                prior = None
+                if fp and not force:
+                    if fp not in reused:
+                        reused[fp] = self._find_reusable(db, owner_sub, fp)
+                    prior = reused[fp]
+                rows.append(self._job_row(plan, prior))
+                if not prior:
+                    to_submit.append(plan)
+            db.insert_jobs(rows)
         finally:
             db.close()
+        return [self._row_out(r) for r in rows], to_submit
+
+    def submit_jobs(self, *, owner_sub: str, plans: List[Dict[str, Any]]) -> None:
+        """Submits planned jobs concurrently, then records their states in one write."""
+        if not plans:
+            return
 
-        return {"id": job_id, "k8s_job_name": k8s_name, "status": "running"}
+        def submit(plan: Dict[str, Any]) -> str:
+            try:
+                return self._submit(plan)
+            except Exception as e:
+                log.warning("Submitting job %s failed: %s", plan["job_id"], e)
+                return "failed"
+
+        workers = min(settings.batch_submit_concurrency, len(plans))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="podml-submit") as pool:
+            statuses = list(pool.map(submit, plans))
+
+        updates = [(p["job_id"], st) for p, st in zip(plans, statuses) if st != "queued"]
+        db = open_database()
+        try:
+            if updates:
+                db.set_jobs_status(owner_sub=owner_sub, updates=updates)
+            for plan in plans:
+                self._publish(db, owner_sub, plan["job_id"])
+        finally:
+            db.close()
+
+    @staticmethod
+    def _resolve_status(job: Dict[str, Any], status: Optional[str]) -> str:
+        """Executor status, or for a job the executor has no record of (None) what that means for the row."""
+        if status is not None:
+            return status
+        # queued rows may not be submitted yet (batches are submitted after the 202),
+        # but not for longer than the grace period; anything further along, or
+        # older, was deleted / lost (e.g. with a restart) and will never report back
+        if job["status"] == "queued":
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.job_submit_grace_seconds)
+            if (job.get("updated_at") or "") >= cutoff.strftime("%Y-%m-%d %H:%M:%S"):
+                return "queued"
+        return "failed"
+
+    def _apply_status(self, db: DatabaseService, owner_sub: str, job: Dict[str, Any], status: str) -> Dict[str, Any]:
+        """Persists an executor-reported status (collecting artifacts/logs once terminal)."""
+        job_id = job["id"]
+        if status == "running" and job["status"] == "queued":
+            db.set_job_status(job_id=job_id, owner_sub=owner_sub, status=status)
+            job = db.get_job(job_id=job_id, owner_sub=owner_sub) or job
+            JobEventBus.publish(owner_sub, job)
+        elif status in ("succeeded", "failed"):
+            model_uri = None
+            metrics_json = None
+            if self.PVC_NAME or executor_for(job).uses_local_storage:
+                artifacts_dir = os.path.join(settings.storage_root, "artifacts", owner_sub, job_id)
+                m_path = os.path.join(artifacts_dir, "metrics.json")
+                p_path = os.path.join(artifacts_dir, "model.pkl")
+                if os.path.exists(m_path):
+                    with open(m_path, "r") as f:
+                        metrics_json = f.read()
+                if os.path.exists(p_path):
+                    model_uri = f"file://{os.path.abspath(p_path)}"
+            db.set_job_status(
+                job_id=job_id,
+                owner_sub=owner_sub,
+                status=status,
+                model_uri=model_uri,
+                metrics_json=metrics_json,
+            )
+            self.archive_logs(owner_sub=owner_sub, job=job)
+            job = db.get_job(job_id=job_id, owner_sub=owner_sub) or job
+            JobEventBus.publish(owner_sub, job)
+        return job
 
     def refresh_and_get(self, *, owner_sub: str, job_id: str) -> Dict[str, Any]:
-        db = DatabaseService()
+        db = open_database()
         try:
             job = db.get_job(job_id=job_id, owner_sub=owner_sub)
             if not job:
@@ -113,27 +407,70 @@ class TrainingJobService:
             if job["status"] in ("succeeded", "failed"):
                 return job
 
-            status = self.k8s.get_job_status(job["k8s_job_name"])
-            if status in ("succeeded", "failed"):
-                model_uri = None
-                metrics_json = None
-                if self.PVC_NAME:
-                    artifacts_dir = os.path.join(settings.storage_root, "artifacts", owner_sub, job_id)
-                    m_path = os.path.join(artifacts_dir, "metrics.json")
-                    p_path = os.path.join(artifacts_dir, "model.pkl")
-                    if os.path.exists(m_path):
-                        with open(m_path, "r") as f:
-                            metrics_json = f.read()
-                    if os.path.exists(p_path):
-                        model_uri = f"file://{os.path.abspath(p_path)}"
-                db.set_job_status(
-                    job_id=job_id,
-                    owner_sub=owner_sub,
-                    status=status,
-                    model_uri=model_uri,
-                    metrics_json=metrics_json,
-                )
-                job = db.get_job(job_id=job_id, owner_sub=owner_sub) or job
-            return job
+            status = self._resolve_status(job, executor_for(job).get_status(job["k8s_job_name"]))
+            return self._apply_status(db, owner_sub, job, status)
         finally:
             db.close()
+
+    def refresh_many(self, *, owner_sub: str, jobs: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        refresh_and_get for many non-terminal jobs (dicts with id, status,
+        updated_at, k8s_job_name, executor): one status query per executor instead of one
+        per job. Returns {job_id: status} for the jobs that changed.
+        """
+        by_executor: Dict[str, List[Dict[str, Any]]] = {}
+        for job in jobs:
+            by_executor.setdefault(job.get("executor") or "kubernetes", []).append(job)
+
+        changed: Dict[str, str] = {}
+        db = open_database()
+        try:
+            for name, group in by_executor.items():
+                try:
+                    statuses = get_executor(name).get_statuses([j["k8s_job_name"] for j in group])
+                except Exception as e:
+                    log.warning("Status query for %d %s jobs failed: %s", len(group), name, e)
+                    continue
+                for job in group:
+                    status = self._resolve_status(job, statuses.get(job["k8s_job_name"]))
+                    if status != job["status"]:
+                        updated = self._apply_status(db, owner_sub, job, status)
+                        if updated["status"] != job["status"]:
+                            changed[job["id"]] = updated["status"]
+        finally:
+            db.close()
+        return changed
+
+    def archive_logs(self, *, owner_sub: str, job: Dict[str, Any]) -> bool:
+        """Copies the finished job's logs to compressed storage. False if they are gone."""
+        logs = JobLogService()
+        if logs.exists(owner_sub, job["id"]):
+            return True  # e.g. warm workers upload logs with their result
+        if job.get("reused_from"):
+            # no trainer ran; older reused rows also still name the prior job's pod
+            note = f"Reused the model of job {job['reused_from']} (same configuration and dataset); nothing was trained.\n"
+            logs.archive(owner_sub, job["id"], note.encode())
+            return True
+        try:
+            data = executor_for(job).read_logs(job["k8s_job_name"])
+        except Exception as e:
+            log.warning("Fetching logs of %s failed: %s", job["k8s_job_name"], e)
+            return False
+        if data is None:
+            return False
+        logs.archive(owner_sub, job["id"], data)
+        return True
+
+    def live_logs(self, *, job: Dict[str, Any], follow: bool = False, tail: Optional[int] = None) -> Iterator[bytes]:
+        """Logs straight from the executor; follow=True streams until the trainer exits."""
+        executor = executor_for(job)
+        try:
+            if follow:
+                yield from executor.stream_logs(job["k8s_job_name"], tail_lines=tail)
+            else:
+                data = executor.read_logs(job["k8s_job_name"], tail_lines=tail)
+                if data:
+                    yield data
+        except Exception as e:
+            # e.g. container still creating
+            log.warning("Reading logs of %s failed: %s", job["k8s_job_name"], e)
@@ -0,0 +1,133 @@
+# backend/app/services/warm_pool_service.py
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from ..core.config import settings
+from .database_service import open_database
+
+
+@dataclass
+class WarmTask:
+    task_id: str                      # == training_jobs.k8s_job_name ("warm-xxxxxxxx")
+    owner_sub: str
+    job_id: str
+    env: Dict[str, str]
+    sub_paths: Dict[str, str]         # relative to the worker's DATA_ROOT (the PVC)
+    status: str = "queued"            # queued|running|succeeded|failed
+    attempts: int = 0
+    leased_by: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+    exit_code: Optional[int] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "WarmTask":
+        return cls(**{k: row[k] for k in cls.__dataclass_fields__})
+
+    def to_lease(self) -> Dict[str, Any]:
+        return {"task_id": self.task_id, "job_id": self.job_id, "env": self.env, "sub_paths": self.sub_paths}
+
+
+class WarmPoolService:
+    """
+    Work queue for the warm trainer pool: long-lived worker pods
+    (trainer/linear_regression/worker.py) lease tasks over the /api/workers
+    API and report results back. Tasks and leases are rows in warm_tasks, so
+    any API replica can serve the pool and a restart loses nothing. Lease
+    long-polls waiting in this process wake up as soon as it queues a task.
+    """
+    MAX_ATTEMPTS = 2
+    FINISHED_KEEP_SECONDS = 3600
+
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _wakeup: Optional[asyncio.Event] = None
+
+    @classmethod
+    def submit(cls, *, task_id: str, owner_sub: str, job_id: str, env: Dict[str, str], sub_paths: Dict[str, str]) -> str:
+        db = open_database()
+        try:
+            db.insert_warm_task(task_id=task_id, owner_sub=owner_sub, job_id=job_id, env=env, sub_paths=sub_paths,
+                                now=time.time())
+        finally:
+            db.close()
+        loop = cls._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(cls._wake_waiters)
+        return task_id
+
+    @classmethod
+    def wakeup(cls) -> asyncio.Event:
+        """
+        Set when this process queues the next task. Must be called from the
+        event loop, before the lease attempt, so a submit in between isn't missed.
+        """
+        loop = asyncio.get_running_loop()
+        if cls._wakeup is None or cls._loop is not loop:
+            cls._loop, cls._wakeup = loop, asyncio.Event()
+        return cls._wakeup
+
+    @classmethod
+    def _wake_waiters(cls) -> None:
+        event, cls._wakeup = cls._wakeup, asyncio.Event()
+        if event is not None:
+            event.set()
+
+    @classmethod
+    def lease(cls, worker_id: str) -> Optional[WarmTask]:
+        db = open_database()
+        try:
+            row = db.lease_warm_task(
+                worker_id=worker_id, now=time.time(),
+                lease_seconds=settings.warm_pool_lease_seconds, max_attempts=cls.MAX_ATTEMPTS,
+            )
+        finally:
+            db.close()
+        return WarmTask.from_row(row) if row else None
+
+    @classmethod
+    def heartbeat(cls, task_id: str, worker_id: str) -> bool:
+        db = open_database()
+        try:
+            return db.heartbeat_warm_task(
+                task_id=task_id, worker_id=worker_id, lease_expires_at=time.time() + settings.warm_pool_lease_seconds
+            )
+        finally:
+            db.close()
+
+    @classmethod
+    def complete(cls, task_id: str, worker_id: str, *, succeeded: bool, exit_code: Optional[int] = None) -> Optional[WarmTask]:
+        now = time.time()
+        db = open_database()
+        try:
+            row = db.complete_warm_task(
+                task_id=task_id, worker_id=worker_id, status="succeeded" if succeeded else "failed",
+                exit_code=exit_code, now=now,
+            )
+            if row:
+                db.delete_finished_warm_tasks(before=now - cls.FINISHED_KEEP_SECONDS)
+        finally:
+            db.close()
+        return WarmTask.from_row(row) if row else None
+
+    @classmethod
+    def get_status(cls, task_id: str) -> Optional[str]:
+        return cls.get_statuses([task_id]).get(task_id)
+
+    @classmethod
+    def get_statuses(cls, task_ids: Iterable[str]) -> Dict[str, str]:
+        """Statuses of the known tasks (one connection); expired leases are resolved first."""
+        now = time.time()
+        out: Dict[str, str] = {}
+        db = open_database()
+        try:
+            for task_id in task_ids:
+                row = db.get_warm_task(task_id=task_id)
+                if row and row["status"] == "running" and row["lease_expires_at"] < now:
+                    db.expire_warm_leases(now=now, max_attempts=cls.MAX_ATTEMPTS)
+                    row = db.get_warm_task(task_id=task_id)
+                if row:
+                    out[task_id] = row["status"]
+        finally:
+            db.close()
+        return out
@@ -0,0 +1,151 @@
+"""
+Async database layer benchmark: requests/second of one worker process for the
+old path (sync `def` routes, a DatabaseService connection per request, one
+commit per write, all in Starlette's threadpool) against the new one (`async
+def` routes on AsyncDatabaseService: reader pool + group-committing writer).
+
+Both apps serve the same two endpoints, a write (create a configuration) and a
+read (get a finished job), and are driven in-process with --concurrency
+clients. Also times raw DB writes: N threads each committing vs N coroutines
+sharing group commits.
+
+    python -m benchmarks.bench_async_db [--requests 2000] [--concurrency 64]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = tempfile.mkdtemp(prefix="podml-bench-")
+os.environ.update(
+    STORAGE_ROOT=ROOT,
+    DATABASE_PATH=os.path.join(ROOT, "app.db"),
+    K8S_PVC_NAME="bench-pvc",
+    WARM_POOL_ENABLED="false",
+    ALLOW_DEBUG_SUB="true",
+)
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from app.api.deps import get_db  # noqa: E402
+from app.api.router_auth import get_current_sub  # noqa: E402
+from app.main import app  # noqa: E402
+from app.schemas.database import ConfigurationCreateIn  # noqa: E402
+from app.services.async_database_service import AsyncDatabaseService  # noqa: E402
+from app.services.database_service import DatabaseService  # noqa: E402
+
+OWNER = "bench-user"
+HEADERS = {"X-Debug-Sub": OWNER}
+CFG_BODY = {"name": "bench", "dataset_uri": "file:///data.csv", "x_column": "x", "y_column": "y"}
+
+# the routers as they were before AsyncDatabaseService
+sync_app = FastAPI()
+
+
+@sync_app.post("/api/configurations", status_code=201)
+def sync_create_configuration(
+    payload: ConfigurationCreateIn, owner_sub: str = Depends(get_current_sub), db: DatabaseService = Depends(get_db)
+):
+    return db.create_configuration(owner_sub=owner_sub, **payload.model_dump())
+
+
+@sync_app.get("/api/jobs/{job_id}")
+def sync_get_job(job_id: str, owner_sub: str = Depends(get_current_sub), db: DatabaseService = Depends(get_db)):
+    return db.get_job(job_id=job_id, owner_sub=owner_sub)
+
+
+def seed_job() -> str:
+    db = DatabaseService()
+    try:
+        cfg = db.create_configuration(owner_sub=OWNER, **CFG_BODY)
+        job_id = str(uuid.uuid4())
+        db.insert_job(
+            job_id=job_id, owner_sub=OWNER, configuration_id=cfg["id"], k8s_job_name="train-bench",
+            resources={}, status="succeeded",
+        )
+    finally:
+        db.close()
+    return job_id
+
+
+async def drive(target, n: int, concurrency: int, job_id: str) -> float:
+    """Half writes, half reads; returns requests/second."""
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=HEADERS, timeout=300) as client:
+        counter = iter(range(n))
+
+        async def worker():
+            for i in counter:
+                if i % 2:
+                    r = await client.get(f"/api/jobs/{job_id}")
+                    assert r.status_code == 200, r.text
+                else:
+                    r = await client.post("/api/configurations", json=CFG_BODY)
+                    assert r.status_code == 201, r.text
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return n / (time.perf_counter() - t0)
+
+
+def bench_writes(n: int, concurrency: int, cfg_id: str) -> None:
+    def args():
+        return dict(
+            job_id=str(uuid.uuid4()), owner_sub="db-bench", configuration_id=cfg_id,
+            k8s_job_name="train-bench", resources={},
+        )
+
+    def one():
+        db = DatabaseService()
+        try:
+            db.insert_job(**args())
+        finally:
+            db.close()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: one(), range(n)))
+    t_sync = time.perf_counter() - t0
+
+    async def grouped():
+        adb = AsyncDatabaseService.instance()
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one_async():
+            async with sem:
+                await adb.insert_job(**args())
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one_async() for _ in range(n)))
+        return time.perf_counter() - t0
+
+    t_async = asyncio.run(grouped())
+    print(f"DB writes ({n} insert_job, {concurrency} concurrent)")
+    print(f"  thread + connection per write   {n / t_sync:>9.0f} writes/s")
+    print(f"  AsyncDatabaseService            {n / t_async:>9.0f} writes/s  ({t_sync / t_async:.1f}x)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=64)
+    args = ap.parse_args()
+
+    job_id = seed_job()
+    cfg_id = DatabaseService().get_job(job_id=job_id, owner_sub=OWNER)["configuration_id"]
+    bench_writes(args.requests, args.concurrency, cfg_id)
+
+    old = asyncio.run(drive(sync_app, args.requests, args.concurrency, job_id))
+    new = asyncio.run(drive(app, args.requests, args.concurrency, job_id))
+    print(f"API ({args.requests} requests, half writes, {args.concurrency} concurrent clients)")
+    print(f"  sync routes + DatabaseService   {old:>9.0f} req/s")
+    print(f"  async routes + AsyncDatabase    {new:>9.0f} req/s  ({new / old:.1f}x)")
+    AsyncDatabaseService.shutdown_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Bulk job API benchmark: creating and polling N jobs one request at a time
+against POST /api/jobs/batch and POST /api/jobs/status, plus the raw DB cost of
+N single-row inserts against one insert_jobs transaction.
+
+Runs offline on a throwaway SQLite database and storage root. Submissions go to
+a fake "kubernetes" executor that sleeps --submit-ms per job (the API call
+latency a real cluster adds); authentication uses X-Debug-Sub.
+
+    python -m benchmarks.bench_batch_jobs [--jobs 1000] [--submit-ms 5] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+ROOT = tempfile.mkdtemp(prefix="podml-bench-")
+os.environ.update(
+    STORAGE_ROOT=ROOT,
+    DATABASE_PATH=os.path.join(ROOT, "app.db"),
+    K8S_PVC_NAME="bench-pvc",
+    EXECUTOR_BACKEND="kubernetes",
+    WARM_POOL_ENABLED="false",
+    ALLOW_DEBUG_SUB="true",
+)
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services import executor_service  # noqa: E402
+from app.services.database_service import DatabaseService  # noqa: E402
+from app.services.executor_service import TrainingExecutor  # noqa: E402
+
+OWNER = "bench-user"
+HEADERS = {"X-Debug-Sub": OWNER}
+
+
+class FakeKubernetes(TrainingExecutor):
+    name = "kubernetes"
+
+    def __init__(self, submit_seconds: float):
+        self.submit_seconds = submit_seconds
+
+    def submit(self, *, owner_sub, job_id, job_name, env, sub_paths, resources) -> str:
+        time.sleep(self.submit_seconds)
+        return "running"
+
+    def get_status(self, job_name: str) -> str:
+        time.sleep(self.submit_seconds)
+        return "running"
+
+    def get_statuses(self, job_names):
+        time.sleep(self.submit_seconds)  # one list call
+        return {n: "running" for n in job_names}
+
+
+def make_configuration() -> str:
+    os.makedirs(os.path.join(ROOT, "uploads", OWNER), exist_ok=True)
+    path = os.path.join(ROOT, "uploads", OWNER, "data.csv")
+    with open(path, "w") as f:
+        f.write("x,y\n" + "".join(f"{i},{2 * i}\n" for i in range(100)))
+    db = DatabaseService()
+    try:
+        cfg = db.create_configuration(owner_sub=OWNER, name="bench", dataset_uri=f"file://{path}", x_column="x", y_column="y")
+    finally:
+        db.close()
+    return cfg["id"]
+
+
+def bench_db(n: int, cfg_id: str) -> None:
+    def rows():
+        return [
+            {
+                "job_id": str(uuid.uuid4()), "owner_sub": "db-bench", "configuration_id": cfg_id,
+                "k8s_job_name": "train-bench", "resources": {"cpu_limit": "1"},
+            }
+            for _ in range(n)
+        ]
+
+    db = DatabaseService()
+    try:
+        single = rows()
+        t0 = time.perf_counter()
+        for r in single:
+            db.insert_job(**r)
+        t_single = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        db.insert_jobs(rows())
+        t_bulk = time.perf_counter() - t0
+    finally:
+        db.close()
+    print(f"DB inserts ({n} jobs)")
+    print(f"  insert_job x{n:<6}            {t_single * 1000:>9.1f} ms")
+    print(f"  insert_jobs (one transaction) {t_bulk * 1000:>9.1f} ms  ({t_single / t_bulk:.0f}x)")
+
+
+async def bench_api(n: int, cfg_id: str, concurrency: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=HEADERS, timeout=300) as client:
+        body = {"configuration_id": cfg_id, "force": True}
+
+        ids = []
+        counter = iter(range(n))
+
+        async def create_worker():
+            for _ in counter:
+                r = await client.post("/api/jobs", json=body)
+                assert r.status_code == 201, r.text
+                ids.append(r.json()["id"])
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(create_worker() for _ in range(concurrency)))
+        t_single = time.perf_counter() - t0
+
+        polled = iter(ids)
+
+        async def poll_worker():
+            for job_id in polled:
+                r = await client.get(f"/api/jobs/{job_id}")
+                assert r.status_code == 200, r.text
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(poll_worker() for _ in range(concurrency)))
+        t_poll = time.perf_counter() - t0
+
+        # the batch response returns once rows are committed; submission runs
+        # as a background task that httpx's ASGI transport also waits for
+        t0 = time.perf_counter()
+        r = await client.post("/api/jobs/batch", json={"jobs": [body] * n})
+        assert r.status_code == 202, r.text
+        t_batch = time.perf_counter() - t0
+        batch_ids = [j["id"] for j in r.json()]
+
+        t0 = time.perf_counter()
+        r = await client.post("/api/jobs/status", json={"job_ids": batch_ids})
+        assert r.status_code == 200 and len(r.json()) == n, r.text
+        t_status = time.perf_counter() - t0
+
+    print(f"API ({n} jobs, {concurrency} concurrent single requests)")
+    print(f"  POST /api/jobs x{n:<6}          {t_single:>8.2f} s")
+    print(f"  POST /api/jobs/batch            {t_batch:>8.2f} s  ({t_single / t_batch:.1f}x)")
+    print(f"  GET /api/jobs/{{id}} x{n:<6}      {t_poll:>8.2f} s")
+    print(f"  POST /api/jobs/status           {t_status:>8.2f} s  ({t_poll / t_status:.1f}x)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", type=int, default=1000)
+    ap.add_argument("--submit-ms", type=float, default=5.0, help="simulated executor API latency")
+    ap.add_argument("--concurrency", type=int, default=20)
+    args = ap.parse_args()
+
+    executor_service._EXECUTORS["kubernetes"] = FakeKubernetes(args.submit_ms / 1000)
+    cfg_id = make_configuration()
+    bench_db(args.jobs, cfg_id)
+    asyncio.run(bench_api(args.jobs, cfg_id, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
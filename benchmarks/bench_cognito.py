@@ -0,0 +1,179 @@
+"""
+CognitoService email lookups against a botocore Stubber'd cognito-idp client
+(offline, no AWS credentials): checks the email_exists cache and the async
+coalescing, then times cached vs uncached lookups.
+
+Checks (exit 1 on failure):
+- hits are cached for COGNITO_EMAIL_CACHE_TTL_SECONDS, misses for
+  COGNITO_EMAIL_NEGATIVE_TTL_SECONDS, then looked up again
+- concurrent aemail_exists calls for one email make one ListUsers call
+- cancelling the caller that started the lookup doesn't cancel the others
+- Cognito errors reach every waiting caller as ServiceError and are not cached
+
+    python -m benchmarks.bench_cognito [--calls 20000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# short TTLs so expiry is checked in seconds (the settings are whole seconds)
+os.environ.update(
+    AWS_REGION="eu-central-1",
+    AWS_COGNITO_USER_POOL_ID="eu-central-1_bench",
+    COGNITO_EMAIL_CACHE_TTL_SECONDS="2",
+    COGNITO_EMAIL_NEGATIVE_TTL_SECONDS="1",
+)
+
+import boto3  # noqa: E402
+from botocore.stub import Stubber  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.exceptions import ServiceError  # noqa: E402
+from app.services.cognito_service import CognitoService  # noqa: E402
+
+POOL = settings.aws_cognito_user_pool_id
+
+
+class StubbedCognito:
+    """A real cognito-idp client whose ListUsers answers come from a Stubber; counts and can hold calls."""
+
+    def __init__(self):
+        self.client = boto3.client(
+            "cognito-idp", region_name=settings.aws_region,
+            aws_access_key_id="bench", aws_secret_access_key="bench",
+        )
+        self.stubber = Stubber(self.client)
+        self.stubber.activate()
+        self.calls = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.client.meta.events.register("before-parameter-build.cognito-idp.ListUsers", self._on_call)
+
+    def _on_call(self, **kwargs):
+        self.calls += 1
+        self.gate.wait(10)
+
+    def expect(self, email: str, exists: bool) -> None:
+        users = [{"Username": "u-1", "Attributes": [{"Name": "email", "Value": email}]}] if exists else []
+        self.stubber.add_response(
+            "list_users", {"Users": users},
+            {"UserPoolId": POOL, "Filter": f'email = "{email}"', "Limit": 1},
+        )
+
+    def expect_error(self) -> None:
+        self.stubber.add_client_error("list_users", service_error_code="TooManyRequestsException", http_status_code=429)
+
+
+def check(failures, ok: bool, what: str) -> None:
+    print(f"  {'ok  ' if ok else 'FAIL'} {what}")
+    if not ok:
+        failures.append(what)
+
+
+def check_ttls(failures) -> None:
+    cog = StubbedCognito()
+    svc = CognitoService(client=cog.client)
+    CognitoService.clear_email_cache()
+
+    cog.expect("hit@example.com", True)
+    cog.expect("miss@example.com", False)
+    first = (svc.email_exists("hit@example.com"), svc.email_exists("miss@example.com"))
+    again = (svc.email_exists("hit@example.com"), svc.email_exists("miss@example.com"))
+    check(failures, first == again == (True, False) and cog.calls == 2, "hit and miss cached (2 ListUsers calls)")
+
+    time.sleep(settings.cognito_email_negative_ttl_seconds + 0.1)
+    cog.expect("miss@example.com", True)  # signed up meanwhile
+    svc.email_exists("hit@example.com")
+    check(failures, svc.email_exists("miss@example.com") and cog.calls == 3, "miss expires after the negative TTL")
+
+    time.sleep(settings.cognito_email_cache_ttl_seconds - settings.cognito_email_negative_ttl_seconds)
+    cog.expect("hit@example.com", False)
+    check(failures, not svc.email_exists("hit@example.com") and cog.calls == 4, "hit expires after the positive TTL")
+    cog.stubber.assert_no_pending_responses()
+
+
+async def check_async(failures, concurrency: int) -> None:
+    cog = StubbedCognito()
+    svc = CognitoService(client=cog.client)
+    CognitoService.clear_email_cache()
+
+    # coalescing: one held ListUsers call for all callers
+    cog.expect("a@example.com", True)
+    cog.gate.clear()
+    waiters = [asyncio.ensure_future(svc.aemail_exists("a@example.com")) for _ in range(concurrency)]
+    await asyncio.sleep(0.05)
+    cog.gate.set()
+    results = await asyncio.gather(*waiters)
+    check(failures, all(results) and cog.calls == 1, f"{concurrency} concurrent lookups -> 1 ListUsers call")
+
+    # the caller that started the lookup goes away; the others still get the answer
+    cog.expect("b@example.com", True)
+    cog.gate.clear()
+    leader = asyncio.ensure_future(svc.aemail_exists("b@example.com"))
+    await asyncio.sleep(0.01)
+    followers = [asyncio.ensure_future(svc.aemail_exists("b@example.com")) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    await asyncio.sleep(0.01)
+    cog.gate.set()
+    results = await asyncio.gather(*followers, return_exceptions=True)
+    check(failures, leader.cancelled() and results == [True] * 3 and cog.calls == 2,
+          "cancelling the first caller leaves the others' lookup running")
+    check(failures, await svc.aemail_exists("b@example.com") and cog.calls == 2, "its result is cached")
+
+    # errors reach every caller and are not cached
+    cog.expect_error()
+    cog.gate.clear()
+    waiters = [asyncio.ensure_future(svc.aemail_exists("c@example.com")) for _ in range(5)]
+    await asyncio.sleep(0.05)
+    cog.gate.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    check(failures, all(isinstance(r, ServiceError) for r in results) and cog.calls == 3,
+          "a Cognito error reaches all 5 callers as ServiceError (1 call)")
+    cog.expect("c@example.com", False)
+    check(failures, await svc.aemail_exists("c@example.com") is False and cog.calls == 4, "the error is not cached")
+    check(failures, not CognitoService._inflight, "no lookups left in flight")
+    cog.stubber.assert_no_pending_responses()
+
+
+def timings(calls: int) -> None:
+    cog = StubbedCognito()
+    svc = CognitoService(client=cog.client)
+    CognitoService.clear_email_cache()
+    n = min(calls, 2000)
+    for i in range(n):
+        cog.expect(f"user{i}@example.com", i % 2 == 0)
+    t0 = time.perf_counter()
+    for i in range(n):
+        svc.email_exists(f"user{i}@example.com")
+    uncached = (time.perf_counter() - t0) / n
+    t0 = time.perf_counter()
+    for i in range(calls):
+        svc.email_exists(f"user{i % n}@example.com")
+    cached = (time.perf_counter() - t0) / calls
+    print("email_exists per call (stubbed ListUsers, so no network time in 'uncached')")
+    print(f"  uncached   {uncached * 1e6:>9.1f} us")
+    print(f"  cached     {cached * 1e6:>9.1f} us")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--calls", type=int, default=20000)
+    ap.add_argument("--concurrency", type=int, default=50)
+    args = ap.parse_args()
+
+    failures = []
+    print("checks")
+    check_ttls(failures)
+    asyncio.run(check_async(failures, args.concurrency))
+    timings(args.calls)
+    if failures:
+        print(f"{len(failures)} check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+DatabaseService backends side by side: runs one workload against SQLite and
+against Postgres, checks that both return the same results (parity) and prints
+the time of each step.
+
+The workload covers every repository method the app uses: configurations,
+single and bulk job inserts, a reused job, status/metrics updates (including malformed
+metrics), paginated listing, bulk status reads, leaderboards, job_stats and
+its rebuild, retention/archiving, and a threaded mixed read/write phase.
+
+Postgres is either an existing server (--pg-url; a scratch database is created
+and dropped) or a throwaway cluster started with initdb/pg_ctl from --pg-bin or
+PATH (run as a non-root user, as Postgres requires):
+
+    python -m benchmarks.bench_db_backends [--pg-url postgresql://user@host/db] [--jobs 2000]
+
+Exits 1 when the backends disagree, or when PostgresDatabaseService inherits
+a repository method from the SQLite service (its db_query_seconds would be
+labelled backend="sqlite").
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+ROOT = tempfile.mkdtemp(prefix="podml-bench-")
+os.environ.update(STORAGE_ROOT=ROOT, DATABASE_PATH=os.path.join(ROOT, "app.db"))
+
+import psycopg  # noqa: E402
+
+from app.services.database_service import LEADERBOARD_METRICS, DatabaseService  # noqa: E402
+from app.services.postgres_database_service import PostgresDatabaseService  # noqa: E402
+
+OWNERS = ("bench-a", "bench-b")
+CONFIGS_PER_OWNER = 5
+NS = uuid.UUID("6f1c3c1e-7d2a-4b7e-9a59-6a1d3c0b5e11")
+
+Factory = Callable[[], DatabaseService]
+
+
+def job_id(i: int) -> str:
+    return str(uuid.uuid5(NS, f"job-{i}"))
+
+
+def metrics_for(i: int) -> str:
+    if i % 17 == 0:
+        return "{not json"  # malformed: stored, but no metrics
+    return json.dumps({"r2": round(1 - i / 100_000, 6), "mse": i / 1000, "n_rows": 100 + i, "elapsed_sec": round(i / 7 + 0.5, 6)})
+
+
+class Timer:
+    def __init__(self):
+        self.steps: Dict[str, float] = {}
+
+    @contextmanager
+    def __call__(self, step: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        yield
+        self.steps[step] = time.perf_counter() - t0
+
+
+def normalize(row: Dict[str, Any], cfg_names: Dict[str, str]) -> Dict[str, Any]:
+    """Drops generated ids/timestamps and compares JSON documents by value."""
+    out = {}
+    for k, v in row.items():
+        if k in ("created_at", "updated_at", "last_job_at", "archived_at") or k.startswith("metric_"):
+            continue
+        if k == "configuration_id":
+            v = cfg_names.get(v, v)
+        elif k == "id" and v in cfg_names:
+            v = cfg_names[v]
+        elif k in ("resources_json", "metrics_json") and isinstance(v, str):
+            try:
+                v = json.loads(v)
+            except ValueError:
+                v = None  # malformed metrics: SQLite keeps the text, Postgres a JSON string
+            if not isinstance(v, dict):
+                v = None
+        elif isinstance(v, float):
+            v = round(v, 6)
+        out[k] = v
+    return out
+
+
+def workload(open_db: Factory, n: int, concurrency: int) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Runs the workload on a fresh database; returns (results for parity, seconds per step)."""
+    timer = Timer()
+    res: Dict[str, Any] = {}
+    db = open_db()
+    try:
+        with timer("create_configuration"):
+            cfgs = {
+                owner: [
+                    db.create_configuration(
+                        owner_sub=owner, name=f"{owner}-cfg{c}", dataset_uri=f"file:///data/{owner}/{c}.csv",
+                        x_column="x", y_column="y", hyperparams={"alpha": c / 10} if c % 2 else None,
+                    )
+                    for c in range(CONFIGS_PER_OWNER)
+                ]
+                for owner in OWNERS
+            }
+        cfg_names = {c["id"]: c["name"] for owner_cfgs in cfgs.values() for c in owner_cfgs}
+
+        def row(i: int) -> Dict[str, Any]:
+            owner = OWNERS[i % len(OWNERS)]
+            return dict(
+                job_id=job_id(i), owner_sub=owner, configuration_id=cfgs[owner][i % CONFIGS_PER_OWNER]["id"],
+                k8s_job_name=f"train-{i}", resources={"cpu_limit": "1", "i": i}, fingerprint=f"fp-{i % 7}",
+            )
+
+        versions_before = {owner: db.get_owner_version(owner_sub=owner, resource="jobs") for owner in OWNERS}
+        half = n // 2
+        with timer("insert_job (single)"):
+            for i in range(half):
+                db.insert_job(**row(i))
+        with timer("insert_jobs (bulk)"):
+            db.insert_jobs([row(i) for i in range(half, n)])
+
+        with timer("set_job_status"):
+            for i in range(n):
+                if i % 3:
+                    db.set_job_status(job_id=job_id(i), owner_sub=OWNERS[i % 2], status="succeeded",
+                                      model_uri=f"file:///artifacts/{i}/model.pkl", metrics_json=metrics_for(i))
+                elif i % 2:
+                    db.set_job_status(job_id=job_id(i), owner_sub=OWNERS[i % 2], status="failed")
+        with timer("set_jobs_status (bulk)"):
+            for owner in OWNERS:
+                db.set_jobs_status(owner_sub=owner, updates=[
+                    (job_id(i), "running") for i in range(0, n, 6) if OWNERS[i % 2] == owner
+                ])
+
+        # reuse of job 1's model: its own row, no training time, not on the leaderboard
+        reused_metrics = json.loads(metrics_for(1))
+        del reused_metrics["elapsed_sec"]
+        db.insert_job(**dict(row(1), job_id=job_id(n), k8s_job_name="train-1", status="succeeded",
+                             model_uri="file:///artifacts/1/model.pkl", metrics_json=json.dumps(reused_metrics),
+                             reused_from=job_id(1)))
+        res["reused_job"] = normalize(db.get_job(job_id=job_id(n), owner_sub=OWNERS[1]), cfg_names)
+
+        with timer("get_job"):
+            res["jobs"] = [normalize(db.get_job(job_id=job_id(i), owner_sub=OWNERS[i % 2]), cfg_names) for i in range(n)]
+        res["cross_owner"] = db.get_job(job_id=job_id(0), owner_sub=OWNERS[1])
+
+        with timer("list_jobs (pages of 50)"):
+            pages = {}
+            for owner in OWNERS:
+                ids: List[str] = []
+                offset = 0
+                while True:
+                    page = db.list_jobs(owner_sub=owner, limit=50, offset=offset)
+                    ids += [r["id"] for r in page]
+                    if len(page) < 50:
+                        break
+                    offset += 50
+                pages[owner] = sorted(ids)  # same-second created_at ties may order differently
+        res["list_jobs"] = pages
+        # counters start at random values; only whether writes moved them is comparable
+        res["owner_versions_bumped"] = [
+            db.get_owner_version(owner_sub=owner, resource="jobs") != versions_before[owner] for owner in OWNERS
+        ]
+        res["list_configurations"] = {
+            owner: sorted(normalize(c, cfg_names)["id"] for c in db.list_configurations(owner_sub=owner, limit=200))
+            for owner in OWNERS
+        }
+        res["get_configurations"] = sorted(
+            cfg_names[k] for k in db.get_configurations(
+                cfg_ids=[c["id"] for c in cfgs[OWNERS[0]]] + [cfgs[OWNERS[1]][0]["id"]], owner_sub=OWNERS[0]
+            )
+        )
+
+        with timer("get_job_statuses"):
+            statuses = {
+                owner: db.get_job_statuses(job_ids=[job_id(i) for i in range(n)] + ["missing"], owner_sub=owner)
+                for owner in OWNERS
+            }
+        res["statuses"] = {o: sorted((r["id"], r["status"], r["executor"]) for r in rows) for o, rows in statuses.items()}
+        res["active"] = sorted(r["id"] for r in db.list_active_jobs(owner_subs=list(OWNERS)))
+
+        with timer("leaderboard"):
+            res["leaderboard"] = {
+                f"{c['name']}/{metric}": [r["id"] for r in db.leaderboard(
+                    configuration_id=c["id"], owner_sub=owner, metric=metric, top=10)]
+                for owner in OWNERS for c in cfgs[owner] for metric in LEADERBOARD_METRICS
+            }
+        reusable = db.find_reusable_job(owner_sub=OWNERS[0], fingerprint="fp-2")
+        res["reusable"] = bool(reusable) and reusable["status"] == "succeeded"
+
+        with timer("get_job_stats"):
+            stats = {owner: db.get_job_stats(owner_sub=owner) for owner in OWNERS}
+        res["stats"] = {
+            owner: {
+                "total": normalize(s["total"], cfg_names),
+                "configurations": sorted((normalize(r, cfg_names) for r in s["configurations"]),
+                                         key=lambda r: r["configuration_id"]),
+            }
+            for owner, s in stats.items()
+        }
+        with timer("rebuild_job_stats"):
+            res["job_stats_drift"] = db.rebuild_job_stats()
+
+        cutoffs = {"failed": "2999-01-01 00:00:00"}
+        res["expired"] = db.count_expired_jobs(cutoffs=cutoffs)
+        res["kept"] = len(db.kept_job_ids(job_ids=[job_id(i) for i in range(n)], cutoffs=cutoffs))
+        res["kept_model_uris"] = len(db.kept_model_uris(owner_sub=OWNERS[0], cutoffs=cutoffs))
+        res["dataset_uris"] = sorted(db.dataset_uris(owner_sub=OWNERS[0]))
+        with timer("archive_expired_jobs"):
+            archived = 0
+            while True:
+                moved = db.archive_expired_jobs(cutoffs=cutoffs, batch_size=100)
+                archived += moved
+                if moved < 100:
+                    break
+        res["archived"] = archived
+        res["stats_after_archive"] = normalize(db.get_job_stats(owner_sub=OWNERS[0])["total"], cfg_names)
+        res["job_stats_drift_after_archive"] = db.rebuild_job_stats()
+    finally:
+        db.close()
+
+    # mixed load: each thread has its own service instance, like request handlers
+    jobs = [(job_id(i), OWNERS[i % 2]) for i in range(n) if i % 3]
+    per_thread = max(1, n // concurrency)
+
+    def worker(t: int) -> None:
+        tdb = open_db()
+        try:
+            for k in range(per_thread):
+                jid, owner = jobs[(t * per_thread + k) % len(jobs)]
+                tdb.get_job(job_id=jid, owner_sub=owner)
+                if k % 4 == 0:
+                    tdb.set_job_status(job_id=jid, owner_sub=owner, status="succeeded")
+        finally:
+            tdb.close()
+
+    with timer(f"mixed read/write ({concurrency} threads)"):
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    return res, timer.steps
+
+
+def diff(a: Any, b: Any, path: str = "") -> List[str]:
+    if isinstance(a, dict) and isinstance(b, dict):
+        return [d for k in sorted(a.keys() | b.keys(), key=str) for d in diff(a.get(k), b.get(k), f"{path}.{k}")]
+    if isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+        return [d for i, (x, y) in enumerate(zip(a, b)) for d in diff(x, y, f"{path}[{i}]")]
+    return [] if a == b else [f"{path}: sqlite={a!r} postgres={b!r}"]
+
+
+# ---------- Postgres server ----------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def local_cluster(pg_bin: str) -> Iterator[str]:
+    """initdb + pg_ctl start in a temp dir; yields the server URL."""
+    tool = lambda name: os.path.join(pg_bin, name) if pg_bin else (shutil.which(name) or name)  # noqa: E731
+    data = tempfile.mkdtemp(prefix="podml-pg-")
+    port = _free_port()
+    subprocess.run([tool("initdb"), "-D", data, "-U", "postgres", "-E", "UTF8", "--auth=trust"], check=True, capture_output=True)
+    subprocess.run(
+        [tool("pg_ctl"), "-D", data, "-o", f"-p {port} -k {data} -c fsync=on", "-l", os.path.join(data, "log"),
+         "-w", "start"],
+        check=True, capture_output=True,
+    )
+    try:
+        yield f"postgresql://postgres@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run([tool("pg_ctl"), "-D", data, "-m", "fast", "stop"], capture_output=True)
+        shutil.rmtree(data, ignore_errors=True)
+
+
+@contextmanager
+def scratch_database(server_url: str) -> Iterator[str]:
+    name = f"podml_bench_{os.getpid()}"
+    with psycopg.connect(server_url, autocommit=True) as admin:
+        admin.execute(f"DROP DATABASE IF EXISTS {name}")
+        admin.execute(f"CREATE DATABASE {name} ENCODING 'UTF8' TEMPLATE template0")
+    url = psycopg.conninfo.make_conninfo(server_url, dbname=name)
+    try:
+        yield url
+    finally:
+        PostgresDatabaseService.close_pools()
+        with psycopg.connect(server_url, autocommit=True) as admin:
+            admin.execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--pg-url", default=os.environ.get("PODML_BENCH_PG_URL"), help="existing Postgres server")
+    ap.add_argument("--pg-bin", default="", help="directory with initdb/pg_ctl (default: PATH)")
+    args = ap.parse_args()
+
+    sqlite_path = os.path.join(ROOT, "bench.db")
+    sqlite_res, sqlite_t = workload(lambda: DatabaseService(sqlite_path), args.jobs, args.concurrency)
+
+    server = nullcontext(args.pg_url) if args.pg_url else local_cluster(args.pg_bin)
+    with server as server_url, scratch_database(server_url) as url:
+        pg_res, pg_t = workload(lambda: PostgresDatabaseService(url), args.jobs, args.concurrency)
+
+    print(f"{'step':<34}{'sqlite':>11}{'postgres':>11}   ({args.jobs} jobs)")
+    for step, t in sqlite_t.items():
+        print(f"  {step:<32}{t * 1000:>9.1f}ms{pg_t[step] * 1000:>9.1f}ms")
+
+    problems = diff(sqlite_res, pg_res)
+    problems += [
+        f"PostgresDatabaseService inherits {name}"
+        for name, fn in vars(DatabaseService).items()
+        if not name.startswith("_") and callable(fn) and name not in vars(PostgresDatabaseService)
+    ]
+    if sqlite_res["job_stats_drift"] or sqlite_res["job_stats_drift_after_archive"]:
+        problems.append("job_stats drifted from training_jobs")
+    checks = len(sqlite_res["jobs"]) + sum(len(v) for v in sqlite_res["leaderboard"].values()) + len(sqlite_res)
+    if problems:
+        print(f"parity: {len(problems)} difference(s)")
+        for p in problems[:50]:
+            print("  " + p)
+        raise SystemExit(1)
+    print(f"parity: ok ({checks} checks)")
+
+
+if __name__ == "__main__":
+    main()
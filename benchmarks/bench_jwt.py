@@ -0,0 +1,160 @@
+"""
+JWT verification benchmark: the per-request JWK parse + RSA verify (legacy path)
+against CognitoJWTVerifier's key cache and verified-claims cache, both as raw
+verifications/sec and as authenticated requests/sec through a FastAPI app.
+
+Runs fully offline: signs tokens with a throwaway RSA key and serves the JWKS
+from a local HTTP server.
+
+    python -m benchmarks.bench_jwt [--requests 5000] [--concurrency 50] [--users 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.update(
+    AWS_REGION="eu-central-1",
+    AWS_COGNITO_USER_POOL_ID="eu-central-1_bench",
+    AWS_COGNITO_CLIENT_ID="bench-client",
+    ALLOW_DEBUG_SUB="false",
+)
+
+import httpx  # noqa: E402
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from fastapi import Depends, FastAPI, Header  # noqa: E402
+from jose import jwk, jwt  # noqa: E402
+
+from app.api.router_auth import get_current_sub  # noqa: E402
+from app.services import cognito_jwt_verifier as verifier_mod  # noqa: E402
+from app.services.cognito_jwt_verifier import CognitoJWTVerifier, _issuer  # noqa: E402
+
+KID = "bench-key"
+
+
+def make_keys():
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_jwk = jwk.construct(pem, "RS256").public_key().to_dict()
+    public_jwk.update(kid=KID, alg="RS256", use="sig")
+    return pem, {"keys": [public_jwk]}
+
+
+def make_tokens(pem: bytes, users: int):
+    now = int(time.time())
+    return [
+        jwt.encode(
+            {"sub": f"user-{i}", "aud": "bench-client", "iss": _issuer(), "token_use": "id", "iat": now, "exp": now + 3600},
+            pem,
+            algorithm="RS256",
+            headers={"kid": KID},
+        )
+        for i in range(users)
+    ]
+
+
+def serve_jwks(jwks) -> str:
+    body = json.dumps(jwks).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{srv.server_address[1]}/.well-known/jwks.json"
+
+
+def legacy_verify(token: str, jwks) -> str:
+    """What every request paid before: find the JWK dict, parse it, verify RSA."""
+    kid = jwt.get_unverified_header(token)["kid"]
+    key = next(k for k in jwks["keys"] if k["kid"] == kid)
+    claims = jwt.decode(token, key, algorithms=["RS256"], audience="bench-client", issuer=_issuer(),
+                        options={"verify_at_hash": False})
+    return claims["sub"]
+
+
+def rate(fn, tokens, n: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(tokens[i % len(tokens)])
+    return n / (time.perf_counter() - t0)
+
+
+def build_app(jwks) -> FastAPI:
+    app = FastAPI()
+
+    async def legacy_sub(authorization: str = Header(...)) -> str:
+        return legacy_verify(authorization.split(" ", 1)[1], jwks)
+
+    @app.get("/fast")
+    async def fast(sub: str = Depends(get_current_sub)):
+        return {"sub": sub}
+
+    @app.get("/legacy")
+    async def legacy(sub: str = Depends(legacy_sub)):
+        return {"sub": sub}
+
+    return app
+
+
+async def drive(app: FastAPI, path: str, tokens, n: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = iter(range(n))
+
+        async def worker():
+            for i in counter:
+                r = await client.get(path, headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"})
+                assert r.status_code == 200, r.text
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return n / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=5000)
+    ap.add_argument("--concurrency", type=int, default=50)
+    ap.add_argument("--users", type=int, default=200, help="distinct tokens in rotation")
+    args = ap.parse_args()
+
+    pem, jwks = make_keys()
+    tokens = make_tokens(pem, args.users)
+    url = serve_jwks(jwks)
+    verifier_mod._jwks_url = lambda: url
+
+    def fast_cold(token):
+        CognitoJWTVerifier._claims.clear()
+        return CognitoJWTVerifier.verify_id_token(token)
+
+    n = min(args.requests, 2000)
+    print(f"verifications/sec ({n} calls, {args.users} distinct tokens)")
+    print(f"  legacy (parse JWK + RSA verify)      {rate(lambda t: legacy_verify(t, jwks), tokens, n):>10.0f}")
+    print(f"  cached key, RSA verify               {rate(fast_cold, tokens, n):>10.0f}")
+    print(f"  cached key + verified-claims LRU     {rate(CognitoJWTVerifier.verify_id_token, tokens, n):>10.0f}")
+
+    app = build_app(jwks)
+    print(f"authenticated requests/sec ({args.requests} requests, concurrency {args.concurrency})")
+    legacy_rps = asyncio.run(drive(app, "/legacy", tokens, args.requests, args.concurrency))
+    fast_rps = asyncio.run(drive(app, "/fast", tokens, args.requests, args.concurrency))
+    print(f"  legacy                               {legacy_rps:>10.0f}")
+    print(f"  get_current_sub (fast path)          {fast_rps:>10.0f}  ({fast_rps / legacy_rps:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
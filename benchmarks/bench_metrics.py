@@ -0,0 +1,129 @@
+"""
+Cost of the request instrumentation (app/core/metrics.py).
+
+Micro: nanoseconds per histogram observation, per `timed` call over a bare
+function call, and per request added by MetricsMiddleware. Macro:
+requests/second of GET /health and GET /api/jobs/{id} with metrics off, on,
+and on with Server-Timing headers (best of 3 interleaved runs; end-to-end
+numbers on a busy machine vary by several %).
+
+    python -m benchmarks.bench_metrics [--requests 5000] [--concurrency 32]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import timeit
+import uuid
+
+ROOT = tempfile.mkdtemp(prefix="podml-bench-")
+os.environ.update(STORAGE_ROOT=ROOT, DATABASE_PATH=os.path.join(ROOT, "app.db"), ALLOW_DEBUG_SUB="true")
+
+import httpx  # noqa: E402
+
+from app.core import metrics  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.async_database_service import AsyncDatabaseService  # noqa: E402
+from app.services.database_service import DatabaseService  # noqa: E402
+
+OWNER = "bench-user"
+
+
+def micro(n: int = 200_000) -> None:
+    hist = metrics.Histogram("bench_seconds", "benchmark only", ("op",))
+    child = hist.labels(op="x")
+    metrics.REGISTRY.remove(hist)
+
+    def bare():
+        return None
+
+    wrapped = metrics.timed(child, "bench")(bare)
+    t_observe = timeit.timeit(lambda: child.observe(0.003), number=n) / n
+    t_bare = timeit.timeit(bare, number=n) / n
+    t_timed = timeit.timeit(wrapped, number=n) / n
+
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def noop(message):
+        pass
+
+    async def per_request(target, rounds: int = 20_000) -> float:
+        scope = {"type": "http", "method": "GET", "path": "/health"}
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            await target(scope, None, noop)
+        return (time.perf_counter() - t0) / rounds
+
+    wrapped_app = metrics.MetricsMiddleware(endpoint)
+    t_endpoint = asyncio.run(per_request(endpoint))
+    t_middleware = asyncio.run(per_request(wrapped_app))
+    settings.server_timing_enabled = True
+    t_server_timing = asyncio.run(per_request(wrapped_app))
+    settings.server_timing_enabled = False
+
+    print("Per call")
+    print(f"  Histogram child observe()       {t_observe * 1e9:>7.0f} ns")
+    print(f"  timed() wrapper overhead        {(t_timed - t_bare) * 1e9:>7.0f} ns")
+    print(f"  MetricsMiddleware per request   {(t_middleware - t_endpoint) * 1e9:>7.0f} ns")
+    print(f"    with Server-Timing header     {(t_server_timing - t_endpoint) * 1e9:>7.0f} ns")
+
+
+def seed_job() -> str:
+    db = DatabaseService()
+    try:
+        cfg = db.create_configuration(owner_sub=OWNER, name="bench", dataset_uri="file:///d.csv", x_column="x", y_column="y")
+        job_id = str(uuid.uuid4())
+        db.insert_job(job_id=job_id, owner_sub=OWNER, configuration_id=cfg["id"], k8s_job_name="train-bench",
+                      resources={}, status="succeeded")
+    finally:
+        db.close()
+    return job_id
+
+
+async def drive(path: str, n: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers={"X-Debug-Sub": OWNER}) as client:
+        counter = iter(range(n))
+
+        async def worker():
+            for _ in counter:
+                r = await client.get(path)
+                assert r.status_code == 200, r.text
+
+        await client.get(path)  # warm up
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return n / (time.perf_counter() - t0)
+
+
+def macro(n: int, concurrency: int) -> None:
+    job_path = f"/api/jobs/{seed_job()}"
+    modes = {"off": (False, False), "on": (True, False), "on + Server-Timing": (True, True)}
+    print(f"Requests/second ({n} requests, {concurrency} concurrent)")
+    for path in ("/health", job_path):
+        results = dict.fromkeys(modes, 0.0)
+        for _ in range(3):  # interleaved, so drift hits every mode alike
+            for mode, (enabled, server_timing) in modes.items():
+                settings.metrics_enabled, settings.server_timing_enabled = enabled, server_timing
+                results[mode] = max(results[mode], asyncio.run(drive(path, n, concurrency)))
+        label = "GET /api/jobs/{id}" if path == job_path else f"GET {path}"
+        cells = "  ".join(f"{mode} {rps:>6.0f}" for mode, rps in results.items())
+        print(f"  {label:<20} {cells}  ({(1 - results['on'] / results['off']) * 100:+.1f}% cost)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=5000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    args = ap.parse_args()
+    micro()
+    macro(args.requests, args.concurrency)
+    AsyncDatabaseService.shutdown_all()
+
+
+if __name__ == "__main__":
+    main()
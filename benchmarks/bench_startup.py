@@ -0,0 +1,133 @@
+"""
+Cold-start benchmark with a regression budget: `import app.main` in fresh
+interpreters (python -X importtime, attributed to top-level packages) and the
+time from spawning uvicorn to the first 200 from /health.
+
+Fails (exit 1) when the median import or startup time exceeds its budget, or
+when importing the app loads an SDK that must stay lazy (it is loaded on first
+use / by the lifespan pre-warm instead).
+
+    python -m benchmarks.bench_startup [--runs 5] [--import-budget-ms 900] [--startup-budget-ms 1500]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO = Path(__file__).resolve().parents[1]
+
+# must not be imported by `import app.main`
+LAZY_MODULES = ("kubernetes", "boto3", "botocore", "jose", "cryptography", "httpx", "psycopg", "psycopg_pool")
+
+IMPORT_BUDGET_MS = 900
+STARTUP_BUDGET_MS = 1500
+
+
+def env() -> Dict[str, str]:
+    root = tempfile.mkdtemp(prefix="podml-bench-")
+    return dict(os.environ, STORAGE_ROOT=os.path.join(root, "storage"), DATABASE_PATH=os.path.join(root, "app.db"))
+
+
+def import_once() -> Tuple[float, Counter]:
+    """Import time of app.main in ms, and self time (ms) per top-level package."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=REPO, env=env(), capture_output=True, text=True, check=True,
+    )
+    total = 0.0
+    by_package: Counter = Counter()
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        by_package[module.split(".")[0]] += int(self_us) / 1000
+        if module == "app.main":
+            total = int(cumulative_us) / 1000
+    return total, by_package
+
+
+def loaded_lazy_modules() -> List[str]:
+    out = subprocess.run(
+        [sys.executable, "-c", "import json, sys, app.main; print(json.dumps(sorted(sys.modules)))"],
+        cwd=REPO, env=env(), capture_output=True, text=True, check=True,
+    )
+    loaded = json.loads(out.stdout.strip().splitlines()[-1])
+    return [m for m in LAZY_MODULES if m in loaded]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def startup_once() -> float:
+    """ms from spawning uvicorn to the first 200 from /health."""
+    port = free_port()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO, env=env(),
+    )
+    try:
+        while True:
+            if proc.poll() is not None:
+                raise SystemExit(f"uvicorn exited with {proc.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as r:
+                    if r.status == 200:
+                        return (time.perf_counter() - t0) * 1000
+            except OSError:
+                time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    ap.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    args = ap.parse_args()
+
+    imports, packages = [], Counter()
+    for _ in range(args.runs):
+        total, by_package = import_once()
+        imports.append(total)
+        packages.update(by_package)
+    startups = [startup_once() for _ in range(args.runs)]
+    lazy = loaded_lazy_modules()
+
+    import_ms, startup_ms = statistics.median(imports), statistics.median(startups)
+    print(f"import app.main ({args.runs} runs)   median {import_ms:>7.0f} ms  min {min(imports):>7.0f} ms  budget {args.import_budget_ms:.0f} ms")
+    print(f"uvicorn spawn -> /health       median {startup_ms:>7.0f} ms  min {min(startups):>7.0f} ms  budget {args.startup_budget_ms:.0f} ms")
+    print("self import time by package (mean per run)")
+    for pkg, ms in packages.most_common(10):
+        print(f"  {pkg:<24} {ms / args.runs:>7.1f} ms")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import {import_ms:.0f} ms > {args.import_budget_ms:.0f} ms")
+    if startup_ms > args.startup_budget_ms:
+        failures.append(f"startup {startup_ms:.0f} ms > {args.startup_budget_ms:.0f} ms")
+    if lazy:
+        failures.append(f"imported eagerly by app.main: {', '.join(lazy)}")
+    if failures:
+        print("over budget:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("within budget; lazy SDKs not imported: " + ", ".join(LAZY_MODULES))
+
+
+if __name__ == "__main__":
+    main()
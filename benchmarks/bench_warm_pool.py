@@ -0,0 +1,165 @@
+"""
+Warm pool on the local backend (EXECUTOR_BACKEND=local, WARM_POOL_ENABLED,
+no PVC): a uvicorn API plus trainer/linear_regression/worker.py processes
+sharing one STORAGE_ROOT. Checks that warm jobs finish with their artifacts
+collected like local ones, then compares job turnaround of the two.
+
+Checks (exit 1 on failure):
+- small datasets go to the warm pool, large ones to the local executor
+- both finish succeeded with model_uri (an existing file) and metrics
+- a warm job whose trainer fails ends failed, with its logs archived
+
+    python -m benchmarks.bench_warm_pool [--jobs 20] [--workers 2]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.bench_startup import free_port
+
+REPO = Path(__file__).resolve().parents[1]
+TOKEN = "bench"
+MAX_WARM_BYTES = 4096  # datasets above this go to the local executor
+
+
+class Api:
+    def __init__(self, port: int):
+        self.base = f"http://127.0.0.1:{port}"
+
+    def call(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        req = urllib.request.Request(
+            self.base + path, method=method, headers={"X-Debug-Sub": "bench", "Content-Type": "application/json"},
+            data=json.dumps(body).encode() if body is not None else None,
+        )
+        with urllib.request.urlopen(req, timeout=30) as r:
+            data = r.read()
+        return json.loads(data) if r.headers.get_content_type() == "application/json" else data.decode()
+
+    def wait(self, job_id: str, timeout: float = 60) -> Dict[str, Any]:
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.call("GET", f"/api/jobs/{job_id}")
+            if job["status"] in ("succeeded", "failed") or time.monotonic() > deadline:
+                return job
+            time.sleep(0.02)
+
+
+def write_csv(root: str, name: str, rows: int) -> str:
+    path = os.path.join(root, "uploads", "bench", name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("x,y\n")
+        for i in range(rows):
+            f.write(f"{i},{2 * i + 1}\n")
+    return path
+
+
+def run_jobs(api: Api, cfg_id: str, n: int) -> List[Dict[str, Any]]:
+    """n jobs one after another (force: no reuse); each with its turnaround in ms."""
+    out = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        job = api.call("POST", "/api/jobs", {"configuration_id": cfg_id, "force": True})
+        job = api.wait(job["id"])
+        job["turnaround_ms"] = (time.perf_counter() - t0) * 1000
+        out.append(job)
+    return out
+
+
+def check(failures, ok: bool, what: str) -> None:
+    print(f"  {'ok  ' if ok else 'FAIL'} {what}")
+    if not ok:
+        failures.append(what)
+
+
+def check_collected(failures, jobs: List[Dict[str, Any]], executor: str) -> None:
+    prefix = "warm-" if executor == "warm_pool" else "train-"
+    check(failures, all(j["k8s_job_name"].startswith(prefix) for j in jobs), f"{len(jobs)} jobs ran on {executor}")
+    check(failures, all(j["status"] == "succeeded" for j in jobs), f"{executor}: all succeeded")
+    check(failures, all(j["model_uri"] and os.path.exists(j["model_uri"][len("file://"):]) for j in jobs),
+          f"{executor}: model_uri set and the file exists")
+    check(failures, all(j["metrics"] and "r2" in j["metrics"] for j in jobs), f"{executor}: metrics collected")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", type=int, default=20)
+    ap.add_argument("--workers", type=int, default=2)
+    args = ap.parse_args()
+
+    root = tempfile.mkdtemp(prefix="podml-bench-")
+    storage = os.path.join(root, "storage")
+    env = dict(
+        os.environ, STORAGE_ROOT=storage, DATABASE_PATH=os.path.join(root, "app.db"),
+        EXECUTOR_BACKEND="local", WARM_POOL_ENABLED="true", WARM_POOL_TOKEN=TOKEN,
+        WARM_POOL_MAX_DATASET_BYTES=str(MAX_WARM_BYTES),
+        K8S_PVC_NAME="",  # also overrides a PVC name from .env
+    )
+    env.pop("DATABASE_URL", None)
+    port = free_port()
+    api_proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO, env=env,
+    )
+    worker_proc = subprocess.Popen(
+        [sys.executable, "worker.py"], cwd=REPO / "trainer" / "linear_regression",
+        env=dict(env, BACKEND_URL=f"http://127.0.0.1:{port}", WORKER_TOKEN=TOKEN, DATA_ROOT=storage,
+                 WORKERS=str(args.workers)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    api = Api(port)
+    failures: List[str] = []
+    try:
+        while True:
+            try:
+                api.call("GET", "/health")
+                break
+            except OSError:
+                if api_proc.poll() is not None:
+                    raise SystemExit(f"uvicorn exited with {api_proc.returncode}")
+                time.sleep(0.05)
+
+        small = write_csv(storage, "small.csv", 50)
+        large = write_csv(storage, "large.csv", 2000)
+        cfgs = {
+            name: api.call("POST", "/api/configurations", {
+                "name": name, "dataset_uri": f"file://{path}", "x_column": x_column, "y_column": "y",
+            })["id"]
+            for name, path, x_column in (("small", small, "x"), ("large", large, "x"), ("broken", small, "nope"))
+        }
+
+        print("checks")
+        warm = run_jobs(api, cfgs["small"], args.jobs)
+        check_collected(failures, warm, "warm_pool")
+        local = run_jobs(api, cfgs["large"], max(1, args.jobs // 4))
+        check_collected(failures, local, "local")
+        broken = run_jobs(api, cfgs["broken"], 1)[0]
+        check(failures, broken["k8s_job_name"].startswith("warm-") and broken["status"] == "failed",
+              "a failing warm trainer ends the job failed")
+        check(failures, bool(api.call("GET", f"/api/jobs/{broken['id']}/logs").strip()), "its logs are archived")
+
+        print(f"job turnaround (POST /jobs -> terminal, sequential, {args.workers} warm workers)")
+        for name, jobs in (("warm_pool", warm), ("local", local)):
+            ms = [j["turnaround_ms"] for j in jobs]
+            print(f"  {name:<10} n={len(ms):<4} median {statistics.median(ms):>8.1f} ms  max {max(ms):>8.1f} ms")
+    finally:
+        worker_proc.terminate()
+        api_proc.terminate()
+        worker_proc.wait(timeout=30)
+        api_proc.wait(timeout=30)
+
+    if failures:
+        print(f"{len(failures)} check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""End-to-end load tests; see `python -m benchmarks.loadtest --help`."""
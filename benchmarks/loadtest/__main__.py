@@ -0,0 +1,321 @@
+"""
+End-to-end load test: app.main:app on uvicorn in its own process, with local
+stand-ins for Cognito (JWKS server + signed RS256 tokens), Kubernetes
+(in-memory BatchV1Api/CoreV1Api with --k8s-latency-ms per call) and storage
+(a throwaway STORAGE_ROOT and SQLite database, or --database-url), driven over
+HTTP with the request mixes in benchmarks/loadtest/scenarios.py.
+
+Reports requests/second, p50/p90/p99 latency and server RSS per scenario and
+writes everything, with the git commit and arguments, to a JSON file. Pass an
+earlier file as --compare to see the change; --max-regression makes the run
+fail when throughput or p99 got worse by more than that many percent.
+
+    python -m benchmarks.loadtest [--duration 10] [--concurrency 32] [--scenarios polling,mixed]
+    python -m benchmarks.loadtest --compare benchmarks/loadtest/results/<earlier>.json --max-regression 15
+
+The load generator is one asyncio process; at a few thousand requests/second
+it becomes the bottleneck, so compare runs made on the same machine.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.loadtest import scenarios as sc
+from benchmarks.loadtest import standins
+
+REPO = Path(__file__).resolve().parents[2]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+# ---------- server process ----------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_mb(pid: int, field: str = "VmRSS") -> Optional[float]:
+    """Resident memory of a process from /proc (Linux); None elsewhere."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def start_server(args, root: str, jwks_url: Optional[str]):
+    port = free_port()
+    env = dict(
+        os.environ,
+        STORAGE_ROOT=os.path.join(root, "storage"),
+        DATABASE_PATH=os.path.join(root, "app.db"),
+        K8S_PVC_NAME="loadtest-pvc",
+        EXECUTOR_BACKEND="kubernetes",
+        WARM_POOL_ENABLED="false",
+        GC_ENABLED="false",
+        ALLOW_DEBUG_SUB="true" if args.auth == "debug" else "false",
+        AWS_REGION=standins.REGION,
+        AWS_COGNITO_USER_POOL_ID=standins.USER_POOL_ID,
+        AWS_COGNITO_CLIENT_ID=standins.CLIENT_ID,
+        LOADTEST_K8S_LATENCY_MS=str(args.k8s_latency_ms),
+        LOADTEST_JOB_SECONDS=str(args.job_seconds),
+    )
+    if jwks_url:
+        env["LOADTEST_JWKS_URL"] = jwks_url
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.loadtest.server", "--port", str(port)], cwd=REPO, env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    while True:
+        if proc.poll() is not None:
+            raise SystemExit(f"server exited with {proc.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                break
+        except httpx.TransportError:
+            pass
+        if time.perf_counter() - t0 > 60:
+            proc.kill()
+            raise SystemExit("server did not become healthy within 60s")
+        time.sleep(0.05)
+    return proc, base_url, time.perf_counter() - t0
+
+
+def stop_server(proc) -> None:
+    proc.terminate()  # uvicorn runs the lifespan shutdown on SIGTERM
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# ---------- measurement ----------
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[k]
+
+
+def latency_ms(values: List[float]) -> Dict[str, float]:
+    s = sorted(values)
+    out = {f"p{p}": round(percentile(s, p) * 1000, 2) for p in (50, 90, 99)}
+    out["max"] = round(s[-1] * 1000, 2) if s else 0.0
+    out["mean"] = round(sum(s) / len(s) * 1000, 2) if s else 0.0
+    return out
+
+
+async def run_scenario(ctx: sc.Context, scenario: sc.Scenario, args, server_pid: int) -> Dict[str, Any]:
+    weights = [w for w, _ in scenario.ops]
+    ops = [op for _, op in scenario.ops]
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Counter = Counter()
+    rss = {"start": rss_mb(server_pid), "peak": rss_mb(server_pid)}
+
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + args.warmup
+    end = measure_from + args.duration
+
+    async def worker(rng: random.Random) -> None:
+        while loop.time() < end:
+            op = rng.choices(ops, weights)[0]
+            t0 = loop.time()
+            try:
+                r = await op(ctx)
+                error = None if r.is_success else f"{op.__name__} {r.status_code}"
+            except httpx.HTTPError as e:
+                error = f"{op.__name__} {type(e).__name__}"
+            if t0 >= measure_from and loop.time() <= end:
+                samples[op.__name__].append(loop.time() - t0)
+                if error:
+                    errors[error] += 1
+
+    async def sample_memory() -> None:
+        while loop.time() < end:
+            await asyncio.sleep(0.2)
+            now = rss_mb(server_pid)
+            if now is not None:
+                rss["peak"] = max(rss["peak"] or 0.0, now)
+
+    await asyncio.gather(*(worker(random.Random(i)) for i in range(args.concurrency)), sample_memory())
+    rss["end"] = rss_mb(server_pid)
+
+    everything = [v for vs in samples.values() for v in vs]
+    return {
+        "description": scenario.description,
+        "requests": len(everything),
+        "throughput_rps": round(len(everything) / args.duration, 1),
+        "latency_ms": latency_ms(everything),
+        "ops": {name: {"requests": len(vs), "latency_ms": latency_ms(vs)} for name, vs in sorted(samples.items())},
+        "errors": dict(errors),
+        "server_rss_mb": {k: round(v, 1) if v is not None else None for k, v in rss.items()},
+    }
+
+
+# ---------- reporting ----------
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def pct(new: float, old: float) -> Optional[float]:
+    return (new - old) / old * 100 if old else None
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> List[str]:
+    """Prints the table; returns regressions beyond --max-regression."""
+    max_regression = result["meta"]["args"]["max_regression"]
+    regressions: List[str] = []
+    head = f"{'scenario':<16}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'errors':>8}{'RSS MB':>8}"
+    if baseline:
+        head += f"  vs {baseline['meta'].get('git_commit') or 'baseline'}: req/s, p99"
+    print(head)
+    for name, s in result["scenarios"].items():
+        lat = s["latency_ms"]
+        line = (
+            f"{name:<16}{s['throughput_rps']:>9.1f}{lat['p50']:>9.1f}{lat['p90']:>9.1f}{lat['p99']:>9.1f}"
+            f"{sum(s['errors'].values()):>8}{s['server_rss_mb']['peak'] or 0:>8.0f}"
+        )
+        old = (baseline or {}).get("scenarios", {}).get(name)
+        if old:
+            d_rps = pct(s["throughput_rps"], old["throughput_rps"])
+            d_p99 = pct(lat["p99"], old["latency_ms"]["p99"])
+            line += f"  {d_rps or 0:+7.1f}% {d_p99 or 0:+7.1f}%"
+            if max_regression is not None:
+                if d_rps is not None and -d_rps > max_regression:
+                    regressions.append(f"{name}: throughput {d_rps:+.1f}%")
+                if d_p99 is not None and d_p99 > max_regression:
+                    regressions.append(f"{name}: p99 {d_p99:+.1f}%")
+        print(line)
+        for err, n in s["errors"].items():
+            print(f"    {n} x {err}")
+    server = result["server"]
+    print(f"server: started in {server['startup_seconds']:.2f}s, RSS idle {server['idle_rss_mb']} MB, peak {server['peak_rss_mb']} MB")
+    return regressions
+
+
+# ---------- main ----------
+async def drive(args, base_url: str, headers: Dict[str, Dict[str, str]], server_pid: int) -> Dict[str, Any]:
+    rows = args.upload_kb * 1024 // 12
+    csv = ("x,y\n" + "".join(f"{i},{2 * i + 1}\n" for i in range(rows))).encode()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        ctx = sc.Context(client=client, headers=headers, csv=csv, burst_size=args.burst_size, deep_user="loadtest-deep")
+        t0 = time.perf_counter()
+        await sc.prepare(ctx, jobs_per_user=args.jobs_per_user, deep_jobs=args.deep_jobs)
+        print(f"seeded {len(headers)} users, {sum(map(len, ctx.jobs.values()))} jobs in {time.perf_counter() - t0:.1f}s")
+
+        wanted = args.scenarios.split(",") if args.scenarios else [s.name for s in sc.SCENARIOS]
+        unknown = set(wanted) - {s.name for s in sc.SCENARIOS}
+        if unknown:
+            raise SystemExit(f"unknown scenarios: {', '.join(sorted(unknown))}")
+        results = {}
+        for scenario in sc.SCENARIOS:
+            if scenario.name in wanted:
+                print(f"running {scenario.name} ({scenario.description}) ...", flush=True)
+                results[scenario.name] = await run_scenario(ctx, scenario, args, server_pid)
+        return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scenarios", help="comma-separated subset (default: all)")
+    ap.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario")
+    ap.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before each scenario")
+    ap.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    ap.add_argument("--users", type=int, default=20)
+    ap.add_argument("--auth", choices=("jwt", "debug"), default="jwt", help="signed ID tokens or X-Debug-Sub")
+    ap.add_argument("--upload-kb", type=int, default=256, help="size of each uploaded CSV")
+    ap.add_argument("--burst-size", type=int, default=50, help="jobs per POST /jobs/batch")
+    ap.add_argument("--jobs-per-user", type=int, default=20, help="running jobs seeded per user")
+    ap.add_argument("--deep-jobs", type=int, default=5000, help="jobs of the user listed at deep offsets")
+    ap.add_argument("--k8s-latency-ms", type=float, default=5.0, help="latency of every fake Kubernetes call")
+    ap.add_argument("--job-seconds", type=float, default=60.0, help="fake jobs succeed after this long")
+    ap.add_argument("--database-url", help="postgresql://... instead of a throwaway SQLite file")
+    ap.add_argument("--out", help="results JSON (default: benchmarks/loadtest/results/<time>-<commit>.json)")
+    ap.add_argument("--compare", help="earlier results JSON")
+    ap.add_argument("--max-regression", type=float, help="exit 1 if req/s drops or p99 grows by more than this %%")
+    ap.add_argument("--keep", action="store_true", help="keep the temporary storage root and database")
+    args = ap.parse_args()
+
+    root = tempfile.mkdtemp(prefix="podml-loadtest-")
+    users = [f"loadtest-user-{i}" for i in range(args.users)] + ["loadtest-deep"]
+    jwks_server = None
+    if args.auth == "jwt":
+        pem, jwks = standins.make_keys()
+        jwks_server, jwks_url = standins.serve_jwks(jwks)
+        headers = {u: {"Authorization": f"Bearer {standins.make_token(pem, u)}"} for u in users}
+    else:
+        jwks_url = None
+        headers = {u: {"X-Debug-Sub": u} for u in users}
+
+    proc, base_url, startup = start_server(args, root, jwks_url)
+    try:
+        idle_rss = rss_mb(proc.pid)
+        scenarios = asyncio.run(drive(args, base_url, headers, proc.pid))
+        peak_rss = rss_mb(proc.pid, "VmHWM")
+    finally:
+        stop_server(proc)
+        if jwks_server:
+            jwks_server.shutdown()
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    commit = git_commit()
+    result = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "server": {
+            "startup_seconds": round(startup, 3),
+            "idle_rss_mb": round(idle_rss, 1) if idle_rss is not None else None,
+            "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None,
+        },
+        "scenarios": scenarios,
+    }
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2))
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print()
+    regressions = print_report(result, baseline)
+    print(f"results: {out}")
+    if regressions:
+        print("regressions beyond --max-regression:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Request mixes. Each scenario is a weighted list of operations; an operation is
+one API call made as a random load-test user and returns the response (any
+non-2xx response counts as an error).
+"""
+import random
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+
+API = "/api"
+
+
+@dataclass
+class Context:
+    client: httpx.AsyncClient
+    headers: Dict[str, Dict[str, str]]        # user -> auth headers
+    csv: bytes
+    burst_size: int
+    deep_user: str
+    rng: random.Random = field(default_factory=lambda: random.Random(7))
+    datasets: Dict[str, str] = field(default_factory=dict)          # user -> dataset uri
+    configurations: Dict[str, List[str]] = field(default_factory=dict)
+    jobs: Dict[str, List[str]] = field(default_factory=dict)         # user -> job ids, newest last
+    deep_total: int = 0
+
+    @property
+    def users(self) -> List[str]:
+        return [u for u in self.headers if u != self.deep_user]
+
+    def user(self) -> str:
+        return self.rng.choice(self.users)
+
+
+Op = Callable[[Context], Awaitable[httpx.Response]]
+
+
+# ---------- operations ----------
+async def upload(ctx: Context) -> httpx.Response:
+    user = ctx.user()
+    return await ctx.client.post(
+        f"{API}/storage/upload", files={"file": ("data.csv", ctx.csv, "text/csv")}, headers=ctx.headers[user]
+    )
+
+
+async def create_configuration(ctx: Context) -> httpx.Response:
+    user = ctx.user()
+    body = {"name": f"cfg-{ctx.rng.randrange(10**6)}", "dataset_uri": ctx.datasets[user], "x_column": "x", "y_column": "y"}
+    r = await ctx.client.post(f"{API}/configurations", json=body, headers=ctx.headers[user])
+    if r.status_code == 201:
+        ctx.configurations[user].append(r.json()["id"])
+    return r
+
+
+async def create_job(ctx: Context) -> httpx.Response:
+    user = ctx.user()
+    body = {"configuration_id": ctx.rng.choice(ctx.configurations[user]), "force": True}
+    r = await ctx.client.post(f"{API}/jobs", json=body, headers=ctx.headers[user])
+    if r.status_code == 201:
+        ctx.jobs[user].append(r.json()["id"])
+    return r
+
+
+async def submit_burst(ctx: Context) -> httpx.Response:
+    user = ctx.user()
+    cfgs = ctx.configurations[user]
+    body = {"jobs": [{"configuration_id": cfgs[i % len(cfgs)], "force": True} for i in range(ctx.burst_size)]}
+    r = await ctx.client.post(f"{API}/jobs/batch", json=body, headers=ctx.headers[user])
+    if r.status_code == 202:
+        ctx.jobs[user].extend(j["id"] for j in r.json())
+    return r
+
+
+async def get_job(ctx: Context) -> httpx.Response:
+    user = ctx.user()
+    recent = ctx.jobs[user][-200:]
+    return await ctx.client.get(f"{API}/jobs/{ctx.rng.choice(recent)}", headers=ctx.headers[user])
+
+
+async def poll_statuses(ctx: Context) -> httpx.Response:
+    user = ctx.user()
+    return await ctx.client.post(f"{API}/jobs/status", json={"job_ids": ctx.jobs[user][-100:]}, headers=ctx.headers[user])
+
+
+async def list_jobs(ctx: Context) -> httpx.Response:
+    user = ctx.user()
+    return await ctx.client.get(f"{API}/jobs", params={"limit": 50}, headers=ctx.headers[user])
+
+
+async def list_configurations(ctx: Context) -> httpx.Response:
+    user = ctx.user()
+    return await ctx.client.get(f"{API}/configurations", params={"limit": 50}, headers=ctx.headers[user])
+
+
+async def job_summary(ctx: Context) -> httpx.Response:
+    user = ctx.user()
+    return await ctx.client.get(f"{API}/jobs/summary", headers=ctx.headers[user])
+
+
+async def deep_page(ctx: Context) -> httpx.Response:
+    offset = ctx.rng.randrange(max(ctx.deep_total - 50, 1))
+    return await ctx.client.get(
+        f"{API}/jobs", params={"limit": 50, "offset": offset}, headers=ctx.headers[ctx.deep_user]
+    )
+
+
+# ---------- scenarios ----------
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    ops: List[Tuple[float, Op]]
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("uploads", "CSV uploads (multipart)", [(1, upload)]),
+    Scenario("configurations", "configuration creation", [(1, create_configuration)]),
+    Scenario("job_create", "single job submissions (one K8s create each)", [(1, create_job)]),
+    Scenario("job_bursts", "POST /jobs/batch bursts", [(1, submit_burst)]),
+    Scenario("polling", "polling storm on running jobs", [(9, get_job), (1, poll_statuses)]),
+    Scenario("deep_pages", "job listing at deep offsets", [(1, deep_page)]),
+    Scenario(
+        "mixed",
+        "dashboard-like mix",
+        [
+            (35, get_job), (10, poll_statuses), (20, list_jobs), (10, list_configurations), (8, job_summary),
+            (5, deep_page), (6, create_job), (3, create_configuration), (2, upload), (1, submit_burst),
+        ],
+    ),
+]
+
+
+async def prepare(ctx: Context, jobs_per_user: int, deep_jobs: int) -> None:
+    """Per user: one uploaded dataset, two configurations, some running jobs; plus the deep-pages user."""
+    for user in ctx.headers:
+        r = await ctx.client.post(
+            f"{API}/storage/upload", files={"file": ("data.csv", ctx.csv, "text/csv")}, headers=ctx.headers[user]
+        )
+        r.raise_for_status()
+        ctx.datasets[user] = r.json()["uri"]
+        ctx.configurations[user] = []
+        ctx.jobs[user] = []
+        for i in range(2):
+            body = {"name": f"seed-{i}", "dataset_uri": ctx.datasets[user], "x_column": "x", "y_column": "y"}
+            r = await ctx.client.post(f"{API}/configurations", json=body, headers=ctx.headers[user])
+            r.raise_for_status()
+            ctx.configurations[user].append(r.json()["id"])
+
+        total = deep_jobs if user == ctx.deep_user else jobs_per_user
+        cfgs = ctx.configurations[user]
+        while total > 0:
+            n = min(total, 1000)
+            body = {"jobs": [{"configuration_id": cfgs[i % 2], "force": True} for i in range(n)]}
+            r = await ctx.client.post(f"{API}/jobs/batch", json=body, headers=ctx.headers[user])
+            r.raise_for_status()
+            ctx.jobs[user].extend(j["id"] for j in r.json())
+            total -= n
+    ctx.deep_total = len(ctx.jobs[ctx.deep_user])
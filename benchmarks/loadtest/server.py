@@ -0,0 +1,38 @@
+"""
+The API under test: app.main:app on uvicorn with the Kubernetes and Cognito
+stand-ins installed. Started by `python -m benchmarks.loadtest` in its own
+process (so server CPU and memory are measured apart from the load generator);
+configured through the environment it sets up.
+
+    python -m benchmarks.loadtest.server --port 8000
+"""
+import argparse
+import os
+
+import uvicorn
+
+from benchmarks.loadtest.standins import install_fake_kubernetes
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, required=True)
+    args = ap.parse_args()
+
+    install_fake_kubernetes(
+        storage_root=os.environ["STORAGE_ROOT"],
+        latency_seconds=float(os.environ.get("LOADTEST_K8S_LATENCY_MS", "5")) / 1000,
+        job_seconds=float(os.environ.get("LOADTEST_JOB_SECONDS", "2")),
+    )
+    from app.main import app
+    from app.services import cognito_jwt_verifier
+
+    jwks_url = os.environ.get("LOADTEST_JWKS_URL")
+    if jwks_url:
+        cognito_jwt_verifier._jwks_url = lambda: jwks_url
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Local stand-ins for the external services the API talks to.
+
+- Cognito: a throwaway RSA key, RS256 ID tokens signed with it and its JWKS
+  served over HTTP (the verifier fetches it like the real pool's).
+- Kubernetes: in-memory BatchV1Api/CoreV1Api returning the client's own model
+  objects. Jobs run for a fixed time, then succeed and leave a metrics.json in
+  their artifacts sub path, as the trainer would. Every call sleeps the
+  configured API latency.
+- Storage: the app's local STORAGE_ROOT in a temporary directory.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+KID = "loadtest-key"
+REGION = "eu-central-1"
+USER_POOL_ID = "eu-central-1_loadtest"
+CLIENT_ID = "loadtest-client"
+
+
+# ---------- Cognito ----------
+def issuer() -> str:
+    return f"https://cognito-idp.{REGION}.amazonaws.com/{USER_POOL_ID}"
+
+
+def make_keys() -> Tuple[bytes, Dict[str, Any]]:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jose import jwk
+
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_jwk = jwk.construct(pem, "RS256").public_key().to_dict()
+    public_jwk.update(kid=KID, alg="RS256", use="sig")
+    return pem, {"keys": [public_jwk]}
+
+
+def make_token(pem: bytes, sub: str, ttl_seconds: int = 3600) -> str:
+    from jose import jwt
+
+    now = int(time.time())
+    claims = {"sub": sub, "aud": CLIENT_ID, "iss": issuer(), "token_use": "id", "iat": now, "exp": now + ttl_seconds}
+    return jwt.encode(claims, pem, algorithm="RS256", headers={"kid": KID})
+
+
+def serve_jwks(jwks: Dict[str, Any]) -> Tuple[ThreadingHTTPServer, str]:
+    body = json.dumps(jwks).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}/.well-known/jwks.json"
+
+
+# ---------- Kubernetes ----------
+class _Cluster:
+    """Jobs shared by the fake APIs: name -> (V1Job, created_at)."""
+
+    def __init__(self, storage_root: str, latency_seconds: float, job_seconds: float):
+        self.storage_root = Path(storage_root)
+        self.latency_seconds = latency_seconds
+        self.job_seconds = job_seconds
+        self.jobs: Dict[str, Tuple[Any, float]] = {}
+        self.finished: set = set()
+        self.lock = threading.Lock()
+
+    def call(self) -> None:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    def state(self, name: str) -> str:
+        """active|succeeded; call with the lock held."""
+        job, created = self.jobs[name]
+        if time.monotonic() - created < self.job_seconds:
+            return "active"
+        if name not in self.finished:
+            self._write_artifacts(job)
+            self.finished.add(name)
+        return "succeeded"
+
+    @staticmethod
+    def model(name: str, state: str) -> Any:
+        # built outside the lock: client models are slow to construct (~0.1 ms)
+        from kubernetes import client
+
+        status = client.V1JobStatus(active=1) if state == "active" else client.V1JobStatus(succeeded=1)
+        return client.V1Job(metadata=client.V1ObjectMeta(name=name), status=status)
+
+    def _write_artifacts(self, job: Any) -> None:
+        mounts = job.spec.template.spec.containers[0].volume_mounts or []
+        for m in mounts:
+            if m.mount_path == "/data/artifacts":
+                out = self.storage_root / m.sub_path
+                out.mkdir(parents=True, exist_ok=True)
+                n = len(self.finished)
+                metrics = {"r2": 0.9 + (n % 97) / 1000, "mse": 1.0 + n % 13, "n_rows": 1000, "elapsed_sec": 1 + n % 7}
+                (out / "metrics.json").write_text(json.dumps(metrics))
+
+
+class FakeBatchV1Api:
+    cluster: Optional[_Cluster] = None
+
+    def create_namespaced_job(self, namespace: str, body: Any) -> Any:
+        self.cluster.call()
+        with self.cluster.lock:
+            self.cluster.jobs[body.metadata.name] = (body, time.monotonic())
+        return body
+
+    def read_namespaced_job_status(self, name: str, namespace: str) -> Any:
+        from kubernetes.client.exceptions import ApiException
+
+        self.cluster.call()
+        with self.cluster.lock:
+            if name not in self.cluster.jobs:
+                raise ApiException(status=404, reason="Not Found")
+            state = self.cluster.state(name)
+        return self.cluster.model(name, state)
+
+    def list_namespaced_job(self, namespace: str, label_selector: str = "", limit: int = 500, _continue: str = "") -> Any:
+        from kubernetes import client
+
+        self.cluster.call()
+        start = int(_continue or 0)
+        with self.cluster.lock:
+            names = sorted(self.cluster.jobs)[start:start + limit]
+            states = [self.cluster.state(n) for n in names]
+            more = start + limit < len(self.cluster.jobs)
+        items = [self.cluster.model(n, state) for n, state in zip(names, states)]
+        return client.V1JobList(items=items, metadata=client.V1ListMeta(_continue=str(start + limit) if more else None))
+
+
+class _PodLog:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def stream(self, amt: int = 4096):
+        yield self.data
+
+    def release_conn(self) -> None:
+        pass
+
+
+class FakeCoreV1Api:
+    cluster: Optional[_Cluster] = None
+
+    def list_namespaced_pod(self, namespace: str, label_selector: str = "") -> Any:
+        from kubernetes import client
+
+        self.cluster.call()
+        job_name = label_selector.partition("job=")[2]
+        with self.cluster.lock:
+            found = job_name in self.cluster.jobs
+        pods: List[Any] = [client.V1Pod(metadata=client.V1ObjectMeta(name=f"{job_name}-pod"))] if found else []
+        return client.V1PodList(items=pods)
+
+    def read_namespaced_pod_log(self, name: str, namespace: str, **kwargs: Any) -> _PodLog:
+        self.cluster.call()
+        return _PodLog(b"".join(b"[trainer] epoch %d loss=0.%03d\n" % (i, 999 - i) for i in range(200)))
+
+
+def install_fake_kubernetes(storage_root: str, latency_seconds: float, job_seconds: float) -> None:
+    """Points kubernetes.client at the fakes and makes config loading a no-op."""
+    from kubernetes import client, config
+
+    cluster = _Cluster(storage_root, latency_seconds, job_seconds)
+    FakeBatchV1Api.cluster = FakeCoreV1Api.cluster = cluster
+    client.BatchV1Api = FakeBatchV1Api
+    client.CoreV1Api = FakeCoreV1Api
+    config.load_incluster_config = lambda *a, **kw: None
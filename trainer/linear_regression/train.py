@@ -1,5 +1,6 @@
 import json
 import os
+import shutil
 import sys
 import time
 from typing import Dict
@@ -48,7 +49,7 @@ def main():
     out_model_url = env("OUTPUT_MODEL_URL")      # presigned PUT
     out_metrics_url = env("OUTPUT_METRICS_URL")  # presigned PUT
 
-    tmp = "/tmp"
+    tmp = env("TMP_DIR", "/tmp")  # warm workers use a private dir per process
     os.makedirs(tmp, exist_ok=True)
     local_csv = os.path.join(tmp, "data.csv")
     local_model = os.path.join(tmp, "model.pkl")
@@ -101,8 +102,9 @@ def main():
     elif output_dir:
         print(f"[trainer] writing artifacts under {output_dir}")
         os.makedirs(output_dir, exist_ok=True)
-        os.replace(local_model, os.path.join(output_dir, "model.pkl"))
-        os.replace(local_metrics, os.path.join(output_dir, "metrics.json"))
+        # shutil.move: /tmp and the PV are different filesystems
+        shutil.move(local_model, os.path.join(output_dir, "model.pkl"))
+        shutil.move(local_metrics, os.path.join(output_dir, "metrics.json"))
     else:
         print("[trainer] No output destination provided", file=sys.stderr)
         sys.exit(4)
@@ -0,0 +1,150 @@
+"""
+Warm trainer worker.
+
+Imports pandas/scikit-learn once (via train.py) and then runs jobs leased from
+the backend's /api/workers API, so a job costs only its fit, not pod scheduling,
+container start and imports. The PVC is mounted whole at DATA_ROOT; tasks carry
+dataset/artifact paths relative to it.
+
+Env:
+  BACKEND_URL    e.g. http://podml-api:8000
+  WORKER_TOKEN   must match the backend's WARM_POOL_TOKEN
+  DATA_ROOT      PVC mount (default /data); locally: the backend's STORAGE_ROOT
+  WORKERS        number of worker processes (default 1)
+
+Local run (worker processes stand in for pods):
+  BACKEND_URL=http://localhost:8000 WORKER_TOKEN=dev DATA_ROOT=$STORAGE_ROOT WORKERS=4 \
+      python trainer/linear_regression/worker.py
+"""
+import contextlib
+import io
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import requests
+
+import train  # imports pandas/sklearn once, before the first task
+
+TMP_DIR = ""  # private scratch dir, set per worker process
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8000").rstrip("/")
+WORKER_TOKEN = os.environ.get("WORKER_TOKEN", "")
+DATA_ROOT = os.environ.get("DATA_ROOT", "/data")
+API = f"{BACKEND_URL}/api/workers"
+HEARTBEAT_SECONDS = 60
+
+
+class _Tee(io.TextIOBase):
+    """Writes to the real stream (pod logs) and keeps a copy for the backend."""
+
+    def __init__(self, *streams):
+        self.streams = streams
+
+    def write(self, s):
+        for st in self.streams:
+            st.write(s)
+        return len(s)
+
+    def flush(self):
+        for st in self.streams:
+            st.flush()
+
+
+def _heartbeat(session: requests.Session, task_id: str, worker_id: str, stop: threading.Event):
+    while not stop.wait(HEARTBEAT_SECONDS):
+        try:
+            session.post(f"{API}/tasks/{task_id}/heartbeat", json={"worker_id": worker_id}, timeout=10)
+        except requests.RequestException:
+            pass
+
+
+def run_task(task: dict) -> tuple[int, str]:
+    """Runs train.main() with the task's env contract; returns (exit_code, captured output)."""
+    env = dict(task["env"], TMP_DIR=TMP_DIR)
+    sub_paths = task.get("sub_paths") or {}
+    if "dataset" in sub_paths:
+        env["DATASET_PATH"] = os.path.join(DATA_ROOT, sub_paths["dataset"])
+    if "artifacts" in sub_paths:
+        env["OUTPUT_DIR"] = os.path.join(DATA_ROOT, sub_paths["artifacts"])
+
+    saved = dict(os.environ)
+    os.environ.update(env)
+    buf = io.StringIO()
+    code = 0
+    try:
+        with contextlib.redirect_stdout(_Tee(sys.stdout, buf)), contextlib.redirect_stderr(_Tee(sys.stderr, buf)):
+            try:
+                train.main()
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                print(f"[trainer] failed: {e!r}", file=sys.stderr)
+                code = 1
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+    return code, buf.getvalue()
+
+
+def worker_loop(worker_id: str):
+    global TMP_DIR
+    TMP_DIR = tempfile.mkdtemp(prefix="podml-worker-")
+    session = requests.Session()
+    session.headers["X-Worker-Token"] = WORKER_TOKEN
+    print(f"[worker {worker_id}] polling {API}")
+    while True:
+        try:
+            r = session.post(f"{API}/lease", json={"worker_id": worker_id, "wait_seconds": 20}, timeout=30)
+        except requests.RequestException as e:
+            print(f"[worker {worker_id}] lease failed: {e}", file=sys.stderr)
+            time.sleep(5)
+            continue
+        if r.status_code == 204:
+            continue
+        if r.status_code != 200:
+            print(f"[worker {worker_id}] lease rejected: {r.status_code} {r.text}", file=sys.stderr)
+            time.sleep(5)
+            continue
+
+        task = r.json()
+        print(f"[worker {worker_id}] running {task['task_id']}")
+        stop = threading.Event()
+        threading.Thread(target=_heartbeat, args=(session, task["task_id"], worker_id, stop), daemon=True).start()
+        try:
+            code, output = run_task(task)
+        finally:
+            stop.set()
+        try:
+            session.post(
+                f"{API}/tasks/{task['task_id']}/complete",
+                json={"worker_id": worker_id, "succeeded": code == 0, "exit_code": code, "logs": output},
+                timeout=30,
+            )
+        except requests.RequestException as e:
+            # the lease expires and the backend retries the task elsewhere
+            print(f"[worker {worker_id}] reporting {task['task_id']} failed: {e}", file=sys.stderr)
+
+
+def main():
+    base = f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
+    n = int(os.environ.get("WORKERS", "1"))
+    if n <= 1:
+        worker_loop(base)
+        return
+    # SIGTERM -> normal exit, which terminates the daemonic children too
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    procs = [multiprocessing.Process(target=worker_loop, args=(f"{base}-{i}",), daemon=True) for i in range(n)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()